@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""
+Precompute a library of scene layouts.
+
+The layouts of the scene spec of a task file are sampled offline and saved
+as a single npz file (see vat.envs.scene_layouts), which SimWorld can then
+draw its scenes from instead of sampling them at every episode start.
+"""
+import argparse
+import json
+
+import numpy as np
+
+from vat.envs.scene_layouts import LayoutLibrary
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Scene Layout Library Builder'
+    )
+
+    parser.add_argument('--task', dest='task',
+                        help='The task specification file',
+                        default='tasks/specs/stack/stack_2000.json', type=str)
+
+    parser.add_argument('--output', dest='output',
+                        help='The output npz file.',
+                        default='layouts.npz', type=str)
+
+    parser.add_argument('--num', dest='num',
+                        help='Number of layouts.',
+                        default=1000, type=int)
+
+    parser.add_argument('--max_tries', dest='max_tries',
+                        help='Attempts per layout before giving up.',
+                        default=10, type=int)
+
+    parser.add_argument('--seed', dest='seed',
+                        help='Random seed.',
+                        default=0, type=int)
+
+    args = parser.parse_args()
+
+    return args
+
+
+def main():
+    # Process arguments
+    args = parse_args()
+
+    np.random.seed(args.seed)
+
+    # load scene specification
+    with open(args.task) as f:
+        scene_specs = json.load(f)['scene']
+
+    n_failed = LayoutLibrary.build(args.output, scene_specs, args.num,
+                                   max_tries=args.max_tries)
+    print('{:d} layouts written to {}, {:d} rejected.'.format(
+        args.num, args.output, n_failed))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""
+Compile a task specification file.
+
+The tasks are written with interned strings, integer-coded goals and
+constraints and an offset index (see vat.envs.task_specs), so that demo.py
+and generate_demos.py can load single tasks without parsing the whole file.
+"""
+import argparse
+import json
+
+from vat.envs.task_specs import compile_task_specs
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Task Specification Compiler'
+    )
+
+    parser.add_argument('--task', dest='task',
+                        help='The task specification file',
+                        default='tasks/specs/stack/stack_2000.json', type=str)
+
+    parser.add_argument('--output', dest='output',
+                        help='The output directory.',
+                        default='tasks/specs/stack/stack_2000', type=str)
+
+    args = parser.parse_args()
+
+    return args
+
+
+def main():
+    # Process arguments
+    args = parse_args()
+
+    with open(args.task) as f:
+        task_config = json.load(f)
+    compile_task_specs(task_config, args.output)
+    print('{:d} tasks compiled to {}.'.format(len(task_config['tasks']),
+                                               args.output))
+
+if __name__ == '__main__':
+    main()
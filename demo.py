@@ -1,9 +1,9 @@
 #!/usr/bin/env python
 import argparse
-import json
 from vat.simulation import get_world
 from vat.envs.api import get_api, get_task_world
 from vat.envs.bullet_interface import BulletInterface
+from vat.envs.task_specs import open_task_specs
 
 
 def parse_args():
@@ -32,9 +32,24 @@ def parse_args():
                         default='tasks/scene/base.xml', type=str)
 
     parser.add_argument('--task', dest='task',
-                        help='The task specification file',
+                        help='The task specification file, or compiled '
+                             'directory',
                         default='tasks/specs/stack/stack_2000.json', type=str)
 
+    parser.add_argument('--trajectory', dest='trajectory',
+                        help='If the gripper follows planned trajectories. '
+                             '[1]/[0] for yes/no.',
+                        default=0, type=int)
+
+    parser.add_argument('--kinematic', dest='kinematic',
+                        help='If the gripper and the object it carries are '
+                             'moved without physics. [1]/[0] for yes/no.',
+                        default=0, type=int)
+
+    parser.add_argument('--stats', dest='stats',
+                        help='Write simulation call statistics to this file.',
+                        default=None, type=str)
+
     args = parser.parse_args()
 
     return args
@@ -67,7 +82,8 @@ def main():
         display=args.display,
         data_dir=args.data_dir,
         camera_params=camera_params,
-        verbose=True)
+        verbose=True,
+        stats=args.stats is not None)
 
     # load scene
     world.load(world_path)
@@ -75,22 +91,24 @@ def main():
     # Star the simulator
     print('Starting the simulation...')
     world.start(args.time_step)
-    interface = BulletInterface(world)
+    interface = BulletInterface(world, trajectory=bool(args.trajectory),
+                                kinematic=bool(args.kinematic))
     print('Done.')
 
     # load task specifications
-    task_config = json.load(open(args.task))
+    task_specs = open_task_specs(args.task)
 
-    TaskWorld = get_task_world(task_config['name'], real=False)
+    TaskWorld = get_task_world(task_specs.name, real=False)
 
-    bw = TaskWorld(interface, task_config['scene'], random_task=False)
+    bw = TaskWorld(interface, task_specs.scene, random_task=False)
 
     # NTP full hierarchical API
     t = get_api('full')(bw, full_demo=True)
     bw.start_world()
 
     # iterate through tasks
-    for i, task in enumerate(task_config['tasks']):
+    for i in range(len(task_specs)):
+        task = task_specs[i]
         bw.set_task(task)
         bw.start_task()
         done = False
@@ -104,6 +122,10 @@ def main():
             bw.start_task()
             print(task['id'])
 
+    if args.stats is not None:
+        print('Writing simulation statistics to `{:s}`.'.format(args.stats))
+        world.stats.dump(args.stats)
+
     print('Terminating the simulation...')
     world.close()
     print('Done.')
@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+"""
+Generate expert demonstrations in parallel.
+
+Tasks are dispatched to a pool of worker processes, each of which owns a
+headless BulletWorld and writes its own shards of the dataset (see
+vat.envs.demo_dataset). Every successful demonstration is recorded in an
+append-only manifest, so an interrupted run picks up where it stopped when
+started again with the same arguments. Demonstrations already in the shards
+are not generated again, even if the run was killed before the manifest
+listed them.
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+from multiprocessing.util import Finalize
+
+import numpy as np
+
+from vat.simulation import get_world
+from vat.envs.api import get_api, get_task_world
+from vat.envs.bullet_interface import BulletInterface
+from vat.envs.demo_dataset import META, DemoReader, DemoWriter
+from vat.envs.scene_layouts import LayoutLibrary
+from vat.envs.task_specs import open_task_specs
+
+
+MANIFEST = 'manifest.jsonl'
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Parallel Expert Demonstration Generator'
+    )
+
+    parser.add_argument('--physics', dest='physics',
+                        help='The physics engine.',
+                        default='bullet', type=str)
+
+    parser.add_argument('--time_step', dest='time_step',
+                        help='Time step for the simulation.',
+                        default=0.001, type=float)
+
+    parser.add_argument('--data', dest='data_dir',
+                        help='The data directory.',
+                        default='assets/urdf/', type=str)
+
+    parser.add_argument('--scene', dest='scene',
+                        help='The scene xml file.',
+                        default='tasks/scene/base.xml', type=str)
+
+    parser.add_argument('--task', dest='task',
+                        help='The task specification file, or compiled '
+                             'directory',
+                        default='tasks/specs/stack/stack_2000.json', type=str)
+
+    parser.add_argument('--trajectory', dest='trajectory',
+                        help='If the gripper follows planned trajectories. '
+                             '[1]/[0] for yes/no.',
+                        default=0, type=int)
+
+    parser.add_argument('--kinematic', dest='kinematic',
+                        help='If the gripper and the object it carries are '
+                             'moved without physics. [1]/[0] for yes/no.',
+                        default=0, type=int)
+
+    parser.add_argument('--api', dest='api',
+                        help='The program API. [full]/[flat].',
+                        default='full', type=str)
+
+    parser.add_argument('--output', dest='output',
+                        help='The output directory.',
+                        default='demos/', type=str)
+
+    parser.add_argument('--workers', dest='workers',
+                        help='Number of worker processes.',
+                        default=mp.cpu_count(), type=int)
+
+    parser.add_argument('--max_tries', dest='max_tries',
+                        help='Attempts per task before giving up.',
+                        default=10, type=int)
+
+    parser.add_argument('--shard_size', dest='shard_size',
+                        help='Size of a dataset shard in MB.',
+                        default=1024, type=int)
+
+    parser.add_argument('--layouts', dest='layouts',
+                        help='Draw the scenes from this layout library.',
+                        default=None, type=str)
+
+    parser.add_argument('--seed', dest='seed',
+                        help='Random seed, offset by the task index.',
+                        default=0, type=int)
+
+    args = parser.parse_args()
+
+    return args
+
+
+def read_manifest(output):
+    """Read the ids of the finished tasks from the manifest."""
+    done = set()
+    path = os.path.join(output, MANIFEST)
+    if not os.path.exists(path):
+        return done
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Partially written last line of a killed run
+                continue
+            if entry['status'] == 'done':
+                done.add(entry['id'])
+    return done
+
+
+def read_written(output):
+    """Read the ids of the demonstrations in the shards of the dataset."""
+    if not os.path.exists(os.path.join(output, META)):
+        return set()
+    return set(DemoReader(output).ids)
+
+
+# Simulation of the worker process, set up by init_worker
+_worker = {}
+
+
+def init_worker(args):
+    world = get_world(args.physics, display=False, data_dir=args.data_dir,
+                      verbose=False)
+    world.load(args.scene)
+    world.start(args.time_step)
+    interface = BulletInterface(world, trajectory=bool(args.trajectory),
+                                kinematic=bool(args.kinematic))
+
+    # A compiled spec only decodes the tasks this worker is given
+    task_specs = open_task_specs(args.task)
+    TaskWorld = get_task_world(task_specs.name, real=False)
+    bw = TaskWorld(interface, task_specs.scene, random_task=False)
+    if args.layouts:
+        bw.use_layouts(LayoutLibrary(args.layouts))
+    api = get_api(args.api)(bw, full_demo=True)
+    bw.start_world()
+
+    writer = DemoWriter(args.output, api.program_names, api.vocabs,
+                        prefix='worker%d' % os.getpid(),
+                        shard_size=args.shard_size << 20)
+    # Close the last shard when the pool shuts the worker down
+    Finalize(writer, writer.close, exitpriority=10)
+
+    _worker.update({'args': args, 'world': world, 'bw': bw, 'api': api,
+                    'writer': writer, 'task_specs': task_specs})
+
+
+def generate(index):
+    """Generate the demonstration of a task and write it to disk."""
+    task = _worker['task_specs'][index]
+    args = _worker['args']
+    bw = _worker['bw']
+    api = _worker['api']
+
+    # Seed per task and sample its scene afterwards, so that the scene and
+    # the random draws do not depend on the tasks the worker ran before.
+    # The physics can still differ in the last digits, as the contact
+    # solving order of pybullet depends on the history of the world.
+    np.random.seed(args.seed + index)
+
+    bw.set_task(task)
+    out = None
+    tries = 0
+    while out is None and tries < args.max_tries:
+        bw.reset_world()
+        bw.start_task()
+        out = api.expert_program_trace()
+        tries += 1
+
+    entry = {'id': task['id'], 'index': index, 'tries': tries}
+    if out is None:
+        entry['status'] = 'failed'
+        return entry
+
+    entry['shard'] = _worker['writer'].write(task['id'], out)
+    entry['status'] = 'done'
+    return entry
+
+
+def main():
+    # Process arguments
+    args = parse_args()
+
+    if not os.path.exists(args.output):
+        os.makedirs(args.output)
+
+    # load task specifications
+    task_specs = open_task_specs(args.task)
+
+    # A worker may have written a demo the manifest does not list yet
+    done = read_manifest(args.output) | read_written(args.output)
+    jobs = [i for i in range(len(task_specs))
+            if task_specs.task_id(i) not in done]
+    print('{:d} tasks done, {:d} to go.'.format(len(done), len(jobs)))
+    if not jobs:
+        return
+
+    pool = mp.Pool(min(args.workers, len(jobs)), init_worker, (args,))
+    with open(os.path.join(args.output, MANIFEST), 'a') as manifest:
+        for entry in pool.imap_unordered(generate, jobs):
+            manifest.write(json.dumps(entry) + '\n')
+            manifest.flush()
+            os.fsync(manifest.fileno())
+            print('{}: {}'.format(entry['id'], entry['status']))
+    pool.close()
+    pool.join()
+    print('Done.')
+
+if __name__ == '__main__':
+    main()
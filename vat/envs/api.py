@@ -8,10 +8,9 @@ try:
 except ImportError:
     RobotWorld = object
     print('Robot World cannot be imported')
-import time
 from npi_view import NPIView
+from goals import CompiledGoals
 import numpy as np
-import threading
 np.random.seed(10)
 
 
@@ -27,18 +26,27 @@ def get_api(api_name):
         raise NotImplementedError('%s is not a valid API' % api_name)
 
 
-class Observer(threading.Thread):
+class CommandEncoder(object):
+    """
+    index of the command words in the vocabulary
+    """
 
-    def __init__(self, api):
-        self.__api = api
-        threading.Thread.__init__(self)
+    def __init__(self, vocabs):
+        self.vocabs = tuple(vocabs)
+        self.word_to_ind = dict((w, i) for i, w in enumerate(self.vocabs))
 
-    def run(self):
-        while True:
-            self.__api.observe()
-            time.sleep(1)
-            if self.__api.stop_obs:
-                break
+    def encode(self, words):
+        ids = []
+        for w in words:
+            assert(w in self.word_to_ind)
+            ids.append(self.word_to_ind[w])
+        return ids
+
+    def one_hot(self, ids):
+        ids = np.asarray(ids, dtype=np.int64)
+        cmds = np.zeros((len(ids), len(self.vocabs)), dtype=np.float32)
+        cmds[np.arange(len(ids)), ids] = 1
+        return cmds
 
 
 class FullAPI(NPIView):
@@ -52,33 +60,98 @@ class FullAPI(NPIView):
                                'images': []}
         self.full_demo = full_demo
         self.target = None
+        self._encoder = None
         self.isrobot = robot
-        if self.isrobot:
-            self.stop_obs = False
+        # ticks between observations recorded during a move
+        self.obs_period = 100
+        # seconds between observations of the robot
+        self.robot_obs_interval = 1.0
+        self._recording = None
+        self._clock_recording = None
+
+    def capture_observation(self):
+        if self.world.interface.time_out:
+            self.success = False
+        return (self.world.object_state, self.world.agent_state,
+                self.world.image)
 
-        # Only needed if generating a robot demo
-        # self.obs = Observer(self)
-        # self.obs.start()
+    def record_observation(self, obs):
+        object_state, agent_state, image = obs
+        self.state_log['object_states'].append(object_state)
+        self.state_log['agent_states'].append(agent_state)
+        self.state_log['images'].append(image)
 
     def observe(self):
-        self.state_log['object_states'].append(self.world.object_state)
-        self.state_log['agent_states'].append(self.world.agent_state)
-        self.state_log['images'].append(self.world.image)
-
-        if self.world.interface.time_out:
-            self.success = False
+        # not in the middle of a frame recorded by the clock of the bus
+        with self.world.interface.bus.lock:
+            self.record_observation(self.capture_observation())
+
+    def start_recording(self, period=None):
+        """
+        observe every period ticks, obs_period by default, until
+        stop_recording
+
+        Nothing more is recorded while the clock recording of the robot is
+        on, it already observes every tick.
+        raises:
+            RuntimeError: if nothing publishes ticks on the bus, as nothing
+                would be recorded
+        """
+        interface = self.world.interface
+        if not (interface.publishes_ticks or interface.bus.clocked):
+            raise RuntimeError('nothing publishes ticks on the observation '
+                               'bus, start its clock to record')
+        self.stop_recording()
+        if self._clock_recording is not None:
+            return
+        if period is None:
+            period = self.obs_period
+        self._recording = self.world.subscribe(self.capture_observation,
+                                               period,
+                                               self.record_observation)
+
+    def stop_recording(self):
+        if self._recording is not None:
+            self.world.unsubscribe(self._recording)
+            self._recording = None
+
+    def start_clock_recording(self):
+        """
+        observe the robot every robot_obs_interval seconds until
+        stop_clock_recording, as it is not stepped by us
+        """
+        bus = self.world.interface.bus
+        bus.start_clock(self.robot_obs_interval)
+        self._clock_recording = self.world.subscribe(self.capture_observation,
+                                                     1,
+                                                     self.record_observation)
+
+    def stop_clock_recording(self):
+        if self._clock_recording is not None:
+            self.world.unsubscribe(self._clock_recording)
+            self._clock_recording = None
+        self.world.interface.bus.stop_clock()
 
     @property
     def current_frame(self):
         return len(self.state_log['object_states']) - 1
 
+    @property
+    def encoder(self):
+        # the task objects of a world are fixed, and so is the vocabulary
+        if self._encoder is None:
+            self._encoder = CommandEncoder(self.vocabs)
+        return self._encoder
+
     def command(self, words):
-        for w in words:
-            assert(w in self.vocabs)
-            cmd = np.zeros(len(self.vocabs), dtype=np.float32)
-            cmd_ind = self.vocabs.index(w)
-            cmd[cmd_ind] = 1
-            self.state_log['commands'].append(cmd)
+        # commands are logged as vocabulary ids, see export_state_log
+        self.state_log['commands'].extend(self.encoder.encode(words))
+
+    def export_state_log(self):
+        state_log = dict(self.state_log)
+        state_log['commands'] = list(
+            self.encoder.one_hot(self.state_log['commands']))
+        return state_log
 
     @property
     def current_command(self):
@@ -123,9 +196,10 @@ class FullAPI(NPIView):
 
     def program_move(self, target, full_demo=False):
         if full_demo:
-            self.world.set_callback(self.observe, 100)
+            self.start_recording()
         r, d, s = self.world.action_move_to(target)
-        self.world.unset_callback()
+        if full_demo:
+            self.stop_recording()
         self.target = target
         return r, d, s
 
@@ -139,9 +213,10 @@ class FullAPI(NPIView):
 
         if self.target is not None:
             if full_demo:
-                self.world.set_callback(self.observe, 100)
+                self.start_recording()
             out = self.world.action_grasp(self.target)
-            self.world.unset_callback()
+            if full_demo:
+                self.stop_recording()
             self.target = None
             return out
         return self.world.action_noop()
@@ -158,10 +233,11 @@ class FullAPI(NPIView):
 
         if self.target is not None:
             if full_demo:
-                self.world.set_callback(self.observe, 100)
+                self.start_recording()
             out = self.world.action_drop(self.target)
             # self.world.wait(500)
-            self.world.unset_callback()
+            if full_demo:
+                self.stop_recording()
             self.target = None
             return out
         return self.world.action_noop()
@@ -177,11 +253,12 @@ class FullAPI(NPIView):
                     self.world.stats['wrong_place'] = 1
 
         if full_demo:
-            self.world.set_callback(self.observe, 100)
+            self.start_recording()
         carrying = self.world.interface.carrying
         out = self.world.action_release()
 
-        self.world.unset_callback()
+        if full_demo:
+            self.stop_recording()
 
         try:
             self.observe()
@@ -198,9 +275,14 @@ class FullAPI(NPIView):
 
     def expert_stack(self, trace):
         if self.isrobot:
-            self.stop_obs = False
-            self.obs = Observer(self)
-            self.obs.start()
+            self.start_clock_recording()
+        try:
+            self._expert_stack(trace)
+        finally:
+            if self.isrobot:
+                self.stop_clock_recording()
+
+    def _expert_stack(self, trace):
         while True:
             self.curr_task, n_remain = self.world.next_task()
             if n_remain == 0:
@@ -213,9 +295,6 @@ class FullAPI(NPIView):
         caller_ptr, trace_ptr = self.call_stop(trace)  # end of program
         self.append_trace(caller_ptr, trace_ptr)
         self.success = self.world.task_done
-        if self.isrobot:
-            self.stop_obs = True
-        # del self.obs
 
     def expert_sorting(self, trace):
         while True:
@@ -405,6 +484,7 @@ def get_task_world(task_name, real=False):
             self._task = []
             self.random_task = random_task
             self.task_name = task_name
+            self._goals = None
             self._init_stats()
 
         def _init_stats(self):
@@ -420,6 +500,8 @@ def get_task_world(task_name, real=False):
             self._init_stats()
             self.n_satisfied = 0
             self.task_ptr = 0
+            # the scene may have new instances
+            self._goals = None
             if not same:
                 self._config_task(randomize=self.random_task)
 
@@ -430,6 +512,7 @@ def get_task_world(task_name, real=False):
         def set_task(self, new_task):
             self.task_specs = new_task['goals']
             self.end_constraints = new_task['end_constraints']
+            self._goals = None
             self._config_task(randomize=self.random_task)
 
         def _config_task(self, randomize=False):
@@ -483,12 +566,32 @@ def get_task_world(task_name, real=False):
 
             return curr_task, n_task_remain
 
+        @property
+        def goals(self):
+            """
+            end constraints compiled against the current scene
+            """
+            if self._goals is None:
+                self._goals = CompiledGoals(self.end_constraints, self)
+            return self._goals
+
+        def satisfied_all(self):
+            """
+            evaluate all end constraints at once
+            returns:
+                all_satisfied: (C,) if each constraint is satisfied
+                n_satisfied: (C,) number of satisfied instances of each
+            """
+            goals = self.goals
+            return goals.evaluate(self.interface.positions(goals.names))
+
         @property
         def task_done(self):
-            for c in self.end_constraints:
-                s, ns = self.satisfied(c)
+            all_satisfied, n_satisfied = self.satisfied_all()
+            for c, s, ns in zip(self.end_constraints, all_satisfied,
+                                n_satisfied):
                 if c.has_key('count'):
-                    return ns == c['count']
+                    return bool(ns == c['count'])
                 if not s:
                     return False
             return True
@@ -499,10 +602,8 @@ def get_task_world(task_name, real=False):
                 self.stats['wrong_place']
 
         def check_n_satisfied(self):
-            ns = 0
-            for c in self.end_constraints:
-                _, cns = self.satisfied(c)
-                ns += cns
+            _, n_satisfied = self.satisfied_all()
+            ns = int(n_satisfied.sum())
             if ns < self.n_satisfied and not self.already_failed:
                 self.stats['move_failure'] = 1
             self.n_satisfied = ns
@@ -4,15 +4,30 @@ Simulation / Robot environment base wrapper class
 
 
 import numpy as np
+from observation_bus import ObservationBus
 
 
 class BaseInterface(object):
 
+    # if the interface publishes every world tick on the bus as it steps
+    publishes_ticks = False
+
+    @property
+    def bus(self):
+        """observation bus, published every world tick"""
+        if getattr(self, '_bus', None) is None:
+            self._bus = ObservationBus()
+        return self._bus
+
     def set_callback(self, callback_func, freq):
-        pass
+        """single callback every freq ticks"""
+        self.unset_callback()
+        self._callback = self.bus.subscribe(callback_func, freq)
 
     def unset_callback(self):
-        pass
+        if getattr(self, '_callback', None) is not None:
+            self.bus.unsubscribe(self._callback)
+            self._callback = None
 
     @property
     def obj(self):
@@ -43,6 +58,26 @@ class BaseInterface(object):
         rpos = pos - self.gpos
         return rpos
 
+    def poses(self, objnames):
+        """
+        base poses of a list of objects as an (N, 7) array
+        """
+        raise NotImplementedError
+
+    def positions(self, objnames):
+        """
+        positions of a list of objects as an (N, 3) array
+        """
+        if len(objnames) == 0:
+            return np.zeros((0, 3), dtype=np.float32)
+        return self.poses(objnames)[:, :3]
+
+    def relative_positions(self, objnames):
+        """
+        positions of a list of objects relative to the gripper
+        """
+        return self.positions(objnames) - self.gpos
+
     def reset(self):
         raise NotImplementedError
 
@@ -61,6 +96,22 @@ class BaseInterface(object):
     def wait(self, x):
         raise NotImplementedError
 
+    def wait_until_settled(self, max_ticks, lin_tol=1e-3, ang_tol=1e-2,
+                           observe=False):
+        """
+        step until all dynamic bodies are at rest, for at most max_ticks
+
+        Interfaces that cannot tell when the world is at rest wait the whole
+        budget.
+        args:
+            observe: count the ticks as world ticks and publish them on the
+                bus
+        returns:
+            the number of ticks used
+        """
+        self.wait(max_ticks)
+        return max_ticks
+
     def is_on_top_of(self, o1_name, o2_name, eps=None):
         """
         check if o1 is on top of o2
@@ -79,6 +130,24 @@ class BaseInterface(object):
         z_dist = distance[2]
         return xy_dist <= xy_error and z_dist > 0
 
+    def are_on_top_of(self, o1_names, o2_name, eps=None):
+        """
+        check for each of o1_names if it is on top of o2
+        returns a boolean array aligned with o1_names
+        """
+        o2 = self.obj[o2_name]
+        if eps is None:
+            xy_error = o2.scale[:2].max()
+        else:
+            xy_error = eps
+
+        pos = self.positions(list(o1_names) + [o2_name])
+        distance = pos[:-1] - pos[-1]
+
+        xy_dist = np.linalg.norm(distance[:, :2], axis=1)
+        z_dist = distance[:, 2]
+        return np.logical_and(xy_dist <= xy_error, z_dist > 0)
+
     def no_collision_with(self, o1pos, o1boundary, o2name):
         """
         check if o1pos is outside of the collision boundary of o2
@@ -93,6 +162,19 @@ class BaseInterface(object):
         dist = np.linalg.norm((o1pos - o2.pos)[:2])
         return dist > min_dist
 
+    def no_collision_with_all(self, o1pos, o1boundary, o2names):
+        """
+        check if o1pos is outside of the collision boundaries of all objects
+        in o2names given boundary of o1
+        """
+        if len(o2names) == 0:
+            return True
+        o2boundary = np.array([max(self.obj[n].boundary[:2])
+                               for n in o2names])
+        min_dist = max(o1boundary[:2]) / 2 + o2boundary / 2
+        dist = np.linalg.norm((o1pos - self.positions(o2names))[:, :2], axis=1)
+        return bool(np.all(dist > min_dist))
+
     def pos_on_top_of(self, o1boundary, o2name):
         """
         compute position directly on top of o2
@@ -105,26 +187,32 @@ class BaseInterface(object):
         tpos[2] += o1boundary + o2.boundary
         return tpos
 
-    def _move_to(self, pos, orn, speed=0.1):
+    def _move_to(self, pos, orn, speed=None):
+        """
+        move the gripper to pos
+        args:
+            speed: max speed in m/s, None for the interface default
+        returns:
+            if the gripper reached pos
+        """
         raise NotImplementedError
 
-    def move_to_z(self, h, orn=None, speed=0.1):
+    def move_to_z(self, h, orn=None, speed=None):
         gpos = self.gpos
         gpos[2] = h
-        return self.move_to_xyz(gpos, orn)
+        return self.move_to_xyz(gpos, orn, speed=speed)
 
-    def move_relative_z(self, rh, speed=0.1):
+    def move_relative_z(self, rh, speed=None):
         gpos = self.gpos
         gpos[2] += rh
         return self.move_to_xyz(gpos, None, speed=speed)
 
-    def move_to_xy(self, pos, orn=None, speed=0.1):
+    def move_to_xy(self, pos, orn=None, speed=None):
         assert(len(pos) == 2)
         pos = np.array(pos)
         gpos = self.gpos
         gpos[:2] = pos
         return self.move_to_xyz(gpos, orn, speed=speed)
 
-    def move_to_xyz(self, pos, orn=None, speed=0.1):
-        self._move_to(pos, orn, speed=speed)
-        return True
+    def move_to_xyz(self, pos, orn=None, speed=None):
+        return self._move_to(pos, orn, speed=speed)
@@ -80,9 +80,9 @@ class TaskObject(object):
         if len(instances) == 0:
             instances = self.instances
 
-        comp_func = lambda name: np.linalg.norm(
-            self._interface.relative_pos(name))
-        ni = min(instances, key=comp_func)
+        dists = np.linalg.norm(
+            self._interface.relative_positions(instances), axis=1)
+        ni = instances[int(np.argmin(dists))]
         self._locked_instance = ni
 
 
@@ -121,12 +121,8 @@ class BaseWorld(object):
     @property
     def object_state(self):
         """return object position relative to the gripper"""
-        poses = []
-
-        for tobj in self.task_objects:
-            poses.append(self.interface.relative_pos(tobj.locked_instance))
-
-        a = np.vstack(poses).astype(np.float32)
+        names = [tobj.locked_instance for tobj in self.task_objects]
+        a = self.interface.relative_positions(names).astype(np.float32)
         return a
 
     @property
@@ -179,6 +175,12 @@ class BaseWorld(object):
     def unset_callback(self):
         self.interface.unset_callback()
 
+    def subscribe(self, capture, period, consume=None):
+        return self.interface.bus.subscribe(capture, period, consume)
+
+    def unsubscribe(self, handle):
+        self.interface.bus.unsubscribe(handle)
+
     @action
     def action_move_to(self, obj):
         """move to above"""
@@ -207,10 +209,17 @@ class BaseWorld(object):
         self.interface.reach_to_press(obj, obj2, loc)
         self.interface.release()
 
+    def wait(self, x):
+        self.interface.wait(x)
+
+    def wait_until_settled(self, max_ticks):
+        # the ticks pass in the world, as during actions
+        return self.interface.wait_until_settled(max_ticks, observe=True)
+
     @action
     def action_release(self):
         """release the gripped object"""
-        self.interface.wait(10)
+        self.interface.wait_until_settled(10)
         self.interface.release()
 
     @action
@@ -226,11 +235,9 @@ class BaseWorld(object):
         if cstr['type'] == 'on_top':
             src_objs = self.get_task_object(cstr['src']).instances
             tgt_obj = self.get_task_object(cstr['target']).instances[0]
-            for so in src_objs:
-                if not self.interface.is_on_top_of(so, tgt_obj):
-                    all_satisfied = False
-                else:
-                    n_satisfied += 1
+            on_top = self.interface.are_on_top_of(src_objs, tgt_obj)
+            all_satisfied = bool(np.all(on_top))
+            n_satisfied = int(np.sum(on_top))
         else:
             raise NotImplementedError(
                 'cannot check condition! %s' % cstr['type'])
@@ -1,13 +1,16 @@
 from vat.simulation import get_world
 from api import get_api, get_task_world
 from bullet_interface import BulletInterface
+from scene_layouts import LayoutLibrary
 
 
 class BulletEnv:
 
     def __init__(self, scene_file, time_step, display,
-                 data_dir, verbose=False, key=None):
-        self.sim = get_world('bullet', display, data_dir, verbose, key=key)
+                 data_dir, verbose=False, key=None, client=None,
+                 sim_stats=False):
+        self.sim = get_world('bullet', display, data_dir, verbose, key=key,
+                             client=client, stats=sim_stats)
 
         # load world
         self.sim.load(scene_file)
@@ -17,6 +20,14 @@ class BulletEnv:
     def close(self):
         self.sim.close()
 
+    @property
+    def sim_stats(self):
+        """Call statistics of the simulator, None unless enabled"""
+        return self.sim.stats
+
+    def dump_sim_stats(self, path):
+        self.sim.stats.dump(path)
+
     def configure(self, config, scene_specs):
         TaskWorld = get_task_world(config['task_name'], real=False)
         self.task_name = config['task_name']
@@ -25,6 +36,9 @@ class BulletEnv:
                                scene_specs,
                                random_task=config['random_task'])
 
+        if config.get('layouts'):
+            self.world.use_layouts(LayoutLibrary(config['layouts']))
+
         self.api = get_api(config['api'])(self.world, config['full_demo'])
         print('API: %s' % config['api'])
 
@@ -47,9 +61,13 @@ class BulletEnv:
     def change_task(self, task):
         self.world.set_task(task)
 
-    def reset(self):
+    def reset(self, layout_index=None):
+        """
+        args:
+            layout_index: layout to reset to, only with a layout library
+        """
         try:
-            self.world.reset_world()
+            self.world.reset_world(layout_index)
         except ValueError:
             print('setup scene failed, retry')
             self.world.reset_world()
@@ -62,12 +80,12 @@ class BulletEnv:
 
     def step(self, action):
         program_ind, args = action
-        reward, done, info = self.api.programs[program_ind][1](args)
+        reward, done, info = self.api.registry.funcs[program_ind](args)
         return self.state, reward, done, info
 
     @property
     def programs(self):
-        return self.api.programs
+        return self.api.registry.programs
 
     @property
     def program_names(self):
@@ -83,11 +101,11 @@ class BulletEnv:
 
     @property
     def ACT(self):
-        return [self.api.program_to_ind[p] for p in self.api.ACT]
+        return list(self.api.registry.act_inds)
 
     @property
     def ADAPTIVE(self):
-        return [self.api.program_to_ind[p] for p in self.api.ADAPTIVE]
+        return list(self.api.registry.adaptive_inds)
 
     @property
     def entry_point(self):
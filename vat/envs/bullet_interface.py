@@ -23,6 +23,45 @@ def error_sign(tgt, src, error, radius=False):
     return pc + nc
 
 
+def plan_trajectory(waypoints, speed, accel, dt):
+    """
+    positions at every tick along a path with a trapezoidal velocity profile
+    args:
+        waypoints: (N, 3) path, the first point being the current position
+        speed: max speed
+        accel: acceleration and deceleration
+        dt: time of a tick
+    returns:
+        (T, 3) positions and (T,) fractions of the path length covered
+    """
+    waypoints = np.asarray(waypoints, dtype=np.float64)
+    arc = np.concatenate(
+        [[0], np.cumsum(np.linalg.norm(np.diff(waypoints, axis=0), axis=1))])
+    length = arc[-1]
+    if length == 0:
+        return waypoints[-1:], np.ones(1)
+
+    t_acc = speed / accel
+    d_acc = 0.5 * accel * t_acc ** 2
+    if 2 * d_acc > length:
+        # too short to reach the max speed
+        t_acc = np.sqrt(length / accel)
+        speed = accel * t_acc
+        d_acc = length / 2
+    t_cruise = (length - 2 * d_acc) / speed
+    total = 2 * t_acc + t_cruise
+
+    t = np.arange(1, max(int(np.ceil(total / dt)), 1) + 1) * dt
+    t = np.minimum(t, total)
+    s = np.where(t < t_acc, 0.5 * accel * t ** 2,
+                 np.where(t < t_acc + t_cruise, d_acc + speed * (t - t_acc),
+                          length - 0.5 * accel * (total - t) ** 2))
+    s[-1] = length
+    pos = np.stack([np.interp(s, arc, waypoints[:, i]) for i in range(3)],
+                   axis=1)
+    return pos, s / length
+
+
 def to_np(arr):
     l = isinstance(arr, list)
     t = isinstance(arr, tuple)
@@ -36,7 +75,11 @@ def to_np(arr):
 
 class BulletInterface(BaseInterface):
 
-    def __init__(self, world, pos_step=0.001, orn_step=0.001):
+    publishes_ticks = True
+
+    def __init__(self, world, pos_step=0.001, orn_step=0.001,
+                 trajectory=False, max_speed=2.0, max_accel=20.0,
+                 kinematic=False):
         self.bullet = world
         self.gripper = self.bullet.robots['pr2_gripper']
         self.pos_error = to_np([1, 1, 1]) * pos_step
@@ -45,25 +88,32 @@ class BulletInterface(BaseInterface):
         self.orn_step_size = self.orn_error
 
         self.max_single_move_step = 1000
+        # Trajectory mode: moves follow a planned velocity profile instead of
+        # fixed steps, see move_along
+        self.trajectory = trajectory
+        self.max_speed = max_speed
+        self.max_accel = max_accel
+        self.max_settle_step = 200
+        # Kinematic mode: the gripper and the object it carries are
+        # teleported along moves, physics only runs to settle after a
+        # release, see _teleport_to
+        self.kinematic = kinematic
+        self.kinematic_settle_step = 50
         self.max_world_tick = 500000
         self.time_out = False
         self.world_tick = 0
-        self.step_callback = None
-        self.callback_freq = 100
         self._carrying = None
         self._stats = {}
-
-    def set_callback(self, callback_func, freq):
-        self.step_callback = callback_func
-        self.callback_freq = freq
-
-    def unset_callback(self):
-        self.step_callback = None
+        # State of the world before any task object is added
+        self._snapshot = self.bullet.snapshot()
 
     @property
     def obj(self):
         return self.bullet.bodies
 
+    def poses(self, objnames):
+        return self.bullet.get_body_poses(objnames)
+
     def add_body(self, spec):
         self.bullet.add_body(spec)
 
@@ -78,11 +128,10 @@ class BulletInterface(BaseInterface):
 
     def reset_gripper(self):
         self._set_to(*POSES['gripper_reset'])
-        for _ in range(100):
-            self.bullet.step()
+        self.wait_until_settled(100)
 
     def reset(self):
-        self.bullet.restart()
+        self.bullet.restore(self._snapshot)
         self.gripper = self.bullet.robots['pr2_gripper']
 
     def start(self):
@@ -100,6 +149,8 @@ class BulletInterface(BaseInterface):
         # self.gripper.release()
         self._carrying = None
         self.gripper.cstr_release()
+        if self.kinematic:
+            self.wait_until_settled(self.kinematic_settle_step, observe=True)
 
     def move_to_above(self, obj_name, orn=None):
         # preventive move
@@ -134,13 +185,54 @@ class BulletInterface(BaseInterface):
         return success
 
     def wait(self, x):
-        for _ in range(x):
-            self.bullet.step()
+        self.bullet.step(x)
+
+    def wait_until_settled(self, max_ticks, lin_tol=1e-3, ang_tol=1e-2,
+                           pos_tol=1e-3, check_every=5, observe=False):
+        """
+        step until all dynamic bodies are at rest and the gripper has reached
+        the target of its constraint, for at most max_ticks
+
+        The bodies are checked every check_every ticks, so a budget of at
+        most check_every ticks is always used up.
+        args:
+            lin_tol: max linear speed at rest, in m/s
+            ang_tol: max angular speed at rest, in rad/s
+            pos_tol: max distance of the gripper to its target, in m
+            observe: step through step_simulation, which counts world ticks
+                and publishes observations, instead of the physics only, and
+                stop at a time out
+        returns:
+            the number of ticks used
+        """
+        names = [n for n, b in self.obj.items() if not b.fixed]
+        gripper = self.obj['gripper']
+        ticks = 0
+        while ticks < max_ticks:
+            n_step = min(check_every, max_ticks - ticks)
+            if observe:
+                for _ in range(n_step):
+                    self.step_simulation()
+                    ticks += 1
+                    if self.time_out:
+                        return ticks
+            else:
+                self.bullet.step(n_step)
+                ticks += n_step
+            vel = self.bullet.get_body_velocities(names)
+            if np.all(np.linalg.norm(vel[:, :3], axis=1) <= lin_tol) and \
+                    np.all(np.linalg.norm(vel[:, 3:], axis=1) <= ang_tol) and \
+                    np.all(np.abs(gripper.pos - self.gripper.target[0]) <=
+                           pos_tol):
+                break
+        return ticks
 
     def step_simulation(self):
         self.bullet.step()
-        if self.step_callback and self.world_tick % self.callback_freq == 0:
-            self.step_callback()
+        self.bus.publish(self.world_tick)
+        self._advance_tick()
+
+    def _advance_tick(self):
         self.world_tick += 1
         if self.world_tick > self.max_world_tick:
             self.time_out = True
@@ -154,7 +246,14 @@ class BulletInterface(BaseInterface):
             rr = error_sign(orn, self.gorn, self.orn_error, radius=True)
         return pr, rr
 
-    def _move_to(self, pos, orn=None, speed=0.1):
+    def _move_to(self, pos, orn=None, speed=None):
+        if self.bullet.time_step is not None:
+            if self.kinematic and orn is None:
+                return self._teleport_to(pos, speed)
+            if self.trajectory:
+                return self.move_along([pos], orn, speed)
+
+        # step mode moves by pos_step_size every tick, regardless of speed
         pr, rr = self.reach_error_sign(pos, orn)
 
         count = 0
@@ -164,7 +263,85 @@ class BulletInterface(BaseInterface):
             pr, rr = self.reach_error_sign(pos, orn)
             count += 1
             if count > self.max_single_move_step:
-                return
+                return False
+        return True
+
+    def move_along(self, waypoints, orn=None, speed=None):
+        """
+        move the gripper through waypoints on a planned trajectory
+
+        The constraint target is streamed every tick along the path, then
+        held until the gripper is within pos_error of the last waypoint or
+        max_settle_step ticks have passed.
+        args:
+            waypoints: gripper positions, in the frame of gpos
+            orn: final euler angles, interpolated along the path
+            speed: max speed in m/s, capped by max_speed
+        returns:
+            if the gripper reached the last waypoint
+        """
+        speed = self.max_speed if speed is None else min(speed, self.max_speed)
+        start_pos, start_euler = self.gripper.target
+        path = [start_pos] + [to_np(w) + OFFSETS['gripper_z']
+                              for w in waypoints]
+        targets, frac = plan_trajectory(path, speed, self.max_accel,
+                                        self.bullet.time_step)
+        if orn is None:
+            eulers = np.tile(start_euler, (len(targets), 1))
+        else:
+            eulers = start_euler + frac[:, None] * (to_np(orn) - start_euler)
+
+        for target, euler in zip(targets, eulers):
+            self.gripper.move_to(target, euler)
+            self.step_simulation()
+            if self.time_out:
+                return False
+
+        goal = to_np(waypoints[-1])
+        for _ in range(self.max_settle_step):
+            if np.all(np.abs(goal - self.gpos) <= self.pos_error):
+                return True
+            self.step_simulation()
+            if self.time_out:
+                return False
+        return False
+
+    def _teleport_to(self, pos, speed=None):
+        """
+        move the gripper and the carried object kinematically
+
+        The move takes as many ticks as it would at speed, without running
+        physics. The bodies are only placed on the straight path at the
+        ticks where the observation bus has subscribers due, and at the end.
+        """
+        speed = self.max_speed if speed is None else min(speed, self.max_speed)
+        pe = self.bullet.pe
+        gripper = self.obj['gripper']
+        start = to_np(gripper.pos)
+        goal = to_np(pos) + OFFSETS['gripper_z']
+        quat = gripper.quat
+        carried = None
+        if self._carrying is not None:
+            carried = self.obj[self._carrying]
+            offset = carried.pos - start
+            carried_quat = carried.quat
+
+        dist = np.linalg.norm(goal - start)
+        n_step = max(int(np.ceil(dist / (speed * self.bullet.time_step))), 1)
+        for i in range(1, n_step + 1):
+            if i == n_step or self.bus.due(self.world_tick):
+                gpos = start + (goal - start) * (float(i) / n_step)
+                pe.reset_body(gripper.uid, gpos, quat)
+                if carried is not None:
+                    pe.reset_body(carried.uid, gpos + offset, carried_quat)
+                self.bus.publish(self.world_tick)
+            self._advance_tick()
+            if self.time_out:
+                return False
+
+        # hold the gripper where it was placed once physics resumes
+        self.gripper.move_to(goal, self.gripper.target[1])
+        return True
 
     def _step_move(self, trans, orn=None):
         if orn is not None:
@@ -0,0 +1,440 @@
+"""
+Sharded on-disk storage of expert demonstrations
+
+A dataset is a directory of shards. Each shard is a pair of files:
+    <prefix>_<n>.bin: raw bytes of the arrays of its demos, back to back
+    <prefix>_<n>.idx: one JSON line per demo with the offset, dtype and
+        shape of each of its arrays in the .bin file
+and meta.json holds the format version, program names and vocabulary of the
+dataset.
+
+A demo is the output of NPIView.expert_program_trace, encoded as:
+    states/object_states, states/agent_states: float32 frames
+    states/images: uint8 frames
+    states/commands: int32 vocabulary ids of the commands
+    depth/offsets: start of each depth-trace sequence, plus the end
+    depth/<key>: the sequence values of a trace field, concatenated
+    trace/<program>/offsets, trace/<program>/<key>: the same for the
+        program call sequences of each program in all_trace
+Trace fields are int32 with -1 for None. Trace pointers, i.e.
+(program name, psid, sequence index) tuples, are (L, 3) int32 arrays with
+the program index in place of the name.
+"""
+
+import glob
+import json
+import os
+import random
+import threading
+import traceback
+from collections import defaultdict
+try:
+    from Queue import Full, Queue
+except ImportError:
+    from queue import Full, Queue
+
+import numpy as np
+
+
+META = 'meta.json'
+
+# Version of the encoding below, bumped on every incompatible change
+VERSION = 2
+
+# Trace fields holding pointers to other traces
+PTR_KEYS = ('caller_ptr', 'callee_ptr')
+
+# Trace fields that may be None
+NULLABLE_KEYS = ('state_seq_ptr', 'frame_ptr', 'psid') + PTR_KEYS
+
+STATE_DTYPES = {'object_states': np.float32,
+                'agent_states': np.float32,
+                'images': np.uint8}
+
+# Alignment of the arrays in a shard, in bytes
+ALIGN = 64
+
+
+def _encode_field(key, values, program_to_ind):
+    if key in PTR_KEYS:
+        ptrs = [(-1, -1, -1) if v is None else
+                (program_to_ind[v[0]], v[1], v[2]) for v in values]
+        return np.array(ptrs, dtype=np.int32).reshape((-1, 3))
+    return np.array([-1 if v is None else v for v in values], dtype=np.int32)
+
+
+def _encode_seqs(prefix, seqs, program_to_ind):
+    """
+    encode a {key: [[values of a sequence], ...]} trace dict
+    """
+    arrays = {}
+    lengths = [len(s) for s in seqs['in_prgs']]
+    arrays[prefix + 'offsets'] = np.cumsum([0] + lengths).astype(np.int64)
+    for k, v in seqs.items():
+        flat = [x for seq in v for x in seq]
+        arrays[prefix + k] = _encode_field(k, flat, program_to_ind)
+    return arrays
+
+
+def encode_demo(demo, program_names):
+    """
+    encode the output of expert_program_trace as a dict of arrays
+    """
+    all_trace, depth_trace, state_log = demo
+    program_to_ind = dict((n, i) for i, n in enumerate(program_names))
+
+    arrays = {}
+    for k, dtype in STATE_DTYPES.items():
+        frames = state_log[k]
+        if frames:
+            arrays['states/' + k] = np.asarray(frames).astype(dtype)
+        else:
+            arrays['states/' + k] = np.zeros((0,), dtype=dtype)
+    # the one-hot commands are stored as ids
+    commands = np.asarray(state_log['commands'])
+    if len(commands):
+        commands = np.argmax(commands, axis=1)
+    arrays['states/commands'] = commands.astype(np.int32)
+
+    arrays.update(_encode_seqs('depth/', depth_trace, program_to_ind))
+    for pname, ptrace in all_trace.items():
+        if ptrace:
+            arrays.update(_encode_seqs('trace/%s/' % pname, ptrace,
+                                       program_to_ind))
+    return arrays
+
+
+def _decode_field(key, arr, program_names):
+    if key in PTR_KEYS:
+        return [None if a < 0 else (program_names[a], b, c)
+                for a, b, c in arr.tolist()]
+    if key in NULLABLE_KEYS:
+        return [None if v < 0 else v for v in arr.tolist()]
+    return arr.tolist()
+
+
+def _decode_seqs(prefix, arrays, program_names):
+    offsets = arrays[prefix + 'offsets'].tolist()
+    seqs = {}
+    for name, arr in arrays.items():
+        if not name.startswith(prefix) or name == prefix + 'offsets':
+            continue
+        k = name[len(prefix):]
+        values = _decode_field(k, arr, program_names)
+        seqs[k] = [values[b:e] for b, e in zip(offsets[:-1], offsets[1:])]
+    return seqs
+
+
+def decode_demo(arrays, program_names, vocabs):
+    """
+    rebuild the output of expert_program_trace from the encoded arrays
+
+    Frames come back as float32, except images which stay uint8.
+    """
+    state_log = {}
+    for k in STATE_DTYPES:
+        state_log[k] = list(np.array(arrays['states/' + k]))
+    ids = arrays['states/commands']
+    commands = np.zeros((len(ids), len(vocabs)), dtype=np.float32)
+    commands[np.arange(len(ids)), ids] = 1
+    state_log['commands'] = list(commands)
+
+    depth_trace = _decode_seqs('depth/', arrays, program_names)
+
+    all_trace = {}
+    for pname in program_names:
+        all_trace[pname] = defaultdict(list)
+        prefix = 'trace/%s/' % pname
+        if prefix + 'offsets' in arrays:
+            all_trace[pname].update(
+                _decode_seqs(prefix, arrays, program_names))
+    return all_trace, depth_trace, state_log
+
+
+def _check_version(meta, path):
+    # datasets from before the version field stored one-hot commands
+    version = meta.get('version', 1)
+    if version != VERSION:
+        raise ValueError('%s has format version %d, expected %d'
+                         % (path, version, VERSION))
+
+
+class DemoWriter(object):
+    """
+    streaming writer of demos to fixed-size shards
+
+    Every demo is written to disk as soon as it is added, so memory use does
+    not grow with the dataset. A new shard is started once the current one
+    exceeds shard_size bytes. Writers of the same dataset running at the same
+    time, e.g. in several processes, need distinct prefixes.
+    """
+
+    def __init__(self, path, program_names, vocabs, prefix='shard',
+                 shard_size=1 << 30):
+        self.path = path
+        self.program_names = list(program_names)
+        self.prefix = prefix
+        self.shard_size = shard_size
+
+        if not os.path.exists(path):
+            os.makedirs(path)
+        meta = {'version': VERSION, 'program_names': self.program_names,
+                'vocabs': list(vocabs)}
+        meta_path = os.path.join(path, META)
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                old_meta = json.load(f)
+            _check_version(old_meta, path)
+            if old_meta != meta:
+                raise ValueError('%s holds demos of other programs or '
+                                 'vocabulary' % path)
+        else:
+            with open(meta_path + '.tmp', 'w') as f:
+                json.dump(meta, f)
+            os.rename(meta_path + '.tmp', meta_path)
+
+        # never append to an existing shard, it may end in a partial demo
+        self._shard = 0
+        while os.path.exists(self._shard_path(self._shard) + '.idx'):
+            self._shard += 1
+        self._bin = None
+        self._idx = None
+
+    def _shard_path(self, shard):
+        return os.path.join(self.path, '%s_%05d' % (self.prefix, shard))
+
+    @property
+    def shard_name(self):
+        return os.path.basename(self._shard_path(self._shard))
+
+    def _open_shard(self):
+        if self._bin is not None:
+            self._bin.close()
+            self._idx.close()
+            self._shard += 1
+        path = self._shard_path(self._shard)
+        self._bin = open(path + '.bin', 'wb')
+        self._idx = open(path + '.idx', 'w')
+
+    def write(self, demo_id, demo):
+        """
+        append a demo, the output of expert_program_trace
+
+        returns:
+            the name of the shard holding the demo
+        """
+        if self._bin is None or self._bin.tell() >= self.shard_size:
+            self._open_shard()
+
+        entry = {'id': demo_id, 'arrays': {}}
+        for name, arr in sorted(encode_demo(demo, self.program_names).items()):
+            pad = -self._bin.tell() % ALIGN
+            self._bin.write(b'\0' * pad)
+            entry['arrays'][name] = [self._bin.tell(), arr.dtype.str,
+                                     list(arr.shape)]
+            self._bin.write(np.ascontiguousarray(arr).tobytes())
+        # the index entry is written last, so that a demo cut short by a
+        # crash is never listed
+        self._bin.flush()
+        os.fsync(self._bin.fileno())
+        self._idx.write(json.dumps(entry) + '\n')
+        self._idx.flush()
+        return self.shard_name
+
+    def close(self):
+        if self._bin is not None:
+            self._bin.close()
+            self._idx.close()
+            self._bin = None
+            self._idx = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class DemoReader(object):
+    """
+    random access reader of a demo dataset
+
+    The shards are memory-mapped, so reading a demo only touches its own
+    pages. reader[i] returns the arrays of demo i as read-only views, and
+    reader.sequence(j) the j-th depth-trace sequence over all demos.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, META)) as f:
+            meta = json.load(f)
+        _check_version(meta, path)
+        self.program_names = meta['program_names']
+        self.vocabs = meta['vocabs']
+
+        # the last entry wins if a demo was written more than once
+        entries = {}
+        order = []
+        for idx_path in sorted(glob.glob(os.path.join(path, '*.idx'))):
+            shard = os.path.basename(idx_path)[:-len('.idx')]
+            with open(idx_path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    entry['shard'] = shard
+                    if entry['id'] not in entries:
+                        order.append(entry['id'])
+                    entries[entry['id']] = entry
+        self._entries = [entries[i] for i in order]
+        self.ids = order
+        self._id_to_ind = dict((d, i) for i, d in enumerate(order))
+
+        # depth-trace sequences per demo, from the shape of their offsets
+        num_seqs = [e['arrays']['depth/offsets'][2][0] - 1
+                    for e in self._entries]
+        self._seq_start = np.cumsum([0] + num_seqs)
+        self._maps = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def num_sequences(self):
+        return int(self._seq_start[-1])
+
+    def _map(self, shard):
+        if shard not in self._maps:
+            self._maps[shard] = np.memmap(
+                os.path.join(self.path, shard + '.bin'), dtype=np.uint8,
+                mode='r')
+        return self._maps[shard]
+
+    def _array(self, entry, name):
+        offset, dtype, shape = entry['arrays'][name]
+        dtype = np.dtype(dtype)
+        size = int(np.prod(shape)) * dtype.itemsize
+        buf = self._map(entry['shard'])[offset:offset + size]
+        return buf.view(dtype).reshape(shape)
+
+    def __getitem__(self, i):
+        """
+        arrays of the i-th demo, see the module docstring for the names
+        """
+        entry = self._entries[i]
+        return dict((name, self._array(entry, name))
+                    for name in entry['arrays'])
+
+    def index(self, demo_id):
+        return self._id_to_ind[demo_id]
+
+    def decode(self, i):
+        """
+        the i-th demo in the format of expert_program_trace
+        """
+        return decode_demo(self[i], self.program_names, self.vocabs)
+
+    def sequence(self, j, images=True):
+        """
+        the j-th depth-trace sequence
+
+        returns:
+            dict of the (L,) or (L, 3) trace fields of the sequence, with the
+            states at the frame of each step when images is set
+        """
+        i = int(np.searchsorted(self._seq_start, j, side='right')) - 1
+        k = j - self._seq_start[i]
+        entry = self._entries[i]
+        offsets = self._array(entry, 'depth/offsets')
+        b, e = offsets[k], offsets[k + 1]
+        seq = {'demo': i}
+        for name in entry['arrays']:
+            if name.startswith('depth/') and name != 'depth/offsets':
+                seq[name[len('depth/'):]] = np.array(
+                    self._array(entry, name)[b:e])
+        if images:
+            frames = seq['frame_ptr']
+            for key in ('object_states', 'agent_states', 'images'):
+                seq[key] = self._array(entry, 'states/' + key)[frames]
+        return seq
+
+    def close(self):
+        self._maps = {}
+
+
+class _WorkerError(object):
+
+    def __init__(self, tb):
+        self.tb = tb
+
+
+class BatchPrefetcher(object):
+    """
+    background thread assembling minibatches of depth-trace sequences
+
+    Iterating yields lists of batch_size sequences from DemoReader.sequence,
+    passed through collate if given. At most queue_size batches are held in
+    memory ahead of the consumer. An error in the thread is raised by the
+    next call to next as a RuntimeError.
+    """
+
+    def __init__(self, reader, batch_size, shuffle=True, collate=None,
+                 queue_size=4, seed=None):
+        # batches are drawn forever, there would never be one
+        if reader.num_sequences == 0:
+            raise ValueError('%s holds no sequences' % reader.path)
+        self._reader = reader
+        self._batch_size = batch_size
+        self._shuffle = shuffle
+        self._collate = collate
+        self._queue = Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._rng = random.Random(seed)
+        self._error = None
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def _run(self):
+        try:
+            order = list(range(self._reader.num_sequences))
+            while not self._stop.is_set():
+                if self._shuffle:
+                    self._rng.shuffle(order)
+                for b in range(0, len(order), self._batch_size):
+                    batch = [self._reader.sequence(j)
+                             for j in order[b:b + self._batch_size]]
+                    if self._collate is not None:
+                        batch = self._collate(batch)
+                    if not self._put(batch):
+                        return
+        except Exception:
+            # handed to the consumer, which would otherwise wait forever
+            self._put(_WorkerError(traceback.format_exc()))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._error is None:
+            batch = self._queue.get()
+            if not isinstance(batch, _WorkerError):
+                return batch
+            self._error = batch
+        raise RuntimeError('prefetch worker failed:\n%s' % self._error.tb)
+
+    next = __next__
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
@@ -0,0 +1,67 @@
+"""
+Goal predicates compiled into index arrays
+"""
+
+import numpy as np
+
+
+class CompiledGoals(object):
+    """
+    end constraints of a task compiled against the instances of a scene
+
+    Every (source instance, target instance) pair of every constraint is a
+    row of the index arrays, so that all constraints are evaluated at once
+    from a single batched read of the instance positions. Only valid while
+    the constraints and the instances of the scene stay the same.
+    """
+
+    def __init__(self, constraints, world):
+        """
+        args:
+            constraints: the end constraints of the task
+            world: the BaseWorld resolving task objects to instances
+        """
+        self.constraints = constraints
+        self.names = []
+        name_ind = {}
+
+        def index(name):
+            if name not in name_ind:
+                name_ind[name] = len(self.names)
+                self.names.append(name)
+            return name_ind[name]
+
+        src, tgt, cstr, xy_error = [], [], [], []
+        for i, c in enumerate(constraints):
+            if c['type'] != 'on_top':
+                raise NotImplementedError(
+                    'cannot check condition! %s' % c['type'])
+            src_objs = world.get_task_object(c['src']).instances
+            tgt_obj = world.get_task_object(c['target']).instances[0]
+            scale = world.interface.obj[tgt_obj].scale
+            for o in src_objs:
+                src.append(index(o))
+                tgt.append(index(tgt_obj))
+                cstr.append(i)
+                xy_error.append(scale[:2].max())
+
+        self.src = np.array(src, dtype=np.intp)
+        self.tgt = np.array(tgt, dtype=np.intp)
+        self.cstr = np.array(cstr, dtype=np.intp)
+        self.xy_error = np.array(xy_error, dtype=np.float64)
+        self.n_pairs = np.bincount(self.cstr, minlength=len(constraints))
+
+    def evaluate(self, positions):
+        """
+        args:
+            positions: (N, 3) positions of the instances in self.names
+        returns:
+            all_satisfied: (C,) if every pair of a constraint is satisfied
+            n_satisfied: (C,) number of satisfied pairs of each constraint
+        """
+        distance = positions[self.src] - positions[self.tgt]
+        xy_dist = np.linalg.norm(distance[:, :2], axis=1)
+        on_top = np.logical_and(xy_dist <= self.xy_error, distance[:, 2] > 0)
+        n_satisfied = np.bincount(self.cstr[on_top],
+                                  minlength=len(self.constraints))
+        return n_satisfied == self.n_pairs, n_satisfied
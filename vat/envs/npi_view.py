@@ -5,10 +5,136 @@ Function that generates neural program traces
 from collections import defaultdict
 from copy import deepcopy
 
+import numpy as np
+
+
+# Trace fields holding pointers to other traces
+PTR_KEYS = ('caller_ptr', 'callee_ptr')
+
+
+class TraceStore(object):
+    """
+    columnar store of the traces of a demonstration
+
+    Every trace is a row identified by its integer id, with one growable
+    numpy column per field. None is stored as -1 and a trace pointer as the
+    row id it points to. The rows of each program call, i.e. the
+    (program, psid) sequences, are indexed in call order.
+    """
+
+    def __init__(self, defaults, capacity=256):
+        self.keys = list(defaults.keys())
+        self.nullable = set(k for k, v in defaults.items() if v is None)
+        self._key_ind = dict((k, i) for i, k in enumerate(self.keys))
+        # the position of a row in its program call sequence
+        self._seq_col = len(self.keys)
+        self._template = [-1 if defaults[k] is None else defaults[k]
+                          for k in self.keys] + [0]
+        self._data = np.empty((capacity, len(self._template)),
+                              dtype=np.int64, order='F')
+        self.num_rows = 0
+        self.sequences = {}
+
+    def add(self, fields):
+        """
+        add a trace and return its row id
+        """
+        row_id = self.num_rows
+        if row_id == self._data.shape[0]:
+            data = np.empty((2 * row_id, self._data.shape[1]),
+                            dtype=np.int64, order='F')
+            data[:row_id] = self._data
+            self._data = data
+
+        row = list(self._template)
+        key_ind = self._key_ind
+        for k, v in fields.items():
+            row[key_ind[k]] = -1 if v is None else v
+        seq = self.sequences.setdefault((fields['in_prgs'], fields['psid']),
+                                        [])
+        row[self._seq_col] = len(seq)
+        seq.append(row_id)
+
+        self._data[row_id] = row
+        self.num_rows += 1
+        return row_id
+
+    def column(self, k):
+        return self._data[:self.num_rows, self._key_ind[k]]
+
+    def get(self, row_id, k):
+        return int(self._data[row_id, self._key_ind[k]])
+
+    def set(self, row_ids, k, v):
+        self._data[row_ids, self._key_ind[k]] = v
+
+    def sequence_of(self, row_id):
+        """
+        rows of the program call a trace belongs to
+        """
+        return self.sequences[(self.get(row_id, 'in_prgs'),
+                               self.get(row_id, 'psid'))]
+
+    def decoder(self, program_names):
+        """
+        function decoding (field, row id) into the value of the trace dicts
+        """
+        cols = dict((k, self.column(k).tolist()) for k in self.keys)
+        seq = self._data[:self.num_rows, self._seq_col].tolist()
+        in_prgs = cols['in_prgs']
+        psid = cols['psid']
+        nullable = self.nullable
+
+        def decode(k, row_id):
+            v = cols[k][row_id]
+            if k in PTR_KEYS:
+                if v < 0:
+                    return None
+                return (program_names[in_prgs[v]], psid[v], seq[v])
+            if v < 0 and k in nullable:
+                return None
+            return v
+        return decode
+
+
+class ProgramRegistry(object):
+    """
+    dispatch tables of the programs of an API
+
+    Programs are referred to by their index in names: funcs and experts hold
+    the program and expert functions by index, and act and adaptive are
+    bitsets of the ACT and ADAPTIVE programs. The tables are built once and
+    must not be modified.
+    """
+
+    def __init__(self, programs, expert_programs, act, adaptive):
+        self.programs = tuple(programs)
+        self.names = tuple(p[0] for p in self.programs)
+        self.to_ind = dict((n, i) for i, n in enumerate(self.names))
+        self.funcs = tuple(p[1] for p in self.programs)
+        self.experts = tuple(expert_programs.get(n) for n in self.names)
+        self.act = self._bitset(act)
+        self.adaptive = self._bitset(adaptive)
+        self.act_inds = tuple(self.to_ind[n] for n in act)
+        self.adaptive_inds = tuple(self.to_ind[n] for n in adaptive)
+
+    def _bitset(self, names):
+        mask = 0
+        for n in names:
+            mask |= 1 << self.to_ind[n]
+        return mask
+
+    def is_act(self, ind):
+        return bool(self.act >> ind & 1)
+
+    def is_adaptive(self, ind):
+        return bool(self.adaptive >> ind & 1)
+
 
 class NPIView:
 
     def __init__(self):
+        self._registry = None
         self._trace = {'in_prgs': 0,  # input program id
                        'in_args': 0,  # input argument
                        'out_prgs': 0,  # output program id
@@ -40,6 +166,10 @@ class NPIView:
     def command(self, words):
         raise NotImplementedError
 
+    def export_state_log(self):
+        """state log in the format returned by expert_program_trace"""
+        return self.state_log
+
     @property
     def entry_point(self):
         raise NotImplementedError
@@ -60,59 +190,52 @@ class NPIView:
     def expert_programs(self):
         raise NotImplementedError
 
-    def add_trace(self, trace):
-        pname = self.program_names[trace['in_prgs']]
-        psid = trace['psid']
-        trace['frame_ptr'] = self.current_frame
-        trace['out_boundary_begin'] = self.current_frame
-        trace['cmd_out_boundary_begin'] = self.current_command
+    def add_trace(self, trace, outputs):
+        """
+        add the trace of a program call with the given output fields
+
+        args:
+            trace: input fields of the program call
+            outputs: output fields of this step
+        returns:
+            row id of the new trace
+        """
+        fields = dict(trace)
+        fields.update(outputs)
+        fields['frame_ptr'] = self.current_frame
+        fields['out_boundary_begin'] = self.current_frame
+        fields['cmd_out_boundary_begin'] = self.current_command
 
         """
-        print('PRG: %s ARGS: %s OPRG: %s OARGS: %s' % (pname,
-                                                       self.world.ind_to_name(trace['in_args']),
-                                                       self.program_names[trace['out_prgs']],
-                                                       self.world.ind_to_name(trace['out_args'])))
+        print('PRG: %s ARGS: %s OPRG: %s OARGS: %s' % (self.program_names[fields['in_prgs']],
+                                                       self.world.ind_to_name(fields['in_args']),
+                                                       self.program_names[fields['out_prgs']],
+                                                       self.world.ind_to_name(fields['out_args'])))
         print(self.state_log['agent_states'][self.current_frame])
         print(self.state_log['object_states'][self.current_frame])
         """
 
-        self.push_trace(trace)
-
-        # add to serialized trace log
-        for k, v in trace.items():
-            # initialization of the dictionry
-            if k not in self.all_trace[pname]:
-                self.all_trace[pname][k] = [[]]
-
-            # new program call of this program
-            if len(self.all_trace[pname][k]) < psid + 1:
-                self.all_trace[pname][k].append([])
-
-            self.all_trace[pname][k][psid].append(v)
-
-        seq_ptr = len(self.all_trace[pname]['in_prgs'][psid]) - 1
-        trace_ptr = (pname, psid, seq_ptr)
+        trace_ptr = self.traces.add(fields)
+        self.push_trace(trace_ptr, fields.get('out_prg_mask', 1))
 
         # also point caller's trace to the callee
-        if trace['caller_ptr']:
-            caller_name, caller_psid, seq_i = trace['caller_ptr']
-            self.all_trace[caller_name]['callee_ptr'][
-                caller_psid][seq_i] = trace_ptr
+        if trace['caller_ptr'] is not None:
+            self.traces.set(trace['caller_ptr'], 'callee_ptr', trace_ptr)
 
-        return (pname, psid, seq_ptr)
+        return trace_ptr
 
     def call_expert(self, caller_trace, pname, args=None, stop=False, command=None):
         """append the current trace and call the next program"""
-        caller_trace = caller_trace.copy()
-        caller_trace['out_prgs'] = self.program_to_ind[pname]
-        caller_trace['out_args'] = args if args else 0
-        caller_trace['out_arg_mask'] = int(args is not None)
-        caller_trace['out_boundary_mask'] = int(
-            pname in self.ADAPTIVE)  # if callee is adaptive
-        caller_trace['out_stops'] = int(stop)
+        pid = self.registry.to_ind[pname]
+        outputs = {'out_prgs': pid,
+                   'out_args': args if args else 0,
+                   'out_arg_mask': int(args is not None),
+                   # if callee is adaptive
+                   'out_boundary_mask': int(self.registry.is_adaptive(pid)),
+                   'out_stops': int(stop)}
 
         # add to program trace
-        caller_ptr = self.add_trace(caller_trace)
+        caller_ptr = self.add_trace(caller_trace, outputs)
 
         # call expert program
         self.call_expert_helper(pname, args, caller_ptr, command)
@@ -123,29 +246,29 @@ class NPIView:
     def call_expert_helper(self, pname, args, caller_ptr=None, command=None):
         """format the trace for the next program and call the expert program"""
         # call the expert program
-        callee_trace = self.trace
-        callee_trace['caller_ptr'] = caller_ptr
-        callee_trace['adaptive'] = int(pname in self.ADAPTIVE)
-        callee_trace['in_prgs'] = self.program_to_ind[pname]
-        callee_trace['in_args'] = args if args else 0
-        callee_trace['in_boundary_begin'] = self.current_frame
-        callee_trace['cmd_in_boundary_begin'] = self.current_command
+        registry = self.registry
+        pid = registry.to_ind[pname]
         self.psid[pname] += 1
-        callee_trace['psid'] = self.psid[pname]
+        callee_trace = {'caller_ptr': caller_ptr,
+                        'adaptive': int(registry.is_adaptive(pid)),
+                        'in_prgs': pid,
+                        'in_args': args if args else 0,
+                        'in_boundary_begin': self.current_frame,
+                        'cmd_in_boundary_begin': self.current_command,
+                        'psid': self.psid[pname]}
 
         if command:
             self.command(command)
-        self.expert_programs[pname](callee_trace)
+        registry.experts[pid](callee_trace)
 
     def call_stop(self, trace, args=None):
         """call stop and append the trace"""
-        trace = trace.copy()
-        trace['out_stops'] = 1
-        trace['out_args'] = args if args else 0
-        trace['out_arg_mask'] = int(args is not None)
-        trace['out_prg_mask'] = 0  # dummy prg
-        trace['out_boundary_mask'] = 0  # dummy boundary
-        trace_ptr = self.add_trace(trace)
+        outputs = {'out_stops': 1,
+                   'out_args': args if args else 0,
+                   'out_arg_mask': int(args is not None),
+                   'out_prg_mask': 0,  # dummy prg
+                   'out_boundary_mask': 0}  # dummy boundary
+        trace_ptr = self.add_trace(trace, outputs)
         return trace['caller_ptr'], trace_ptr
 
     def append_trace(self, caller_ptr, trace_ptr):
@@ -158,41 +281,35 @@ class NPIView:
         depth_trace = self.pop_trace()
 
         # record end boundary of this program sequence
-        pname, psid, _ = trace_ptr
-        for i in xrange(len(self.all_trace[pname]['in_boundary_end'][psid])):
-            self.all_trace[pname]['in_boundary_end'][
-                psid][i] = self.current_frame + 1
-            self.all_trace[pname]['cmd_in_boundary_end'][
-                psid][i] = self.current_command
+        rows = self.traces.sequence_of(trace_ptr)
+        self.traces.set(rows, 'in_boundary_end', self.current_frame + 1)
+        self.traces.set(rows, 'cmd_in_boundary_end', self.current_command)
 
         # record boundary frame in caller's trace
         if caller_ptr is not None:
-            caller_name, caller_psid, seq_i = caller_ptr
-            self.all_trace[caller_name]['out_boundary_end'][
-                caller_psid][seq_i] = self.current_frame + 1
-            self.all_trace[caller_name]['cmd_out_boundary_end'][
-                caller_psid][seq_i] = self.current_command
+            self.traces.set(caller_ptr, 'out_boundary_end',
+                            self.current_frame + 1)
+            self.traces.set(caller_ptr, 'cmd_out_boundary_end',
+                            self.current_command)
         return depth_trace
 
-    def push_trace(self, trace):
-        self.trace_stack[-1].append(trace)
-        if trace['out_prg_mask']:
+    def push_trace(self, trace_ptr, out_prg_mask):
+        self.trace_stack[-1].append(trace_ptr)
+        if out_prg_mask:
             self.trace_stack.append([])
 
     def pop_trace(self):
+        """
+        pop the traces of the current program and return its depth traces
+
+        The program sequence just popped and the caller trace on top of the
+        stack are the rows whose end boundaries call_stop_helper records.
+        """
         curr_leaf = self.trace_stack.pop()
-        for leaf_trace in curr_leaf:
-            leaf_trace['in_boundary_end'] = self.current_frame + 1
-            leaf_trace['cmd_in_boundary_end'] = self.current_command
 
-        if self.program_names[curr_leaf[0]['in_prgs']] not in self.ACT:
+        if not self.registry.is_act(self.traces.get(curr_leaf[0], 'in_prgs')):
             curr_leaf = [curr_leaf[-1]]
 
-        # end the caller output boundary
-        if self.trace_stack:
-            self.trace_stack[-1][-1]['out_boundary_end'] = self.current_frame + 1
-            self.trace_stack[-1][-1]['cmd_out_boundary_end'] = self.current_command
-
         depth_trace = []
         for leaf_trace in curr_leaf:
             # end the input boundary of this program
@@ -216,13 +333,12 @@ class NPIView:
 
         # initialization
         self.psid = {}
-        self.all_trace = {}
+        self.traces = TraceStore(self._trace)
         self.depth_trace = []
         self.trace_stack = [[]]
         self.success = True
         for n in self.program_names:
             self.psid[n] = -1
-            self.all_trace[n] = defaultdict(list)
 
         self.state_log = deepcopy(self._state_log_tmp)
         self.observe()
@@ -241,51 +357,67 @@ class NPIView:
         self.trace_sanity_check()
         serial_depth_trace = self.serialize_depth_trace()
 
-        return self.all_trace, serial_depth_trace, self.state_log
+        return self.all_trace, serial_depth_trace, self.export_state_log()
+
+    @property
+    def all_trace(self):
+        """
+        program traces as {program: {field: [[values of a call], ...]}}
+        """
+        decode = self.traces.decoder(self.program_names)
+        all_trace = {}
+        for n in self.program_names:
+            # programs that were never called list no calls
+            all_trace[n] = defaultdict(list, in_prgs=[])
+        for (pid, _), rows in sorted(self.traces.sequences.items()):
+            ptrace = all_trace[self.program_names[pid]]
+            for k in self.traces.keys:
+                ptrace[k].append([decode(k, r) for r in rows])
+        return all_trace
 
     def serialize_depth_trace(self):
+        decode = self.traces.decoder(self.program_names)
         serial_trace = {}
         for k in self.trace:
             serial_trace[k] = []
 
         for seq_trace in self.depth_trace:
             for k in serial_trace:
-                serial_trace[k].append([])
-
-            for trace in seq_trace:
-                for k, v in trace.items():
-                    serial_trace[k][-1].append(v)
+                # callee pointers are only recorded in the program traces
+                if k == 'callee_ptr':
+                    serial_trace[k].append([None] * len(seq_trace))
+                else:
+                    serial_trace[k].append([decode(k, r) for r in seq_trace])
 
         return serial_trace
 
     def trace_sanity_check(self):
         assert (not self.trace_stack)
 
-        for p, pentry in self.all_trace.items():
-            num_seq = len(pentry['in_prgs'])
-            for i in xrange(num_seq):
-                seq_len = len(pentry['in_prgs'][i])
-                for j in xrange(seq_len):
-                    caller_ptr = pentry['caller_ptr'][i][j]
-                    if caller_ptr is None:
-                        continue
-
-                    caller_name, ci, cj = caller_ptr
-                    assert(self.all_trace[caller_name]['out_boundary_begin'][ci][cj] ==
-                           pentry['in_boundary_begin'][i][j])
-                    assert(self.all_trace[caller_name]['out_boundary_end'][ci][cj] ==
-                           pentry['in_boundary_end'][i][j])
+        caller_ptr = self.traces.column('caller_ptr')
+        rows = np.nonzero(caller_ptr >= 0)[0]
+        callers = caller_ptr[rows]
+        for caller_key, key in [('out_boundary_begin', 'in_boundary_begin'),
+                                ('out_boundary_end', 'in_boundary_end')]:
+            assert(np.array_equal(self.traces.column(caller_key)[callers],
+                                  self.traces.column(key)[rows]))
+
+    @property
+    def registry(self):
+        """program dispatch tables, built on first use"""
+        if self._registry is None:
+            self._registry = ProgramRegistry(self.programs,
+                                             self.expert_programs,
+                                             self.ACT, self.ADAPTIVE)
+        return self._registry
 
     @property
     def program_to_ind(self):
-        d = {}
-        for i, name in enumerate(self.program_names):
-            d[name] = i
-        return d
+        return self.registry.to_ind
 
     @property
     def program_names(self):
-        return [p[0] for p in self.programs]
+        return self.registry.names
 
     @property
     def programs(self):
@@ -0,0 +1,98 @@
+"""
+Tick-driven observation callbacks
+"""
+
+import threading
+
+
+class ObservationBus(object):
+    """
+    subscribers called every period ticks of whatever publishes on the bus
+
+    A subscriber is a capture function and an optional consume function
+    called with what was captured. Both run where the tick is published:
+    simulated interfaces publish from their stepping loop, and interfaces
+    that do not step the world, e.g. of a real robot, can start the clock
+    of the bus to publish on a background thread every interval seconds.
+    """
+
+    def __init__(self):
+        self._subscribers = []
+        self._next_handle = 0
+        # held while the clock publishes
+        self.lock = threading.RLock()
+        self._clock = None
+        self._clock_stop = None
+        self._error = None
+
+    def subscribe(self, capture, period=1, consume=None):
+        """
+        returns:
+            handle to unsubscribe with
+        """
+        handle = self._next_handle
+        self._next_handle += 1
+        self._subscribers.append((handle, period, capture, consume))
+        return handle
+
+    def unsubscribe(self, handle):
+        self._subscribers = [s for s in self._subscribers if s[0] != handle]
+
+    @property
+    def num_subscribers(self):
+        return len(self._subscribers)
+
+    def due(self, tick):
+        """if any subscriber is called at tick"""
+        for _, period, _, _ in self._subscribers:
+            if tick % period == 0:
+                return True
+        return False
+
+    def publish(self, tick):
+        for _, period, capture, consume in self._subscribers:
+            if tick % period:
+                continue
+            data = capture()
+            if consume is not None:
+                consume(data)
+
+    @property
+    def clocked(self):
+        """if the clock is publishing"""
+        return self._clock is not None
+
+    def start_clock(self, interval):
+        """publish a tick every interval seconds on a background thread"""
+        if self._clock is not None:
+            return
+        self._clock_stop = threading.Event()
+        self._clock = threading.Thread(target=self._run_clock,
+                                       args=(interval,))
+        self._clock.daemon = True
+        self._clock.start()
+
+    def stop_clock(self):
+        """
+        stop the clock, raising the error a subscriber called from it raised
+        """
+        if self._clock is None:
+            return
+        self._clock_stop.set()
+        self._clock.join()
+        self._clock = None
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _run_clock(self, interval):
+        tick = 0
+        while not self._clock_stop.is_set():
+            try:
+                with self.lock:
+                    self.publish(tick)
+            except Exception as e:
+                self._error = e
+                return
+            tick += 1
+            self._clock_stop.wait(interval)
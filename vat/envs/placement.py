@@ -0,0 +1,55 @@
+"""
+Collision-free placement of objects on a workspace grid
+"""
+
+import numpy as np
+
+
+def footprint_radius(boundary):
+    """
+    radius of the xy collision footprint of an object boundary
+    """
+    return max(boundary[:2]) / 2
+
+
+class PlacementGrid(object):
+    """
+    candidate xy positions and the footprints placed among them
+
+    Instead of testing every candidate against every placed object, the
+    grid keeps the clearance of each candidate, i.e. the smallest distance
+    from it to the footprint edge of a placed object. Placing an object
+    updates the clearances in a single vectorized pass, and sampling a
+    position for an object picks the first candidate whose clearance is
+    larger than the footprint radius of the object, in grid order.
+    """
+
+    def __init__(self, grid):
+        """
+        args:
+            grid: (G, 2) array of candidate xy positions, in sampling order
+        """
+        self.grid = np.asarray(grid, dtype=np.float64)
+        self.clearance = np.full(len(self.grid), np.inf)
+
+    def add(self, pos, boundary):
+        """
+        mark the footprint of an object at pos as occupied
+        """
+        dist = np.linalg.norm(self.grid - np.asarray(pos)[:2], axis=1)
+        np.minimum(self.clearance, dist - footprint_radius(boundary),
+                   out=self.clearance)
+
+    def sample(self, boundary, z):
+        """
+        first candidate position where an object does not collide with the
+        placed ones
+        returns:
+            xyz position at height z
+        """
+        free = self.clearance > footprint_radius(boundary)
+        ind = np.argmax(free)
+        if not free[ind]:
+            raise ValueError('cannot find valid position')
+        x, y = self.grid[ind]
+        return np.array([x, y, z])
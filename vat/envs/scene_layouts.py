@@ -0,0 +1,173 @@
+"""
+Scene layouts, sampled online or precomputed into a library
+"""
+
+import hashlib
+import json
+
+import numpy as np
+from builtins import range
+
+from placement import PlacementGrid
+
+
+def scene_digest(scene_specs):
+    """
+    digest identifying a scene spec, to match it with a layout library
+    """
+    return hashlib.md5(
+        json.dumps(scene_specs, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def sample_layout(scene_specs):
+    """
+    sample the poses of the objects of a scene spec
+
+    Objects are laid out in the order they are added to the scene: preset
+    objects first, then the randomly placed and repeated ones, then the
+    ones on top of others.
+    returns:
+        dict of
+            objects: (K,) index of the spec of each object in
+                scene_specs['objects']
+            xyz: (K, 3) positions
+            rpy: (K, 3) orientations
+    raises:
+        ValueError: if there is no room left for an object
+    """
+    workspace = scene_specs['workspace']
+    objects = scene_specs['objects']
+    # divide workspace into xy grid
+    xmin, xmax = workspace['xlim']
+    ymin, ymax = workspace['ylim']
+    grid_size = workspace['size']
+
+    if 'pos_eps' in workspace:
+        pos_eps = workspace['pos_eps']
+    else:
+        pos_eps = 0
+
+    grid_x, grid_y = np.mgrid[xmin:xmax:grid_size, ymin:ymax:grid_size]
+    grid = np.vstack((grid_x.flatten(), grid_y.flatten())).T
+    grid = np.random.permutation(grid)
+    eps = (np.random.random(grid.shape) * 2 - 1) * pos_eps
+    # [-pos_eps, pos_eps]
+    grid += eps
+
+    # footprints of the placed objects, so that sampling does not need the
+    # bodies to be loaded
+    placement = PlacementGrid(grid)
+
+    inds, xyzs, rpys = [], [], []
+    # positions by instance name, for the objects placed on top of others
+    positions = {}
+    n_instances = {}
+
+    def place(i, xyz):
+        ospec = objects[i]
+        name = ospec['name']
+        n = n_instances.get(name, 0)
+        n_instances[name] = n + 1
+        positions['%s_%i' % (name, n)] = (np.asarray(xyz), ospec['boundary'])
+        placement.add(xyz, ospec['boundary'])
+        inds.append(i)
+        xyzs.append(xyz)
+        rpys.append(ospec['pose']['rpy'])
+
+    def n_repeat(ospec):
+        repeat_range = ospec['pose']['n_repeat']
+        return np.random.choice(np.arange(*repeat_range), size=1)[0]
+
+    # resolve fixed first
+    for i, ospec in enumerate(objects):
+        if ospec['pose']['type'] == 'preset':
+            place(i, ospec['pose']['xyz'])
+
+    # resolve random
+    for i, ospec in enumerate(objects):
+        pose = ospec['pose']
+        if pose['type'] == 'random':
+            place(i, placement.sample(ospec['boundary'], pose['z']))
+        elif pose['type'] == 'random_repeat':
+            for _ in range(n_repeat(ospec)):
+                place(i, placement.sample(ospec['boundary'], pose['z']))
+        elif pose['type'] == 'repeat':
+            for _ in range(n_repeat(ospec)):
+                place(i, pose['xyz'])
+
+    # resolve dependencies
+    for i, ospec in enumerate(objects):
+        if ospec['pose']['type'] == 'on_top':
+            tpos, tboundary = positions[ospec['pose']['target']]
+            tpos = tpos.copy()
+            tpos[2] += ospec['boundary'][2] + tboundary[2]
+            place(i, tpos)
+
+    return {'objects': np.array(inds, dtype=np.int32),
+            'xyz': np.array(xyzs, dtype=np.float64).reshape((-1, 3)),
+            'rpy': np.array(rpys, dtype=np.float64).reshape((-1, 3))}
+
+
+class LayoutLibrary(object):
+    """
+    precomputed layouts of a scene spec
+
+    The layouts are stored in a single npz file as flat arrays of object
+    indices and float32 poses, with the offsets of each layout, along with
+    the digest of the scene spec they were sampled from.
+    """
+
+    def __init__(self, path):
+        with np.load(path) as f:
+            self._objects = f['objects']
+            self._xyz = f['xyz']
+            self._rpy = f['rpy']
+            self._offsets = f['offsets']
+            self.digest = str(f['digest'])
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        start, end = self._offsets[i], self._offsets[i + 1]
+        return {'objects': self._objects[start:end],
+                'xyz': self._xyz[start:end],
+                'rpy': self._rpy[start:end]}
+
+    def matches(self, scene_specs):
+        return self.digest == scene_digest(scene_specs)
+
+    @staticmethod
+    def build(path, scene_specs, num_layouts, max_tries=10):
+        """
+        sample num_layouts layouts of a scene spec and save them to path
+        args:
+            max_tries: attempts per layout before giving up
+        returns:
+            the number of failed attempts
+        """
+        layouts = []
+        n_failed = 0
+        while len(layouts) < num_layouts:
+            for _ in range(max_tries):
+                try:
+                    layouts.append(sample_layout(scene_specs))
+                    break
+                except ValueError:
+                    n_failed += 1
+            else:
+                raise ValueError('cannot sample layout %d' % len(layouts))
+
+        sizes = [len(layout['objects']) for layout in layouts]
+        offsets = np.zeros(num_layouts + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(sizes)
+        np.savez(path,
+                 objects=np.concatenate(
+                     [l['objects'] for l in layouts]).astype(np.int16),
+                 xyz=np.concatenate(
+                     [l['xyz'] for l in layouts]).astype(np.float32),
+                 rpy=np.concatenate(
+                     [l['rpy'] for l in layouts]).astype(np.float32),
+                 offsets=offsets,
+                 digest=np.array(scene_digest(scene_specs)))
+        return n_failed
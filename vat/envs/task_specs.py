@@ -0,0 +1,177 @@
+"""
+Compiled task specifications with random access to single tasks
+
+A task spec file is a JSON document holding the task name, the scene spec
+and a long list of tasks, each of which repeats the same few goal and
+constraint strings. A compiled spec is a directory of:
+    meta.json: the task name, the scene spec, the table of interned values
+        and the table of key schemas
+    offsets.npy: start of each task in tasks.bin, plus the end
+    tasks.bin: the int32 records of the tasks, back to back
+A task record is its schema id and value ids, followed by, for each of
+LIST_KEYS, the number of entries (-1 if missing) and the schema id and
+value ids of every entry. The record file is memory-mapped and the tasks are
+decoded on access only.
+"""
+
+import json
+import os
+from copy import deepcopy
+
+import numpy as np
+
+
+META = 'meta.json'
+OFFSETS = 'offsets.npy'
+RECORDS = 'tasks.bin'
+
+# Task fields holding lists of dicts
+LIST_KEYS = ('goals', 'end_constraints')
+
+
+def compile_task_specs(task_config, path):
+    """
+    compile a task spec document into a directory at path
+    """
+    values = []
+    value_ind = {}
+    schemas = []
+    schema_ind = {}
+
+    def encode(record, out):
+        keys = tuple(sorted(record.keys()))
+        if keys not in schema_ind:
+            schema_ind[keys] = len(schemas)
+            schemas.append(list(keys))
+        out.append(schema_ind[keys])
+        for k in keys:
+            v = record[k]
+            vkey = json.dumps(v, sort_keys=True)
+            if vkey not in value_ind:
+                value_ind[vkey] = len(values)
+                values.append(v)
+            out.append(value_ind[vkey])
+
+    records = []
+    offsets = [0]
+    for task in task_config['tasks']:
+        out = []
+        encode(dict((k, v) for k, v in task.items() if k not in LIST_KEYS),
+               out)
+        for k in LIST_KEYS:
+            if k not in task:
+                out.append(-1)
+                continue
+            out.append(len(task[k]))
+            for entry in task[k]:
+                encode(entry, out)
+        records.extend(out)
+        offsets.append(len(records))
+
+    if not os.path.exists(path):
+        os.makedirs(path)
+    with open(os.path.join(path, META), 'w') as f:
+        json.dump({'name': task_config['name'],
+                   'scene': task_config['scene'],
+                   'values': values,
+                   'schemas': schemas}, f)
+    np.save(os.path.join(path, OFFSETS), np.array(offsets, dtype=np.int64))
+    np.array(records, dtype=np.int32).tofile(os.path.join(path, RECORDS))
+
+
+def _value(v):
+    # interned lists and dicts are shared by the decoded tasks
+    if isinstance(v, (list, dict)):
+        return deepcopy(v)
+    return v
+
+
+class TaskSpecStore(object):
+    """
+    random access reader of a compiled task spec
+
+    store[i] decodes task i into the dict it was compiled from, reading
+    only its own record.
+    """
+
+    def __init__(self, path):
+        with open(os.path.join(path, META)) as f:
+            meta = json.load(f)
+        self.name = meta['name']
+        self.scene = meta['scene']
+        self._values = meta['values']
+        self._schemas = meta['schemas']
+        self._offsets = np.load(os.path.join(path, OFFSETS), mmap_mode='r')
+        if self._offsets[-1] == 0:
+            # an empty file cannot be memory-mapped
+            self._records = np.zeros(0, dtype=np.int32)
+        else:
+            self._records = np.memmap(os.path.join(path, RECORDS),
+                                      dtype=np.int32, mode='r')
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def _decode(self, rec, pos):
+        keys = self._schemas[rec[pos]]
+        record = dict((k, _value(self._values[rec[pos + 1 + j]]))
+                      for j, k in enumerate(keys))
+        return record, pos + 1 + len(keys)
+
+    def _record(self, i):
+        # indexed like the task list of the document
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('task index out of range')
+        return self._records[self._offsets[i]:self._offsets[i + 1]].tolist()
+
+    def __getitem__(self, i):
+        rec = self._record(i)
+        task, pos = self._decode(rec, 0)
+        for k in LIST_KEYS:
+            n = rec[pos]
+            pos += 1
+            if n < 0:
+                continue
+            task[k] = []
+            for _ in range(n):
+                entry, pos = self._decode(rec, pos)
+                task[k].append(entry)
+        return task
+
+    def task_id(self, i):
+        task, _ = self._decode(self._record(i), 0)
+        return task['id']
+
+
+class JsonTaskSpecs(object):
+    """
+    the same interface over a task spec JSON document, parsed in full
+    """
+
+    def __init__(self, path):
+        with open(path) as f:
+            task_config = json.load(f)
+        self.name = task_config['name']
+        self.scene = task_config['scene']
+        self._tasks = task_config['tasks']
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __getitem__(self, i):
+        return self._tasks[i]
+
+    def task_id(self, i):
+        return self._tasks[i]['id']
+
+
+def open_task_specs(path):
+    """
+    open a compiled task spec directory, or a task spec JSON file
+    """
+    if os.path.isdir(path):
+        return TaskSpecStore(path)
+    return JsonTaskSpecs(path)
@@ -0,0 +1,34 @@
+import json
+import os.path as osp
+
+from vat.envs.api import get_task_world
+from vat.envs.bullet_interface import BulletInterface
+from vat.simulation import get_world
+
+
+ROOT = osp.abspath(osp.join(osp.dirname(__file__), '..', '..', '..'))
+DATA_DIR = osp.join(ROOT, 'assets', 'urdf')
+SCENE = osp.join(ROOT, 'tasks', 'scene', 'base.xml')
+TASK_FILE = osp.join(ROOT, 'tasks', 'specs', 'stack', 'stack_2000.json')
+
+
+def load_task_config():
+    with open(TASK_FILE) as f:
+        return json.load(f)
+
+
+def make_task_world(scene_specs=None, **interface_kwargs):
+    """A started stack task world on a headless BulletInterface, with the
+    scene of the stack task by default."""
+    world = get_world('bullet', display=False, data_dir=DATA_DIR,
+                      verbose=False)
+    world.load(SCENE)
+    world.start(0.001)
+    task_config = load_task_config()
+    if scene_specs is None:
+        scene_specs = task_config['scene']
+    task_world = get_task_world(task_config['name'])(
+        BulletInterface(world, **interface_kwargs), scene_specs,
+        random_task=False)
+    task_world.start_world()
+    return task_world
@@ -0,0 +1,71 @@
+import unittest
+from collections import namedtuple
+from copy import deepcopy
+
+import numpy as np
+
+from vat.envs.api import CommandEncoder, FullAPI
+
+
+VOCABS = ['pick', 'place', 'release', 'red', 'blue']
+
+TaskObject = namedtuple('TaskObject', 'name')
+
+
+class TaskObjects(object):
+    # the only part of a world the command log needs
+    task_objects = [TaskObject('red'), TaskObject('blue')]
+
+
+def one_hot(vocabs, words):
+    """the baseline command encoding, one vector per word"""
+    cmds = []
+    for w in words:
+        cmd = np.zeros(len(vocabs), dtype=np.float32)
+        cmd[vocabs.index(w)] = 1
+        cmds.append(cmd)
+    return cmds
+
+
+class CommandEncoderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.encoder = CommandEncoder(VOCABS)
+
+    def test_encode(self):
+        self.assertEqual(self.encoder.encode(['pick', 'blue', 'pick']),
+                         [0, 4, 0])
+        self.assertEqual(self.encoder.encode([]), [])
+
+    def test_unknown_word(self):
+        with self.assertRaises(AssertionError):
+            self.encoder.encode(['green'])
+
+    def test_one_hot(self):
+        words = ['place', 'red', 'release']
+        cmds = self.encoder.one_hot(self.encoder.encode(words))
+        self.assertEqual(cmds.dtype, np.float32)
+        np.testing.assert_array_equal(cmds, one_hot(VOCABS, words))
+        self.assertEqual(self.encoder.one_hot([]).shape, (0, len(VOCABS)))
+
+
+class CommandLogTest(unittest.TestCase):
+
+    def test_export(self):
+        api = FullAPI(TaskObjects())
+        api.state_log = deepcopy(api._state_log_tmp)
+        api.command(['pick', 'red'])
+        api.command(['place', 'blue'])
+        self.assertEqual(api.current_command, 4)
+        self.assertEqual(api.state_log['commands'], [0, 3, 1, 4])
+
+        state_log = api.export_state_log()
+        np.testing.assert_array_equal(
+            state_log['commands'],
+            one_hot(api.vocabs, ['pick', 'red', 'place', 'blue']))
+        # the log itself keeps the ids
+        self.assertEqual(api.state_log['commands'], [0, 3, 1, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
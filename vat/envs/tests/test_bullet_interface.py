@@ -0,0 +1,253 @@
+import unittest
+
+import numpy as np
+
+from vat.envs.base_interface import BaseInterface
+from vat.envs.bullet_interface import OFFSETS, plan_trajectory
+from vat.envs.tests import load_task_config, make_task_world
+
+
+class PlanTrajectoryTest(unittest.TestCase):
+
+    speed = 2.0
+    accel = 20.0
+    dt = 0.001
+
+    def plan(self, waypoints):
+        return plan_trajectory(waypoints, self.speed, self.accel, self.dt)
+
+    def check_profile(self, pos, frac, waypoints):
+        np.testing.assert_array_equal(pos[-1], waypoints[-1])
+        self.assertEqual(frac[-1], 1)
+        self.assertTrue(np.all(np.diff(frac) > 0))
+        path = np.concatenate([[waypoints[0]], pos])
+        step = np.linalg.norm(np.diff(path, axis=0), axis=1)
+        self.assertLessEqual(step.max(), self.speed * self.dt + 1e-9)
+        self.assertLessEqual(np.abs(np.diff(step)).max(),
+                             self.accel * self.dt ** 2 + 1e-9)
+
+    def test_cruise(self):
+        waypoints = np.array([[0, 0, 1], [1, 0, 1]], dtype=np.float64)
+        pos, frac = self.plan(waypoints)
+        self.check_profile(pos, frac, waypoints)
+        # accelerates to the max speed, holds it and brakes
+        total = 1 / self.speed + self.speed / self.accel
+        self.assertEqual(len(pos), int(np.ceil(total / self.dt)))
+        step = np.linalg.norm(np.diff(pos, axis=0), axis=1)
+        self.assertAlmostEqual(step[len(step) // 2], self.speed * self.dt)
+        np.testing.assert_allclose(pos[:, 1:], [[0, 1]] * len(pos))
+
+    def test_short(self):
+        waypoints = np.array([[0, 0, 0], [0, 0, 0.01]], dtype=np.float64)
+        pos, frac = self.plan(waypoints)
+        self.check_profile(pos, frac, waypoints)
+        # never reaches the max speed
+        step = np.linalg.norm(np.diff(pos, axis=0), axis=1)
+        self.assertLess(step.max(), 0.5 * self.speed * self.dt)
+
+    def test_waypoints(self):
+        waypoints = np.array([[0, 0, 0], [0.2, 0, 0], [0.2, 0.3, 0]])
+        pos, frac = self.plan(waypoints)
+        self.check_profile(pos, frac, waypoints)
+        # on the path through the corner
+        on_path = np.logical_or(np.isclose(pos[:, 1], 0),
+                                np.isclose(pos[:, 0], 0.2))
+        self.assertTrue(np.all(on_path))
+        corner = np.argmin(np.linalg.norm(pos - waypoints[1], axis=1))
+        np.testing.assert_allclose(frac[corner], 0.4, atol=1e-2)
+
+    def test_no_move(self):
+        pos, frac = self.plan([[0.1, 0.2, 0.3], [0.1, 0.2, 0.3]])
+        np.testing.assert_array_equal(pos, [[0.1, 0.2, 0.3]])
+        np.testing.assert_array_equal(frac, [1])
+
+
+class MoveAlongTest(unittest.TestCase):
+
+    def setUp(self):
+        self.world = make_task_world(trajectory=True)
+        self.interface = self.world.interface
+
+    def tearDown(self):
+        self.interface.bullet.close()
+
+    def test_reaches_goal(self):
+        start = self.interface.gpos
+        goal = start + np.array([0.2, -0.1, 0.05])
+        tick = self.interface.world_tick
+        self.assertTrue(self.interface.move_to_xyz(goal))
+        np.testing.assert_array_less(np.abs(self.interface.gpos - goal),
+                                     self.interface.pos_error + 1e-9)
+        # the planned ticks, plus a few to settle
+        pos, _ = plan_trajectory([start, goal], self.interface.max_speed,
+                                 self.interface.max_accel, 0.001)
+        n_ticks = self.interface.world_tick - tick
+        self.assertGreaterEqual(n_ticks, len(pos))
+        self.assertLess(n_ticks, len(pos) + self.interface.max_settle_step)
+
+
+class KinematicTest(unittest.TestCase):
+
+    def setUp(self):
+        self.world = make_task_world(kinematic=True)
+        self.interface = self.world.interface
+        self.gripper = self.interface.obj['gripper']
+        self.world.set_task(load_task_config()['tasks'][0])
+        self.world.start_task()
+        self.start = self.interface.gpos
+
+    def tearDown(self):
+        self.interface.bullet.close()
+
+    def n_ticks(self, goal, speed):
+        dist = np.linalg.norm(goal - self.start)
+        return int(np.ceil(dist / (speed * 0.001)))
+
+    def test_ticks_at_speed(self):
+        goal = self.start + np.array([0.2, -0.1, 0.05])
+        for speed in (0.5, 1.0, 100.0):
+            tick = self.interface.world_tick
+            self.assertTrue(self.interface._teleport_to(goal, speed))
+            # capped by max_speed
+            self.assertEqual(self.interface.world_tick - tick,
+                             self.n_ticks(goal, min(speed,
+                                                    self.interface.max_speed)))
+            np.testing.assert_allclose(self.interface.gpos, goal, atol=1e-6)
+            goal, self.start = self.start, goal
+
+    def test_constraint_target(self):
+        goal = self.start + np.array([0.1, 0.1, -0.1])
+        self.interface._teleport_to(goal)
+        np.testing.assert_allclose(self.interface.gripper.target[0],
+                                   goal + OFFSETS['gripper_z'], atol=1e-6)
+        # held there once physics runs
+        self.interface.wait_until_settled(500)
+        np.testing.assert_allclose(self.interface.gpos, goal, atol=1e-3)
+
+    def test_carried_offset(self):
+        name = self.world.all_object_instances[0]
+        self.interface.move_to_above(name)
+        self.interface.reach_to_grasp(name)
+        self.interface.grip(name)
+        cube = self.interface.obj[name]
+        offset = cube.pos - self.gripper.pos
+        quat = cube.quat
+
+        self.start = self.interface.gpos
+        self.interface._teleport_to(self.start + np.array([0.1, 0.2, 0.1]))
+        np.testing.assert_allclose(cube.pos - self.gripper.pos, offset,
+                                   atol=1e-6)
+        np.testing.assert_allclose(cube.quat, quat, atol=1e-6)
+
+    def test_observations(self):
+        period = 7
+        seen = []
+        self.world.subscribe(
+            lambda: (self.interface.world_tick, self.interface.gpos), period,
+            seen.append)
+        goal = self.start + np.array([-0.2, 0.1, 0])
+        tick = self.interface.world_tick
+        self.interface._teleport_to(goal)
+        n = self.n_ticks(goal, self.interface.max_speed)
+        self.assertEqual([t for t, _ in seen],
+                         [t for t in range(tick, tick + n) if t % period == 0])
+        # on the straight path, where the gripper is after the tick
+        for t, pos in seen:
+            frac = float(t - tick + 1) / n
+            np.testing.assert_allclose(pos, self.start + (goal - self.start) *
+                                       frac, atol=1e-6)
+
+
+class WaitUntilSettledTest(unittest.TestCase):
+
+    def setUp(self):
+        self.world = make_task_world()
+        self.interface = self.world.interface
+        self.gripper = self.interface.obj['gripper']
+
+    def tearDown(self):
+        self.interface.bullet.close()
+
+    def assert_settled(self):
+        names = [n for n, b in self.interface.obj.items() if not b.fixed]
+        vel = self.interface.bullet.get_body_velocities(names)
+        np.testing.assert_array_less(np.linalg.norm(vel[:, :3], axis=1),
+                                     1e-3)
+        np.testing.assert_array_less(
+            np.abs(self.gripper.pos - self.interface.gripper.target[0]),
+            1e-3)
+
+    def test_settles(self):
+        ticks = self.interface.wait_until_settled(2000)
+        self.assertLess(ticks, 2000)
+        self.assert_settled()
+        # already at rest
+        self.assertEqual(self.interface.wait_until_settled(2000), 5)
+
+    def test_gripper_target(self):
+        self.interface.wait_until_settled(2000)
+        # at rest, but pulled to a new target
+        pos, euler = self.interface.gripper.target
+        self.interface.gripper.move_to(pos + np.array([0, 0, 0.1]), euler)
+        ticks = self.interface.wait_until_settled(2000)
+        self.assertGreater(ticks, 5)
+        self.assertLess(ticks, 2000)
+        self.assert_settled()
+
+    def test_budget(self):
+        stats = self.interface.bullet.enable_stats()
+        # the gripper is still moving at the start of a task
+        self.assertEqual(self.interface.wait_until_settled(3), 3)
+        self.assertEqual(stats.ticks, 3)
+        ticks = self.world.wait_until_settled(12)
+        self.assertEqual(self.interface.world_tick, ticks)
+
+    def test_fixed_wait(self):
+        stats = self.interface.bullet.enable_stats()
+        self.interface.wait_until_settled(2000)
+        # the whole wait, even at rest
+        ticks = stats.ticks
+        self.world.wait(7)
+        self.assertEqual(stats.ticks - ticks, 7)
+        self.assertEqual(self.interface.world_tick, 0)
+
+    def test_time_out(self):
+        self.interface.max_world_tick = 3
+        self.assertEqual(
+            self.interface.wait_until_settled(100, observe=True), 4)
+        self.assertTrue(self.interface.time_out)
+
+    def test_base_interface(self):
+        waits = []
+
+        class Interface(BaseInterface):
+            # only knows how to wait a number of ticks
+            def wait(self, x):
+                waits.append(x)
+
+        self.assertEqual(Interface().wait_until_settled(30), 30)
+        self.assertEqual(waits, [30])
+
+    def test_release(self):
+        self.world.set_task(load_task_config()['tasks'][0])
+        self.world.start_task()
+        self.interface.wait_until_settled(2000)
+        name = self.world.all_object_instances[0]
+        self.interface.move_to_above(name)
+        self.interface.reach_to_grasp(name)
+        self.interface.grip(name)
+        self.interface.move_relative_z(0.005)
+
+        self.interface.wait_until_settled(2000)
+
+        stats = self.interface.bullet.enable_stats()
+        tick = self.interface.world_tick
+        self.world.action_release()
+        self.assertIsNone(self.interface.carrying)
+        # the pause before the release ends at the first check, unobserved
+        self.assertEqual(stats.ticks, 5)
+        self.assertEqual(self.interface.world_tick, tick)
+
+
+if __name__ == '__main__':
+    unittest.main()
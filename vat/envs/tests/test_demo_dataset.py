@@ -0,0 +1,286 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from collections import defaultdict
+
+import numpy as np
+
+from vat.envs import demo_dataset
+from vat.envs.demo_dataset import (BatchPrefetcher, DemoReader, DemoWriter,
+                                   decode_demo, encode_demo)
+
+
+PROGRAMS = ['stack', 'move', 'grip']
+VOCABS = ['<pad>', 'stack', 'red', 'on', 'blue']
+
+
+def make_demo(seed=0, n_frames=3):
+    """a small demo in the format of expert_program_trace"""
+    rng = np.random.RandomState(seed)
+    state_log = {
+        'object_states': [rng.rand(4, 6).astype(np.float32)
+                          for _ in range(n_frames)],
+        'agent_states': [rng.rand(7).astype(np.float32)
+                         for _ in range(n_frames)],
+        'images': [rng.randint(0, 255, (8, 8, 3)).astype(np.uint8)
+                   for _ in range(n_frames)],
+        'commands': list(np.eye(len(VOCABS), dtype=np.float32)[[1, 2, 3, 4]]),
+    }
+    depth_trace = {
+        'in_prgs': [[0, 1], [0, 1]],
+        'out_stops': [[0, 1], [1, 1]],
+        'psid': [[0, 0], [0, 1]],
+        'frame_ptr': [[0, 1], [1, n_frames - 1]],
+        'caller_ptr': [[None, ('stack', 0, 0)], [None, ('stack', 0, 1)]],
+        'callee_ptr': [[None, None], [None, None]],
+    }
+    all_trace = {
+        'stack': {
+            'in_prgs': [[0, 0, 0]],
+            'out_stops': [[0, 0, 1]],
+            'psid': [[0, 0, 0]],
+            'frame_ptr': [[0, 1, 2]],
+            'caller_ptr': [[None, None, None]],
+            'callee_ptr': [[('move', 0, 0), ('move', 1, 0), None]],
+        },
+        'move': {
+            'in_prgs': [[1], [1]],
+            'out_stops': [[1], [1]],
+            'psid': [[0], [1]],
+            'frame_ptr': [[1], [None]],
+            'caller_ptr': [[('stack', 0, 0)], [('stack', 0, 1)]],
+            'callee_ptr': [[None], [None]],
+        },
+        # never called
+        'grip': defaultdict(list, in_prgs=[]),
+    }
+    return all_trace, depth_trace, state_log
+
+
+class EncodeTest(unittest.TestCase):
+
+    def test_dtypes(self):
+        arrays = encode_demo(make_demo(), PROGRAMS)
+        self.assertEqual(arrays['states/object_states'].dtype, np.float32)
+        self.assertEqual(arrays['states/images'].dtype, np.uint8)
+        np.testing.assert_array_equal(arrays['states/commands'],
+                                      [1, 2, 3, 4])
+        np.testing.assert_array_equal(arrays['depth/offsets'], [0, 2, 4])
+        np.testing.assert_array_equal(arrays['depth/psid'], [0, 0, 0, 1])
+        np.testing.assert_array_equal(
+            arrays['depth/caller_ptr'],
+            [[-1, -1, -1], [0, 0, 0], [-1, -1, -1], [0, 0, 1]])
+        np.testing.assert_array_equal(arrays['trace/move/frame_ptr'],
+                                      [1, -1])
+
+    def test_round_trip(self):
+        demo = make_demo()
+        all_trace, depth_trace, state_log = decode_demo(
+            encode_demo(demo, PROGRAMS), PROGRAMS, VOCABS)
+
+        for k in demo[2]:
+            np.testing.assert_array_equal(state_log[k], demo[2][k])
+        self.assertEqual(depth_trace, demo[1])
+        self.assertEqual(sorted(all_trace), sorted(PROGRAMS))
+        for pname in PROGRAMS:
+            self.assertEqual(dict(all_trace[pname]), dict(demo[0][pname]))
+
+    def test_empty_states(self):
+        demo = make_demo(n_frames=0)
+        demo[2]['commands'] = []
+        arrays = encode_demo(demo, PROGRAMS)
+        self.assertEqual(arrays['states/images'].shape, (0,))
+        self.assertEqual(arrays['states/commands'].shape, (0,))
+        state_log = decode_demo(arrays, PROGRAMS, VOCABS)[2]
+        self.assertEqual(state_log['commands'], [])
+
+
+class DemoWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_write_and_read(self):
+        with DemoWriter(self.path, PROGRAMS, VOCABS) as writer:
+            writer.write('a', make_demo(0))
+            writer.write('b', make_demo(1))
+        reader = DemoReader(self.path)
+        self.assertEqual(reader.ids, ['a', 'b'])
+        self.assertEqual(reader.index('b'), 1)
+        expected = encode_demo(make_demo(1), PROGRAMS)
+        arrays = reader[1]
+        self.assertEqual(sorted(arrays), sorted(expected))
+        for name in expected:
+            np.testing.assert_array_equal(arrays[name], expected[name])
+            self.assertEqual(arrays[name].dtype, expected[name].dtype)
+        reader.close()
+
+    def test_shard_size(self):
+        with DemoWriter(self.path, PROGRAMS, VOCABS, shard_size=1) as writer:
+            self.assertEqual(writer.write('a', make_demo(0)), 'shard_00000')
+            self.assertEqual(writer.write('b', make_demo(1)), 'shard_00001')
+
+    def test_resume(self):
+        with DemoWriter(self.path, PROGRAMS, VOCABS) as writer:
+            writer.write('a', make_demo(0))
+            writer.write('b', make_demo(1))
+        # a demo cut short by a crash
+        with open(os.path.join(self.path, 'shard_00000.idx'), 'a') as f:
+            f.write('{"id": "c", "arr')
+
+        with DemoWriter(self.path, PROGRAMS, VOCABS) as writer:
+            # never appends to an existing shard
+            self.assertEqual(writer.write('c', make_demo(2)), 'shard_00001')
+            # written again, e.g. by a retried task
+            writer.write('a', make_demo(3))
+
+        reader = DemoReader(self.path)
+        self.assertEqual(reader.ids, ['a', 'b', 'c'])
+        np.testing.assert_array_equal(
+            reader[0]['states/agent_states'],
+            encode_demo(make_demo(3), PROGRAMS)['states/agent_states'])
+        np.testing.assert_array_equal(
+            reader[2]['states/agent_states'],
+            encode_demo(make_demo(2), PROGRAMS)['states/agent_states'])
+
+    def test_prefixes(self):
+        with DemoWriter(self.path, PROGRAMS, VOCABS, prefix='w0') as w0:
+            with DemoWriter(self.path, PROGRAMS, VOCABS, prefix='w1') as w1:
+                w0.write('a', make_demo(0))
+                w1.write('b', make_demo(1))
+        reader = DemoReader(self.path)
+        self.assertEqual(sorted(reader.ids), ['a', 'b'])
+        self.assertTrue(os.path.exists(
+            os.path.join(self.path, demo_dataset.META)))
+
+    def test_other_programs(self):
+        DemoWriter(self.path, PROGRAMS, VOCABS).close()
+        with self.assertRaises(ValueError):
+            DemoWriter(self.path, PROGRAMS[:2], VOCABS)
+
+
+class VersionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        with DemoWriter(self.path, PROGRAMS, VOCABS) as writer:
+            writer.write('a', make_demo(0))
+        self.meta_path = os.path.join(self.path, demo_dataset.META)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def set_meta(self, **kwargs):
+        with open(self.meta_path) as f:
+            meta = json.load(f)
+        meta.update(kwargs)
+        if kwargs.get('version') is None:
+            del meta['version']
+        with open(self.meta_path, 'w') as f:
+            json.dump(meta, f)
+
+    def test_written(self):
+        with open(self.meta_path) as f:
+            self.assertEqual(json.load(f)['version'], demo_dataset.VERSION)
+        self.assertEqual(len(DemoReader(self.path)), 1)
+
+    def test_unversioned(self):
+        # written before the commands were stored as ids
+        self.set_meta(version=None)
+        with self.assertRaises(ValueError):
+            DemoReader(self.path)
+        with self.assertRaises(ValueError):
+            DemoWriter(self.path, PROGRAMS, VOCABS)
+
+    def test_newer(self):
+        self.set_meta(version=demo_dataset.VERSION + 1)
+        with self.assertRaises(ValueError):
+            DemoReader(self.path)
+
+
+class DemoReaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        with DemoWriter(self.path, PROGRAMS, VOCABS, shard_size=1) as writer:
+            writer.write('a', make_demo(0))
+            writer.write('b', make_demo(1, n_frames=4))
+        self.reader = DemoReader(self.path)
+
+    def tearDown(self):
+        self.reader.close()
+        shutil.rmtree(self.path)
+
+    def test_decode(self):
+        demo = make_demo(1, n_frames=4)
+        all_trace, depth_trace, state_log = self.reader.decode(1)
+        self.assertEqual(depth_trace, demo[1])
+        np.testing.assert_array_equal(state_log['images'], demo[2]['images'])
+        np.testing.assert_array_equal(state_log['commands'],
+                                      demo[2]['commands'])
+
+    def test_sequence(self):
+        self.assertEqual(self.reader.num_sequences, 4)
+        demo = make_demo(1, n_frames=4)
+        seq = self.reader.sequence(3)
+        self.assertEqual(seq['demo'], 1)
+        np.testing.assert_array_equal(seq['frame_ptr'], [1, 3])
+        np.testing.assert_array_equal(seq['caller_ptr'],
+                                      [[-1, -1, -1], [0, 0, 1]])
+        np.testing.assert_array_equal(
+            seq['images'], [demo[2]['images'][1], demo[2]['images'][3]])
+        self.assertNotIn('images', self.reader.sequence(0, images=False))
+
+
+class BatchPrefetcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        with DemoWriter(self.path, PROGRAMS, VOCABS) as writer:
+            writer.write('a', make_demo(0))
+            writer.write('b', make_demo(1))
+        self.reader = DemoReader(self.path)
+
+    def tearDown(self):
+        self.reader.close()
+        shutil.rmtree(self.path)
+
+    def test_batches(self):
+        prefetcher = BatchPrefetcher(self.reader, 3, shuffle=False,
+                                     collate=lambda b: [s['demo'] for s in b])
+        # batches run on over the epochs
+        self.assertEqual([next(prefetcher) for _ in range(3)],
+                         [[0, 0, 1], [1], [0, 0, 1]])
+        prefetcher.close()
+
+    def test_worker_error(self):
+        def collate(batch):
+            raise KeyError('no such field')
+
+        prefetcher = BatchPrefetcher(self.reader, 2, collate=collate)
+        for _ in range(2):
+            with self.assertRaises(RuntimeError) as ctx:
+                next(prefetcher)
+            self.assertIn('no such field', str(ctx.exception))
+        prefetcher.close()
+
+    def test_empty(self):
+        path = tempfile.mkdtemp()
+        try:
+            DemoWriter(path, PROGRAMS, VOCABS).close()
+            reader = DemoReader(path)
+            self.assertEqual(reader.num_sequences, 0)
+            with self.assertRaises(ValueError):
+                BatchPrefetcher(reader, 2)
+            reader.close()
+        finally:
+            shutil.rmtree(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from argparse import Namespace
+
+import numpy as np
+
+import generate_demos
+from vat.envs.demo_dataset import DemoWriter
+from vat.envs.tests import DATA_DIR, SCENE, TASK_FILE
+from vat.envs.tests.test_demo_dataset import PROGRAMS, VOCABS, make_demo
+
+
+class ReadManifestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.output = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output)
+
+    def test_missing(self):
+        self.assertEqual(generate_demos.read_manifest(self.output), set())
+
+    def test_done_entries(self):
+        with open(os.path.join(self.output, generate_demos.MANIFEST),
+                  'w') as f:
+            f.write(json.dumps({'id': 'a', 'status': 'done'}) + '\n')
+            f.write(json.dumps({'id': 'b', 'status': 'failed'}) + '\n')
+            # cut short by a killed run
+            f.write('{"id": "c", "sta')
+        self.assertEqual(generate_demos.read_manifest(self.output),
+                         set(['a']))
+
+
+class ReadWrittenTest(unittest.TestCase):
+
+    def setUp(self):
+        self.output = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output)
+
+    def test_missing(self):
+        self.assertEqual(generate_demos.read_written(self.output), set())
+
+    def test_not_in_manifest(self):
+        # written by workers killed before the parent logged the demos
+        for prefix, demo_id in (('worker1', 'a'), ('worker2', 'b')):
+            with DemoWriter(self.output, PROGRAMS, VOCABS,
+                            prefix=prefix) as writer:
+                writer.write(demo_id, make_demo())
+        self.assertEqual(generate_demos.read_manifest(self.output), set())
+        self.assertEqual(generate_demos.read_written(self.output),
+                         set(['a', 'b']))
+
+
+class GenerateTest(unittest.TestCase):
+    """The scene of a task does not depend on the tasks run before it."""
+
+    def setUp(self):
+        self.output = tempfile.mkdtemp()
+        self.args = Namespace(physics='bullet', time_step=0.001,
+                              data_dir=DATA_DIR, scene=SCENE,
+                              task=TASK_FILE, api='full',
+                              output=self.output, max_tries=1,
+                              shard_size=1, seed=0, layouts=None,
+                              trajectory=0, kinematic=0)
+
+    def tearDown(self):
+        generate_demos._worker.clear()
+        shutil.rmtree(self.output)
+
+    def initial_scenes(self, indices):
+        generate_demos.init_worker(self.args)
+        bw = generate_demos._worker['bw']
+        scenes = []
+
+        def record():
+            # the scene at the start of the task, without running the expert
+            names = bw.all_object_instances
+            scenes.append(bw.interface.positions(names))
+            return None
+
+        generate_demos._worker['api'].expert_program_trace = record
+        for index in indices:
+            entry = generate_demos.generate(index)
+            self.assertEqual(entry['status'], 'failed')
+        generate_demos._worker['world'].close()
+        return scenes
+
+    def test_scene_is_seeded_per_task(self):
+        after_others = self.initial_scenes([0, 2, 1])[-1]
+        alone = self.initial_scenes([1])[-1]
+        np.testing.assert_array_equal(after_others, alone)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+from copy import deepcopy
+
+import numpy as np
+
+from vat.envs.tests import load_task_config, make_task_world
+from vat.envs.tests.test_scene_layouts import mixed_scene
+
+
+def baseline_task_done(world):
+    """task_done as it was before the constraints were compiled"""
+    for c in world.end_constraints:
+        s, ns = world.satisfied(c)
+        if 'count' in c:
+            return ns == c['count']
+        if not s:
+            return False
+    return True
+
+
+class CompiledGoalsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.RandomState(0)
+
+    def tearDown(self):
+        self.world.interface.bullet.close()
+
+    def scramble(self):
+        """stack some instances on others, spread out the rest"""
+        names = self.world.all_object_instances
+        bodies = self.world.interface.obj
+        order = self.rng.permutation(len(names))
+        for k, i in enumerate(order):
+            body = bodies[names[i]]
+            if k and self.rng.rand() < 0.6:
+                below = bodies[names[order[self.rng.randint(k)]]]
+                # around the edge of the xy tolerance of on_top
+                offset = self.rng.uniform(-1.2, 1.2, 2) * \
+                    below.scale[:2].max()
+                z = below.pos[2] + self.rng.uniform(-0.02, 0.1)
+                body.pos = np.append(below.pos[:2] + offset, z)
+            else:
+                body.pos = np.append(self.rng.uniform(-0.3, 0.3, 2), 0.7)
+
+    def check(self):
+        world = self.world
+        goals = world.goals
+        all_satisfied, n_satisfied = goals.evaluate(
+            world.interface.positions(goals.names))
+        expected = [world.satisfied(c) for c in world.end_constraints]
+        self.assertEqual(
+            [(bool(s), int(ns)) for s, ns in zip(all_satisfied, n_satisfied)],
+            expected)
+        self.assertEqual(world.task_done, baseline_task_done(world))
+        self.assertEqual(world.check_n_satisfied(),
+                         sum(ns for _, ns in expected))
+        return expected
+
+    def test_stack_tasks(self):
+        self.world = make_task_world()
+        n_satisfied = 0
+        for task in load_task_config()['tasks'][:10]:
+            self.world.set_task(task)
+            self.assertIs(self.world.goals.constraints,
+                          task['end_constraints'])
+            for _ in range(20):
+                self.scramble()
+                n_satisfied += sum(ns for _, ns in self.check())
+        # the scrambles satisfy some of the constraints
+        self.assertGreater(n_satisfied, 10)
+
+    def test_instances(self):
+        self.world = make_task_world(mixed_scene())
+        task = {'goals': [],
+                'end_constraints': [
+                    {'type': 'on_top', 'src': 'pile', 'target': 'post'},
+                    {'type': 'on_top', 'src': 'row', 'target': 'pile'},
+                    {'type': 'on_top', 'src': 'pile', 'target': 'free',
+                     'count': 1}]}
+        self.world.set_task(task)
+        n_pile = len(self.world.get_task_object('pile').instances)
+        np.testing.assert_array_equal(self.world.goals.n_pairs,
+                                      [n_pile, 2, n_pile])
+        for _ in range(50):
+            self.scramble()
+            self.check()
+
+    def test_unknown_constraint(self):
+        self.world = make_task_world()
+        task = deepcopy(load_task_config()['tasks'][0])
+        task['end_constraints'][0]['type'] = 'next_to'
+        self.world.set_task(task)
+        with self.assertRaises(NotImplementedError):
+            self.world.goals
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+
+import numpy as np
+
+from vat.envs.api import FlatAPI, FullAPI
+from vat.envs.npi_view import ProgramRegistry, TraceStore
+
+
+DEFAULTS = {'in_prgs': 0,
+            'in_args': 0,
+            'out_stops': 0,
+            'psid': None,
+            'frame_ptr': None,
+            'caller_ptr': None}
+
+PROGRAMS = ['stack', 'move']
+
+
+class TraceStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.traces = TraceStore(DEFAULTS, capacity=2)
+
+    def add_call(self, pid, psid, n, **fields):
+        rows = []
+        for i in range(n):
+            f = dict(fields, in_prgs=pid, psid=psid, in_args=i)
+            rows.append(self.traces.add(f))
+        return rows
+
+    def test_defaults(self):
+        row = self.traces.add({'in_prgs': 1, 'psid': None})
+        self.assertEqual(row, 0)
+        self.assertEqual(self.traces.get(row, 'out_stops'), 0)
+        self.assertEqual(self.traces.get(row, 'frame_ptr'), -1)
+        decode = self.traces.decoder(PROGRAMS)
+        self.assertEqual(decode('in_prgs', row), 1)
+        self.assertIsNone(decode('frame_ptr', row))
+        self.assertIsNone(decode('psid', row))
+        self.assertIsNone(decode('caller_ptr', row))
+
+    def test_grows(self):
+        rows = self.add_call(0, 0, 5, frame_ptr=3)
+        self.assertEqual(rows, list(range(5)))
+        self.assertEqual(self.traces.num_rows, 5)
+        np.testing.assert_array_equal(self.traces.column('in_args'),
+                                      range(5))
+        np.testing.assert_array_equal(self.traces.column('frame_ptr'),
+                                      [3] * 5)
+
+    def test_sequences(self):
+        stack = self.add_call(0, 0, 2)
+        move0 = self.add_call(1, 0, 3)
+        stack += self.add_call(0, 0, 1)
+        move1 = self.add_call(1, 1, 1)
+        self.assertEqual(self.traces.sequences,
+                         {(0, 0): stack, (1, 0): move0, (1, 1): move1})
+        self.assertEqual(self.traces.sequence_of(stack[2]), stack)
+        self.assertEqual(self.traces.sequence_of(move0[1]), move0)
+
+    def test_pointers(self):
+        stack = self.add_call(0, 0, 2)
+        move0 = self.add_call(1, 0, 2, caller_ptr=stack[0])
+        move1 = self.add_call(1, 1, 1, caller_ptr=stack[1])
+        decode = self.traces.decoder(PROGRAMS)
+        self.assertEqual(decode('caller_ptr', move0[1]), ('stack', 0, 0))
+        self.assertEqual(decode('caller_ptr', move1[0]), ('stack', 0, 1))
+        self.assertIsNone(decode('caller_ptr', stack[0]))
+
+    def test_set(self):
+        rows = self.add_call(0, 0, 3)
+        self.traces.set(rows[1:], 'out_stops', 1)
+        np.testing.assert_array_equal(self.traces.column('out_stops'),
+                                      [0, 1, 1])
+        self.traces.set(rows[2], 'caller_ptr', rows[0])
+        decode = self.traces.decoder(PROGRAMS)
+        self.assertEqual(decode('caller_ptr', rows[2]), ('stack', 0, 0))
+
+
+class ProgramRegistryTest(unittest.TestCase):
+
+    def test_tables(self):
+        def noop(args):
+            return args
+
+        def move(args):
+            return args
+
+        def expert_stack(trace):
+            return trace
+
+        registry = ProgramRegistry(
+            [('stack', noop), ('pick', noop), ('move', move)],
+            {'stack': expert_stack}, ['move'], ['stack', 'pick'])
+        self.assertEqual(registry.names, ('stack', 'pick', 'move'))
+        self.assertEqual(registry.to_ind, {'stack': 0, 'pick': 1, 'move': 2})
+        self.assertEqual(registry.funcs, (noop, noop, move))
+        self.assertEqual(registry.experts, (expert_stack, None, None))
+        self.assertEqual(registry.act_inds, (2,))
+        self.assertEqual(registry.adaptive_inds, (0, 1))
+        self.assertEqual([registry.is_act(i) for i in range(3)],
+                         [False, False, True])
+        self.assertEqual([registry.is_adaptive(i) for i in range(3)],
+                         [True, True, False])
+
+    def test_unknown_program(self):
+        with self.assertRaises(KeyError):
+            ProgramRegistry([('stack', None)], {}, ['move'], [])
+
+    def test_apis(self):
+        # the registry agrees with the program lists of the APIs
+        for cls in (FullAPI, FlatAPI):
+            api = cls(None)
+            registry = api.registry
+            self.assertIs(api.registry, registry)
+            names = [n for n, _ in api.programs]
+            self.assertEqual(list(api.program_names), names)
+            for i, (name, func) in enumerate(api.programs):
+                self.assertEqual(api.program_to_ind[name], i)
+                self.assertEqual(registry.funcs[i], func)
+                self.assertEqual(registry.experts[i],
+                                 api.expert_programs.get(name))
+                self.assertEqual(registry.is_act(i), name in api.ACT)
+                self.assertEqual(registry.is_adaptive(i),
+                                 name in api.ADAPTIVE)
+
+
+if __name__ == '__main__':
+    unittest.main()
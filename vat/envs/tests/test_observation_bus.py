@@ -0,0 +1,128 @@
+import time
+import unittest
+from copy import deepcopy
+
+from vat.envs.api import FullAPI
+from vat.envs.base_interface import BaseInterface
+from vat.envs.observation_bus import ObservationBus
+
+
+class ObservationBusTest(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = ObservationBus()
+
+    def test_periods(self):
+        captured = []
+        consumed = []
+        self.bus.subscribe(lambda: captured.append('a'), 2)
+        handle = self.bus.subscribe(lambda: 'b', 3, consumed.append)
+        self.assertEqual(self.bus.num_subscribers, 2)
+        self.assertEqual([self.bus.due(t) for t in range(5)],
+                         [True, False, True, True, True])
+        for tick in range(7):
+            self.bus.publish(tick)
+        self.assertEqual(len(captured), 4)
+        self.assertEqual(consumed, ['b'] * 3)
+
+        self.bus.unsubscribe(handle)
+        self.assertEqual(self.bus.num_subscribers, 1)
+        self.assertFalse(self.bus.due(3))
+
+    def test_clock(self):
+        ticks = []
+        self.bus.subscribe(lambda: len(ticks), 1, ticks.append)
+        self.assertFalse(self.bus.clocked)
+        self.bus.start_clock(0.001)
+        self.assertTrue(self.bus.clocked)
+        time.sleep(0.05)
+        self.bus.stop_clock()
+        self.assertFalse(self.bus.clocked)
+        self.assertGreater(len(ticks), 1)
+        self.assertEqual(ticks, list(range(len(ticks))))
+        # stopped
+        n = len(ticks)
+        time.sleep(0.01)
+        self.assertEqual(len(ticks), n)
+
+    def test_clock_error(self):
+        def capture():
+            raise KeyError('no robot state')
+
+        self.bus.subscribe(capture)
+        self.bus.start_clock(0.001)
+        time.sleep(0.01)
+        with self.assertRaises(KeyError):
+            self.bus.stop_clock()
+        # raised once
+        self.bus.stop_clock()
+
+
+class RobotWorld(object):
+    """a world whose interface does not step it"""
+
+    def __init__(self):
+        self.interface = BaseInterface()
+        self.interface.time_out = False
+        self.object_state = 'objects'
+        self.agent_state = 'agent'
+        self.image = 'image'
+
+    def subscribe(self, capture, period, consume=None):
+        return self.interface.bus.subscribe(capture, period, consume)
+
+    def unsubscribe(self, handle):
+        self.interface.bus.unsubscribe(handle)
+
+    def action_move_to(self, target):
+        # the robot takes its time
+        time.sleep(0.02)
+        return None, False, None
+
+
+class RecordingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.world = RobotWorld()
+        self.api = FullAPI(self.world, robot=True)
+        self.api.state_log = deepcopy(self.api._state_log_tmp)
+
+    def test_no_publisher(self):
+        with self.assertRaises(RuntimeError):
+            self.api.start_recording()
+
+    def test_clock(self):
+        bus = self.world.interface.bus
+        bus.start_clock(0.001)
+        self.api.start_recording(period=1)
+        time.sleep(0.05)
+        self.api.observe()
+        self.api.stop_recording()
+        bus.stop_clock()
+        n_frames = self.api.current_frame + 1
+        self.assertGreater(n_frames, 2)
+        for k in ('object_states', 'agent_states', 'images'):
+            self.assertEqual(len(self.api.state_log[k]), n_frames)
+
+    def test_move_during_clock_recording(self):
+        bus = self.world.interface.bus
+        self.api.robot_obs_interval = 0.001
+        self.api.start_clock_recording()
+        try:
+            for full_demo in (False, True):
+                n_frames = self.api.current_frame
+                self.api.program_move(0, full_demo=full_demo)
+                # the move neither ends nor doubles the clock recording
+                self.assertEqual(bus.num_subscribers, 1)
+                self.assertGreater(self.api.current_frame, n_frames)
+            n_frames = self.api.current_frame
+            time.sleep(0.02)
+            self.assertGreater(self.api.current_frame, n_frames)
+        finally:
+            self.api.stop_clock_recording()
+        self.assertEqual(bus.num_subscribers, 0)
+        self.assertFalse(bus.clocked)
+
+
+if __name__ == '__main__':
+    unittest.main()
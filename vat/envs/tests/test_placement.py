@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+
+from vat.envs.placement import PlacementGrid, footprint_radius
+
+
+def find_valid_pos(grid, placed, boundary, z):
+    """the placement loop PlacementGrid replaces, one check per pair"""
+    for x, y in grid:
+        tpos = np.array([x, y, z])
+        if all(np.linalg.norm((tpos - pos)[:2]) >
+               max(boundary[:2]) / 2 + max(pboundary[:2]) / 2
+               for pos, pboundary in placed):
+            return tpos
+    raise ValueError('cannot find valid position')
+
+
+class PlacementGridTest(unittest.TestCase):
+
+    def test_footprint_radius(self):
+        self.assertEqual(footprint_radius([0.08, 0.1, 0.3]), 0.05)
+
+    def test_first_free(self):
+        grid = [[0, 0], [0.05, 0], [0.1, 0], [0.2, 0]]
+        placement = PlacementGrid(grid)
+        np.testing.assert_array_equal(placement.sample([0.1, 0.1, 0.1], 0.7),
+                                      [0, 0, 0.7])
+        placement.add([0, 0, 0.7], [0.1, 0.1, 0.1])
+        # touching footprints collide
+        np.testing.assert_array_equal(placement.sample([0.1, 0.1, 0.1], 0.7),
+                                      [0.2, 0, 0.7])
+        np.testing.assert_array_equal(
+            placement.sample([0.02, 0.02, 0.1], 0.5), [0.1, 0, 0.5])
+
+    def test_full(self):
+        placement = PlacementGrid([[0, 0], [0.05, 0]])
+        placement.add([0.02, 0, 0], [0.1, 0.1, 0.1])
+        with self.assertRaises(ValueError):
+            placement.sample([0.01, 0.01, 0.01], 0)
+
+    def test_matches_pairwise_checks(self):
+        for seed in range(30):
+            rng = np.random.RandomState(seed)
+            grid = rng.permutation(
+                np.mgrid[-0.2:0.2:0.05, -0.2:0.2:0.05].reshape(2, -1).T)
+            grid += rng.uniform(-0.02, 0.02, grid.shape)
+            placement = PlacementGrid(grid)
+            placed = []
+            for _ in range(12):
+                boundary = list(rng.uniform(0.02, 0.12, 3))
+                try:
+                    expected = find_valid_pos(grid, placed, boundary, 0.7)
+                except ValueError:
+                    with self.assertRaises(ValueError):
+                        placement.sample(boundary, 0.7)
+                    break
+                pos = placement.sample(boundary, 0.7)
+                np.testing.assert_array_equal(pos, expected)
+                placement.add(pos, boundary)
+                placed.append((pos, boundary))
+
+
+if __name__ == '__main__':
+    unittest.main()
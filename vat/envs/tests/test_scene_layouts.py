@@ -0,0 +1,185 @@
+import os
+import shutil
+import tempfile
+import unittest
+from copy import deepcopy
+
+import numpy as np
+
+from vat.envs.scene_layouts import LayoutLibrary, sample_layout, scene_digest
+from vat.envs.tests import load_task_config, make_task_world
+from vat.envs.tests.test_placement import find_valid_pos
+
+
+def baseline_layout(scene_specs):
+    """
+    the placement of the scene setup before layouts, without the bodies
+
+    Objects on top of others are left out, the baseline could not place
+    them.
+    """
+    workspace = scene_specs['workspace']
+    xmin, xmax = workspace['xlim']
+    ymin, ymax = workspace['ylim']
+    grid_size = workspace['size']
+    pos_eps = workspace.get('pos_eps', 0)
+    grid_x, grid_y = np.mgrid[xmin:xmax:grid_size, ymin:ymax:grid_size]
+    grid = np.vstack((grid_x.flatten(), grid_y.flatten())).T
+    grid = np.random.permutation(grid)
+    grid += (np.random.random(grid.shape) * 2 - 1) * pos_eps
+
+    placed = []
+    inds = []
+    objects = scene_specs['objects']
+
+    def place(i, xyz):
+        placed.append((np.asarray(xyz, dtype=np.float64),
+                       objects[i]['boundary']))
+        inds.append(i)
+
+    for i, ospec in enumerate(objects):
+        if ospec['pose']['type'] == 'preset':
+            place(i, ospec['pose']['xyz'])
+    for i, ospec in enumerate(objects):
+        pose = ospec['pose']
+        if pose['type'] == 'random':
+            place(i, find_valid_pos(grid, placed, ospec['boundary'],
+                                    pose['z']))
+        elif pose['type'] in ('random_repeat', 'repeat'):
+            n_repeat = np.random.choice(np.arange(*pose['n_repeat']),
+                                        size=1)[0]
+            for _ in range(n_repeat):
+                if pose['type'] == 'repeat':
+                    place(i, pose['xyz'])
+                else:
+                    place(i, find_valid_pos(grid, placed, ospec['boundary'],
+                                            pose['z']))
+    return inds, np.array([p for p, _ in placed])
+
+
+def mixed_scene():
+    scene = deepcopy(load_task_config()['scene'])
+    cube = scene['objects'][0]
+
+    def spec(name, **pose):
+        s = deepcopy(cube)
+        s['name'] = name
+        s['pose'] = dict(pose, rpy=[0, 0, 0.5])
+        return s
+
+    scene['objects'] = [
+        spec('pile', type='random_repeat', z=0.7, n_repeat=[1, 4]),
+        spec('post', type='preset', xyz=[0.1, 0.1, 0.7]),
+        spec('top', type='on_top', target='post_0'),
+        spec('row', type='repeat', xyz=[-0.3, 0, 0.7], n_repeat=[2, 3]),
+        spec('free', type='random', z=0.65),
+    ]
+    scene['task_objects'] = [o['name'] for o in scene['objects']]
+    return scene
+
+
+class SampleLayoutTest(unittest.TestCase):
+
+    def check_baseline(self, scene_specs, seeds):
+        for seed in seeds:
+            np.random.seed(seed)
+            layout = sample_layout(scene_specs)
+            np.random.seed(seed)
+            inds, xyz = baseline_layout(scene_specs)
+            n = len(inds)
+            np.testing.assert_array_equal(layout['objects'][:n], inds)
+            np.testing.assert_array_equal(layout['xyz'][:n], xyz)
+
+    def test_matches_baseline(self):
+        self.check_baseline(load_task_config()['scene'], range(30))
+
+    def test_mixed_scene(self):
+        scene = mixed_scene()
+        self.check_baseline(scene, range(30))
+
+        np.random.seed(0)
+        layout = sample_layout(scene)
+        names = [scene['objects'][i]['name'] for i in layout['objects']]
+        self.assertEqual(names[0], 'post')
+        self.assertEqual(names[-2:], ['free', 'top'])
+        self.assertEqual(layout['rpy'].shape, (len(names), 3))
+        np.testing.assert_array_equal(layout['rpy'][:, 2], 0.5)
+        # on top of the preset post, by the sum of their heights
+        np.testing.assert_allclose(layout['xyz'][-1], [0.1, 0.1, 0.7 + 0.16])
+
+    def test_no_room(self):
+        scene = deepcopy(load_task_config()['scene'])
+        scene['workspace']['xlim'] = [0, 0.1]
+        scene['workspace']['ylim'] = [0, 0.1]
+        with self.assertRaises(ValueError):
+            sample_layout(scene)
+
+
+class LayoutLibraryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'layouts.npz')
+        self.scene = mixed_scene()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_round_trip(self):
+        np.random.seed(3)
+        self.assertEqual(LayoutLibrary.build(self.path, self.scene, 5), 0)
+        np.random.seed(3)
+        expected = [sample_layout(self.scene) for _ in range(5)]
+
+        layouts = LayoutLibrary(self.path)
+        self.assertEqual(len(layouts), 5)
+        self.assertEqual(layouts.digest, scene_digest(self.scene))
+        self.assertTrue(layouts.matches(deepcopy(self.scene)))
+        self.assertFalse(layouts.matches(load_task_config()['scene']))
+        for i, layout in enumerate(expected):
+            np.testing.assert_array_equal(layouts[i]['objects'],
+                                          layout['objects'])
+            for k in ('xyz', 'rpy'):
+                np.testing.assert_allclose(layouts[i][k], layout[k],
+                                           atol=1e-6)
+
+    def test_no_room(self):
+        self.scene['workspace']['xlim'] = [0, 0.1]
+        self.scene['workspace']['ylim'] = [0, 0.1]
+        with self.assertRaises(ValueError):
+            LayoutLibrary.build(self.path, self.scene, 2, max_tries=3)
+
+
+class UseLayoutsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'layouts.npz')
+        self.world = make_task_world()
+
+    def tearDown(self):
+        self.world.interface.bullet.close()
+        shutil.rmtree(self.dir)
+
+    def test_scene_from_library(self):
+        LayoutLibrary.build(self.path, self.world.scene_specs, 3)
+        layouts = LayoutLibrary(self.path)
+        self.world.use_layouts(layouts)
+        self.world.reset_world(layout_index=2)
+        pos = self.world.interface.positions(self.world.all_object_instances)
+        np.testing.assert_allclose(pos[:, :2], layouts[2]['xyz'][:, :2],
+                                   atol=1e-3)
+
+    def test_other_scene(self):
+        LayoutLibrary.build(self.path, mixed_scene(), 1)
+        layouts = LayoutLibrary(self.path)
+        with self.assertRaises(ValueError) as ctx:
+            self.world.use_layouts(layouts)
+        self.assertIn(layouts.digest, str(ctx.exception))
+        self.assertIn(scene_digest(self.world.scene_specs),
+                      str(ctx.exception))
+        self.assertIsNone(self.world.layouts)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from vat.envs.task_specs import (JsonTaskSpecs, TaskSpecStore,
+                                 compile_task_specs, open_task_specs)
+from vat.envs.tests import TASK_FILE, load_task_config
+
+
+class TaskSpecStoreTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.task_config = load_task_config()
+        cls.dir = tempfile.mkdtemp()
+        cls.path = os.path.join(cls.dir, 'stack')
+        compile_task_specs(cls.task_config, cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.dir)
+
+    def test_round_trip(self):
+        store = TaskSpecStore(self.path)
+        tasks = self.task_config['tasks']
+        self.assertEqual(len(store), 2000)
+        self.assertEqual(store.name, self.task_config['name'])
+        self.assertEqual(store.scene, self.task_config['scene'])
+        for i, task in enumerate(tasks):
+            self.assertEqual(store[i], task)
+            self.assertEqual(store.task_id(i), task['id'])
+
+    def test_decoded_tasks_are_independent(self):
+        store = TaskSpecStore(self.path)
+        store[0]['end_constraints'][0]['src'] = 'nothing'
+        self.assertEqual(store[0], self.task_config['tasks'][0])
+
+    def test_same_as_json(self):
+        readers = [TaskSpecStore(self.path), JsonTaskSpecs(TASK_FILE)]
+        for i in (0, 5, -1, -2000):
+            self.assertEqual(readers[0][i], readers[1][i])
+            self.assertEqual(readers[0].task_id(i), readers[1].task_id(i))
+        for reader in readers:
+            for i in (2000, -2001):
+                with self.assertRaises(IndexError):
+                    reader[i]
+                with self.assertRaises(IndexError):
+                    reader.task_id(i)
+
+    def test_open(self):
+        self.assertIsInstance(open_task_specs(self.path), TaskSpecStore)
+        self.assertIsInstance(open_task_specs(TASK_FILE), JsonTaskSpecs)
+
+
+class CompileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def compile(self, tasks):
+        config = {'name': 'stacking', 'scene': {'objects': []},
+                  'tasks': tasks}
+        compile_task_specs(config, self.dir)
+        return TaskSpecStore(self.dir)
+
+    def test_empty(self):
+        store = self.compile([])
+        self.assertEqual(len(store), 0)
+        with self.assertRaises(IndexError):
+            store[0]
+        with self.assertRaises(IndexError):
+            store[-1]
+
+    def test_optional_keys(self):
+        tasks = [{'id': 'a', 'goals': [{'src': 'x', 'nested': [1, {'y': 2}]}],
+                  'weight': 0.5},
+                 {'id': 'b', 'end_constraints': [], 'extra': None},
+                 {'id': 'c', 'goals': [{'src': 'x', 'nested': [1, {'y': 2}]},
+                                       {'other': True}]}]
+        store = self.compile(tasks)
+        self.assertEqual([store[i] for i in range(3)], tasks)
+        with open(os.path.join(self.dir, 'meta.json')) as f:
+            meta = json.load(f)
+        # the shared goal is stored once
+        self.assertEqual(meta['values'].count([1, {'y': 2}]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
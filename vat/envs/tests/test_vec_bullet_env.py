@@ -0,0 +1,113 @@
+import unittest
+
+import numpy as np
+
+from vat.envs.tests import DATA_DIR, SCENE, load_task_config
+from vat.envs.vec_bullet_env import (OBS_KEYS, VecBulletEnv, _handle,
+                                     observation_specs)
+
+
+class FakeEnv(object):
+    """An env whose episodes end after every step."""
+
+    def __init__(self, specs):
+        self.specs = specs
+        self.n_reset = 0
+
+    def _state(self, value):
+        return dict((k, np.full(shape, value).tolist())
+                    for k, (shape, _) in self.specs.items())
+
+    def step(self, action):
+        return self._state(1), 1.0, True, {'n_step': 1}
+
+    def reset(self):
+        self.n_reset += 1
+
+    def start_task(self):
+        pass
+
+    @property
+    def state(self):
+        return self._state(0)
+
+
+class HandleTest(unittest.TestCase):
+
+    def test_terminal_state(self):
+        specs = observation_specs(load_task_config()['scene'])
+        env = FakeEnv(specs)
+        written = []
+        reward, done, info = _handle(env, 'step', None, written.append,
+                                     specs)
+        self.assertTrue(done)
+        self.assertEqual(env.n_reset, 1)
+        terminal = info['terminal_state']
+        self.assertEqual(sorted(terminal.keys()), sorted(OBS_KEYS))
+        for k in OBS_KEYS:
+            shape, dtype = specs[k]
+            self.assertEqual(terminal[k].shape, shape)
+            self.assertEqual(terminal[k].dtype, dtype)
+            self.assertTrue(np.all(terminal[k] == 1))
+        # the returned observation is the first one of the next episode
+        self.assertTrue(np.all(np.array(written[0]['images']) == 0))
+
+    def test_unknown_command(self):
+        with self.assertRaises(NotImplementedError):
+            _handle(None, 'fly', None, None, {})
+
+
+class VecBulletEnvTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.task_config = load_task_config()
+        cls.config = {'task_name': cls.task_config['name'],
+                      'random_task': False, 'api': 'full',
+                      'full_demo': False}
+
+    def make_env(self, scene=SCENE):
+        return VecBulletEnv(2, scene, 0.001, DATA_DIR, self.config,
+                            self.task_config['scene'])
+
+    def test_reset_and_step(self):
+        env = self.make_env()
+        try:
+            env.change_task(self.task_config['tasks'][:2])
+            obs = env.reset()
+            specs = observation_specs(self.task_config['scene'])
+            for k in OBS_KEYS:
+                shape, dtype = specs[k]
+                self.assertEqual(obs[k].shape, (2,) + shape)
+                self.assertEqual(obs[k].dtype, dtype)
+            move = env.program_to_ind['move']
+            obs, rewards, dones, infos = env.step([(move, 1), (move, 2)])
+            self.assertEqual(rewards.shape, (2,))
+            self.assertEqual(len(infos), 2)
+        finally:
+            env.close()
+
+    def test_worker_error_is_raised(self):
+        env = self.make_env()
+        try:
+            env.change_task(self.task_config['tasks'][:2])
+            env.reset()
+            with self.assertRaises(RuntimeError) as ctx:
+                env.step([(10 ** 6, 0), (10 ** 6, 0)])
+            self.assertIn('IndexError', str(ctx.exception))
+            # the workers keep serving after an error
+            self.assertEqual(len(env.get_attr('program_names')), 2)
+        finally:
+            env.close()
+
+    def test_worker_start_error_is_raised(self):
+        env = self.make_env(scene='missing.xml')
+        try:
+            with self.assertRaises(RuntimeError):
+                env.reset()
+        finally:
+            env.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,250 @@
+"""
+Batched BulletEnv workers in subprocesses
+"""
+
+import ctypes
+import multiprocessing as mp
+import traceback
+
+import numpy as np
+
+from bullet_env import BulletEnv
+
+
+OBS_KEYS = ['object_state', 'agent_state', 'images']
+
+# Images are rendered at a fixed 64x64 in BulletWorld.capture_image
+IMAGE_SHAPE = (64, 64, 3)
+
+
+def observation_specs(scene_specs):
+    """
+    shape and dtype of each observation of a single env
+    """
+    return {'object_state': ((len(scene_specs['task_objects']), 3),
+                             np.float32),
+            'agent_state': ((2,), np.float32),
+            'images': (IMAGE_SHAPE, np.uint8)}
+
+
+_CTYPES = {np.float32: ctypes.c_float, np.uint8: ctypes.c_uint8}
+
+
+def _as_arrays(buffers, specs, num_envs):
+    """
+    numpy views of the shared observation buffers
+    """
+    arrays = {}
+    for k in OBS_KEYS:
+        shape, dtype = specs[k]
+        arrays[k] = np.frombuffer(buffers[k], dtype=dtype).reshape(
+            (num_envs,) + shape)
+    return arrays
+
+
+def _handle(env, cmd, data, write, specs):
+    if cmd == 'step':
+        state, reward, done, info = env.step(data)
+        if done:
+            info = dict(info)
+            # the same arrays as the batched observations
+            info['terminal_state'] = dict(
+                (k, np.array(state[k], dtype=specs[k][1])) for k in OBS_KEYS)
+            env.reset()
+            env.start_task()
+            state = env.state
+        write(state)
+        return reward, done, info
+    elif cmd == 'reset':
+        env.reset()
+        env.start_task()
+        write(env.state)
+    elif cmd == 'change_task':
+        env.change_task(data)
+    elif cmd == 'getattr':
+        return getattr(env, data)
+    else:
+        raise NotImplementedError('unknown command %s' % cmd)
+
+
+def _worker(rank, pipe, parent_pipe, env_kwargs, config, scene_specs,
+            seed, buffers, num_envs):
+    parent_pipe.close()
+    # api.py seeds numpy at import time, which forked workers all inherit
+    np.random.seed(seed + rank)
+
+    specs = observation_specs(scene_specs)
+    obs = _as_arrays(buffers, specs, num_envs)
+
+    def write(state):
+        for k in OBS_KEYS:
+            obs[k][rank] = state[k]
+
+    # Errors are sent back to the parent, which raises them, and a worker
+    # that failed to start answers every command with its error
+    env = None
+    error = None
+    try:
+        env = BulletEnv(display=False, **env_kwargs)
+        env.configure(config, scene_specs)
+    except Exception:
+        error = traceback.format_exc()
+    try:
+        while True:
+            cmd, data = pipe.recv()
+            if cmd == 'close':
+                break
+            if error is not None:
+                pipe.send(('error', error))
+                continue
+            try:
+                result = _handle(env, cmd, data, write, specs)
+            except Exception:
+                pipe.send(('error', traceback.format_exc()))
+            else:
+                pipe.send(('ok', result))
+    finally:
+        if env is not None:
+            env.close()
+        pipe.close()
+
+
+class VecBulletEnv(object):
+    """
+    N BulletEnv workers stepped as a batch
+
+    Each worker runs a headless BulletEnv in its own process. Observations
+    are written by the workers into shared memory and returned as batched
+    arrays, so only rewards, done flags and infos are pickled. Images are
+    returned as uint8. A worker whose episode is done is reset and restarted
+    right away; the last observation of the episode is in
+    info['terminal_state'] and the returned observation is the first one of
+    the next episode. An error in a worker is raised as a RuntimeError
+    holding its traceback.
+    """
+
+    def __init__(self, num_envs, scene_file, time_step, data_dir, config,
+                 scene_specs, seed=0, verbose=False):
+        self.num_envs = num_envs
+        self._specs = observation_specs(scene_specs)
+
+        self._buffers = {}
+        for k in OBS_KEYS:
+            shape, dtype = self._specs[k]
+            size = num_envs * int(np.prod(shape))
+            self._buffers[k] = mp.RawArray(_CTYPES[dtype], size)
+        self._obs = _as_arrays(self._buffers, self._specs, num_envs)
+
+        env_kwargs = {'scene_file': scene_file,
+                      'time_step': time_step,
+                      'data_dir': data_dir,
+                      'verbose': verbose}
+
+        self._pipes = []
+        self._procs = []
+        for rank in range(num_envs):
+            pipe, worker_pipe = mp.Pipe()
+            proc = mp.Process(target=_worker,
+                              args=(rank, worker_pipe, pipe, env_kwargs,
+                                    config, scene_specs, seed,
+                                    self._buffers, num_envs))
+            proc.daemon = True
+            proc.start()
+            worker_pipe.close()
+            self._pipes.append(pipe)
+            self._procs.append(proc)
+        self.closed = False
+
+    @property
+    def dimensions(self):
+        return dict((k, list(self._specs[k][0])) for k in OBS_KEYS)
+
+    @property
+    def state(self):
+        """
+        copy of the batched observations
+        """
+        return dict((k, self._obs[k].copy()) for k in OBS_KEYS)
+
+    def _recv(self):
+        """
+        the replies of all workers
+        raises:
+            RuntimeError: with the traceback of the first failed worker
+        """
+        results = []
+        errors = []
+        for rank, pipe in enumerate(self._pipes):
+            try:
+                status, result = pipe.recv()
+            except EOFError:
+                status, result = 'error', 'worker exited\n'
+            if status == 'error':
+                errors.append('worker %d failed:\n%s' % (rank, result))
+            results.append(result)
+        if errors:
+            raise RuntimeError(errors[0])
+        return results
+
+    def _broadcast(self, cmd, data=None):
+        for pipe in self._pipes:
+            pipe.send((cmd, data))
+        return self._recv()
+
+    def change_task(self, tasks):
+        """
+        set one task per env
+        """
+        assert(len(tasks) == self.num_envs)
+        for pipe, task in zip(self._pipes, tasks):
+            pipe.send(('change_task', task))
+        self._recv()
+
+    def reset(self):
+        self._broadcast('reset')
+        return self.state
+
+    def step_async(self, actions):
+        assert(len(actions) == self.num_envs)
+        for pipe, action in zip(self._pipes, actions):
+            pipe.send(('step', action))
+
+    def step_wait(self):
+        rewards, dones, infos = zip(*self._recv())
+        return (self.state, np.array(rewards, dtype=np.float32),
+                np.array(dones, dtype=np.bool_), list(infos))
+
+    def step(self, actions):
+        """
+        step every env with its (program_ind, args) action
+        """
+        self.step_async(actions)
+        return self.step_wait()
+
+    def get_attr(self, name):
+        return self._broadcast('getattr', name)
+
+    @property
+    def program_to_ind(self):
+        return self.get_attr('program_to_ind')[0]
+
+    @property
+    def ACT(self):
+        return self.get_attr('ACT')[0]
+
+    @property
+    def ADAPTIVE(self):
+        return self.get_attr('ADAPTIVE')[0]
+
+    def close(self):
+        if self.closed:
+            return
+        for pipe in self._pipes:
+            try:
+                pipe.send(('close', None))
+            except IOError:
+                # the worker is gone already
+                pass
+        for proc in self._procs:
+            proc.join()
+        self.closed = True
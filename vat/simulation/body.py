@@ -34,25 +34,91 @@ class Link(Entity):
         return self._uid
 
 
+class JointTable(object):
+    """Static joint metadata of a body, stored as arrays indexed by joint."""
+    def __init__(self, table):
+        self._names = list(table['name'])
+        self._types = table['type']
+        self._damping = table['damping']
+        self._friction = table['friction']
+        self._lower = table['lower']
+        self._upper = table['upper']
+        self._effort = table['effort']
+        self._velocity = table['velocity']
+        self._index = dict((name, i) for i, name in enumerate(self._names))
+
+    def __len__(self):
+        return len(self._names)
+
+    def index(self, name):
+        return self._index[name]
+
+    def limit(self, i):
+        return {
+                'lower': self._lower[i],
+                'upper': self._upper[i],
+                'effort': self._effort[i],
+                'velocity': self._velocity[i]
+                }
+
+    def dynamics(self, i):
+        return {
+                'damping': self._damping[i],
+                'friction': self._friction[i]
+                }
+
+    @property
+    def names(self):
+        return self._names
+
+    @property
+    def types(self):
+        return self._types
+
+    @property
+    def damping(self):
+        return self._damping
+
+    @property
+    def friction(self):
+        return self._friction
+
+    @property
+    def lower(self):
+        return self._lower
+
+    @property
+    def upper(self):
+        return self._upper
+
+    @property
+    def effort(self):
+        return self._effort
+
+    @property
+    def velocity(self):
+        return self._velocity
+
+
 class Joint(Entity):
     """Joint."""
-    def __init__(self, pe, uid, limit, name=None):
+    def __init__(self, pe, uid, table, name=None):
         # Physics engine API wrapper
         self._pe = pe
         # Joint unique ID
         self._uid = uid
         # Joint name
         self._name = name
-        # Joint limit
-        self._limit = limit
+        # Static joint metadata of the body
+        self._table = table
         # Set joint initial pose
 
     def control_pos(self, pos, max_vel=None, max_force=None):
         """ """
         if max_vel is None:
-            max_vel = self.limit['velocity']
+            max_vel = self._table.velocity[self.uid[1]]
         if max_force is None:
-            max_force = self.limit['effort']
+            max_force = self._table.effort[self.uid[1]]
         self.pe.control_joint_pos(
                 self.uid[0],
                 self.uid[1],
@@ -63,7 +129,7 @@ class Joint(Entity):
     def control_vel(self, vel, max_force=None):
         """ """
         if max_force is None:
-            max_force = self.limit['effort']
+            max_force = self._table.effort[self.uid[1]]
         self.pe.control_joint_vel(
                 self.uid[0],
                 self.uid[1],
@@ -83,37 +149,53 @@ class Joint(Entity):
 
     @property
     def limit(self):
-        return self._limit
+        return self._table.limit(self.uid[1])
+
+    @property
+    def dynamics(self):
+        return self._table.dynamics(self.uid[1])
+
+    @property
+    def lower(self):
+        return self._table.lower[self.uid[1]]
+
+    @property
+    def upper(self):
+        return self._table.upper[self.uid[1]]
 
 
 class Body(Entity):
     """Body."""
 
-    def __init__(self, pe, uid, name=None, boundary=None, scale=None):
+    def __init__(self, pe, uid, name=None, boundary=None, scale=None,
+            filename=None, fixed=False):
         # Physics engine API wrapper
         self._pe = pe
         # Body unique ID
         self._uid = uid
         # Name
         self._name = name
+        # Static joint metadata, links and joints share the same UIDs
+        self._joint_table = JointTable(self.pe.get_joint_table(uid))
         # Body links
         self._links = {}
-        for link_uid in self.pe.get_link_uids(uid):
-            link_name = self.pe.get_link_name(uid, link_uid)
+        for link_uid, link_name in enumerate(self._joint_table.names):
             link = Link(self.pe, (uid, link_uid), link_name)
             self._links[link_name] = link
         # Body joints
         self._joints = {}
-        for joint_uid in self.pe.get_joint_uids(uid):
-            joint_name = self.pe.get_link_name(uid, joint_uid)
-            limit = self.pe.get_joint_limit(uid, joint_uid)
+        for joint_uid, joint_name in enumerate(self._joint_table.names):
             # if initial is not None:
             #     self.pe.reset_joint(uid, joint_uid, initial[joint_uid])
-            joint = Joint(self.pe, (uid, joint_uid), limit, joint_name)
+            joint = Joint(self.pe, (uid, joint_uid), self._joint_table,
+                    joint_name)
             self._joints[joint_name] = joint
 
         self._boundary = boundary
         self._scale = scale
+        # Model file and base type, used to match bodies for reuse
+        self._filename = filename
+        self._fixed = fixed
 
     @ classmethod
     def create_from_descr(cls, pe, descr, data_dir='./data', frame=None):
@@ -134,7 +216,25 @@ class Body(Entity):
         path = osp.join(data_dir, filename)
         uid = pe.load(path, xyz, rpy, fixed)
         name = descr['name']
-        return cls(pe, uid, name, boundary, scale)
+        return cls(pe, uid, name, boundary, scale, filename, fixed)
+
+    def reuse_from_descr(self, descr, frame=None):
+        """Reset this body to a description of the same model."""
+        boundary, scale = None, None
+        if 'boundary' in descr:
+            boundary = np.array(descr['boundary'])
+        if 'scale' in descr:
+            scale = np.array(descr['scale'])
+
+        xyz = descr['pose']['xyz']
+        rpy = descr['pose']['rpy']
+        if frame is not None:
+            xyz = self.pe.pos_in_frame(xyz, frame)
+            rpy = self.pe.euler_in_frame(rpy, frame)
+        self.pe.reset_body(self.uid, xyz, self.pe.quat_from_euler(rpy))
+        self._name = descr['name']
+        self._boundary = boundary
+        self._scale = scale
 
     @property
     def boundary(self):
@@ -144,6 +244,14 @@ class Body(Entity):
     def scale(self):
         return self._scale
 
+    @property
+    def filename(self):
+        return self._filename
+
+    @property
+    def fixed(self):
+        return self._fixed
+
     @property
     def uid(self):
         return self._uid
@@ -156,6 +264,10 @@ class Body(Entity):
     def joints(self):
         return self._joints
 
+    @property
+    def joint_table(self):
+        return self._joint_table
+
     @property
     def pos(self):
         return self.pe.get_body_pos(self.uid)
@@ -180,5 +292,35 @@ class Body(Entity):
     def euler(self, value):
         self.pe.set_body_euler(self.uid, value)
 
+    def control_joints_pos(self, joints, pos, max_vel=None, max_force=None):
+        """Position control of the named joints in one call.
+
+        Args:
+            joints: A list of joint names.
+            pos: The target positions, one per joint.
+            max_vel: The target velocities, default to the joint limits.
+            max_force: The maximum forces, default to the joint limits.
+        """
+        ids = [self._joint_table.index(name) for name in joints]
+        if max_vel is None:
+            max_vel = self._joint_table.velocity[ids]
+        if max_force is None:
+            max_force = self._joint_table.effort[ids]
+        self.pe.control_joints_pos(self.uid, ids, pos,
+                max_vel=max_vel, max_force=max_force)
+
+    def control_joints_vel(self, joints, vel, max_force=None):
+        """Velocity control of the named joints in one call.
+
+        Args:
+            joints: A list of joint names.
+            vel: The target velocities, one per joint.
+            max_force: The maximum forces, default to the joint limits.
+        """
+        ids = [self._joint_table.index(name) for name in joints]
+        if max_force is None:
+            max_force = self._joint_table.effort[ids]
+        self.pe.control_joints_vel(self.uid, ids, vel, max_force=max_force)
+
     def apply_force(self, vec):
         self.pe.apply_force(self.uid, -1, vec, self.pos)
@@ -4,58 +4,95 @@ import numpy as np
 import pybullet as p
 
 from ..physics_engine import PhysicsEngine
+from .. import transforms
+
+
+# setJointMotorControlArray is missing from older pybullet releases
+HAS_JOINT_ARRAY_CONTROL = hasattr(p, 'setJointMotorControlArray')
 
 
 class BulletPhysicsEngine(PhysicsEngine):
     """Physics engine API wrapper for Bullet."""
 
-    def __init__(self):
+    def __init__(self, client=0):
+        # Physics client this engine talks to
+        self._client = client
         self._gravity = None
+        # Simulation tick and the base poses read during that tick
+        self._tick = 0
+        self._pose_cache = {}
+        self._pose_cache_tick = 0
+        self._use_cache = True
+
+    @property
+    def client(self):
+        return self._client
+
+    @property
+    def tick(self):
+        return self._tick
+
+    @property
+    def use_cache(self):
+        return self._use_cache
+
+    @use_cache.setter
+    def use_cache(self, value):
+        self._use_cache = value
+        self._pose_cache = {}
+
+    def bump_tick(self):
+        """Advance the tick counter and invalidate the cached poses."""
+        self._tick += 1
+
+    def _get_base_pose(self, body):
+        """Get the (pos, quat) tuples of a body, cached within a tick."""
+        if not self._use_cache:
+            return p.getBasePositionAndOrientation(body,
+                    physicsClientId=self._client)
+        if self._pose_cache_tick != self._tick:
+            self._pose_cache = {}
+            self._pose_cache_tick = self._tick
+        pose = self._pose_cache.get(body)
+        if pose is None:
+            pose = p.getBasePositionAndOrientation(body,
+                    physicsClientId=self._client)
+            self._pose_cache[body] = pose
+        return pose
 
     @staticmethod
     def euler_from_quat(quat):
-        quat = list(quat)
-        euler = p.getEulerFromQuaternion(quat)
+        euler = transforms.euler_from_quat(quat)
         return np.array(euler, dtype=np.float32)
 
     @staticmethod
     def euler_from_mat33(mat33):
-        mat33 = list(mat33.flatten())
-        raise NotImplementedError
+        euler = transforms.euler_from_mat33(mat33)
+        return np.array(euler, dtype=np.float32)
 
     @staticmethod
     def quat_from_euler(euler):
-        euler = list(euler)
-        quat = p.getQuaternionFromEuler(euler)
+        quat = transforms.quat_from_euler(euler)
         return np.array(quat, dtype=np.float32)
 
     @staticmethod
     def quat_from_mat33(mat33):
-        mat33 = list(mat33.flatten())
-        raise NotImplementedError
+        quat = transforms.quat_from_mat33(mat33)
+        return np.array(quat, dtype=np.float32)
 
     @staticmethod
     def mat33_from_quat(quat):
-        quat = list(quat)
-        mat33 = p.getMatrixFromQuaternion(quat)
-        return np.reshape(mat33, [3, 3])
+        return transforms.mat33_from_quat(quat)
 
     @staticmethod
     def mat33_from_euler(euler):
-        euler = list(euler)
-        quat = p.getQuaternionFromEuler(euler)
-        mat33 = p.getMatrixFromQuaternion(quat)
-        return np.reshape(mat33, [3, 3])
+        return transforms.mat33_from_euler(euler)
 
     @staticmethod
     def pos_in_frame(pos, frame):
         frame_xyz = frame[0]
         frame_rpy = frame[1]
-        quat = p.getQuaternionFromEuler(frame_rpy)
-        mat33 = p.getMatrixFromQuaternion(quat)
-        mat33 = np.reshape(mat33, [3, 3])
-        pos_in_frame = frame_xyz + np.dot(pos, mat33.T)
-        return pos_in_frame
+        return transforms.pos_in_frame(pos, frame_xyz, frame_rpy)
 
     @staticmethod
     def euler_in_frame(euler, frame):
@@ -63,93 +100,155 @@ class BulletPhysicsEngine(PhysicsEngine):
         euler_in_frame = np.array(euler) + frame_rpy
         return euler_in_frame
 
-    @staticmethod
-    def get_body_pos(body):
-        pos, _ = p.getBasePositionAndOrientation(body)
+    def get_body_pos(self, body):
+        pos, _ = self._get_base_pose(body)
         return np.array(pos, dtype=np.float32)
 
-    @staticmethod
-    def get_body_quat(body):
-        _, quat = p.getBasePositionAndOrientation(body)
+    def get_body_quat(self, body):
+        _, quat = self._get_base_pose(body)
         return np.array(quat, dtype=np.float32)
 
-    @staticmethod
-    def get_body_euler(body):
-        _, quat = p.getBasePositionAndOrientation(body)
-        euler = p.getEulerFromQuaternion(quat)
+    def get_body_euler(self, body):
+        _, quat = self._get_base_pose(body)
+        euler = transforms.euler_from_quat(quat)
         return np.array(euler, dtype=np.float32)
 
-    @staticmethod
-    def get_body_mat33(body):
-        _, quat = p.getBasePositionAndOrientation(body)
-        mat33 = p.getMatrixFromQuaternion(quat)
-        return np.reshape(mat33, [3, 3])
-
-    @staticmethod
-    def get_body_linvel(body):
-        linvel, _ = p.getBaseVelocity(body)
+    def get_body_mat33(self, body):
+        _, quat = self._get_base_pose(body)
+        return transforms.mat33_from_quat(quat)
+
+    def get_body_poses(self, bodies, out=None):
+        """Get the base poses of a list of bodies in one call.
+
+        Args:
+            bodies: A list of body uids.
+            out: An optional (N, 7) float32 buffer to be filled in place.
+
+        Returns:
+            poses: (N, 7) array, each row is [x, y, z, qx, qy, qz, qw].
+        """
+        if out is None:
+            out = np.empty((len(bodies), 7), dtype=np.float32)
+        for i, body in enumerate(bodies):
+            pos, quat = self._get_base_pose(body)
+            out[i, :3] = pos
+            out[i, 3:] = quat
+        return out
+
+    def get_body_velocities(self, bodies, out=None):
+        """Get the base velocities of a list of bodies in one call.
+
+        Args:
+            bodies: A list of body uids.
+            out: An optional (N, 6) float32 buffer to be filled in place.
+
+        Returns:
+            velocities: (N, 6) array, each row is [linvel, angvel].
+        """
+        if out is None:
+            out = np.empty((len(bodies), 6), dtype=np.float32)
+        for i, body in enumerate(bodies):
+            linvel, angvel = p.getBaseVelocity(body,
+                    physicsClientId=self._client)
+            out[i, :3] = linvel
+            out[i, 3:] = angvel
+        return out
+
+    def get_body_linvel(self, body):
+        linvel, _ = p.getBaseVelocity(body, physicsClientId=self._client)
         return linvel
 
-    @staticmethod
-    def get_body_angvel(body):
-        _, angvel = p.getBaseVelocity(body)
+    def get_body_angvel(self, body):
+        _, angvel = p.getBaseVelocity(body, physicsClientId=self._client)
         return angvel
 
-    @staticmethod
-    def get_link_uids(body):
+    def get_body_state(self, body):
+        """Get the full dynamic state of a body.
+
+        Returns:
+            state: A dict of the base pose and velocity and of the joint
+                positions and velocities.
+        """
+        pos, quat = p.getBasePositionAndOrientation(body,
+                physicsClientId=self._client)
+        linvel, angvel = p.getBaseVelocity(body, physicsClientId=self._client)
+        num_joints = p.getNumJoints(body, physicsClientId=self._client)
+        if num_joints > 0:
+            joint_states = p.getJointStates(body, range(num_joints),
+                    physicsClientId=self._client)
+        else:
+            joint_states = []
+        state = {
+                'pos': pos,
+                'quat': quat,
+                'linvel': linvel,
+                'angvel': angvel,
+                'joint_pos': [s[0] for s in joint_states],
+                'joint_vel': [s[1] for s in joint_states]
+                }
+        return state
+
+    def set_body_state(self, body, state):
+        """Reset a body to a state from get_body_state."""
+        p.resetBasePositionAndOrientation(body, state['pos'], state['quat'],
+                physicsClientId=self._client)
+        p.resetBaseVelocity(body, state['linvel'], state['angvel'],
+                physicsClientId=self._client)
+        for joint, pos in enumerate(state['joint_pos']):
+            p.resetJointState(body, joint, pos,
+                    targetVelocity=state['joint_vel'][joint],
+                    physicsClientId=self._client)
+        self.bump_tick()
+
+    def get_link_uids(self, body):
         # Links and Joints have the corresponding UIDs
-        link_uids = range(p.getNumJoints(body))
+        link_uids = range(p.getNumJoints(body, physicsClientId=self._client))
         return link_uids
 
-    @staticmethod
-    def get_link_name(body, link):
+    def get_link_name(self, body, link):
         # Links and Joints have the corresponding UIDs
         _, joint_name, joint_type, _, _, _, damping, friction, \
                 lower, upper, max_force, max_vel, _ = \
-                p.getJointInfo(body, link)
+                p.getJointInfo(body, link, physicsClientId=self._client)
         return joint_name # TODO
 
-    @staticmethod
-    def get_link_pos(body, link):
-        pos, _, _, _, _, _, _, _  = p.getLinkState(body, link)
+    def get_link_pos(self, body, link):
+        pos, _, _, _, _, _, _, _  = p.getLinkState(body, link,
+                physicsClientId=self._client)
         return np.array(pos, dtype=np.float32)
 
-    @staticmethod
-    def get_link_quat(body, link):
-        _, quat, _, _, _, _, _, _  = p.getLinkState(body, link)
+    def get_link_quat(self, body, link):
+        _, quat, _, _, _, _, _, _  = p.getLinkState(body, link,
+                physicsClientId=self._client)
         return np.array(quat, dtype=np.float32)
 
-    @staticmethod
-    def get_joint_uids(body):
-        joint_uids = range(p.getNumJoints(body))
+    def get_joint_uids(self, body):
+        joint_uids = range(p.getNumJoints(body, physicsClientId=self._client))
         return joint_uids
 
-    @staticmethod
-    def get_joint_name(body, joint):
+    def get_joint_name(self, body, joint):
         # Links and Joints have the corresponding UIDs
         _, joint_name, joint_type, _, _, _, damping, friction, \
                 lower, upper, max_force, max_vel, _ = \
-                p.getJointInfo(body, joint)
+                p.getJointInfo(body, joint, physicsClientId=self._client)
         return joint_name
 
-    @staticmethod
-    def get_joint_dynamics(body, joint):
+    def get_joint_dynamics(self, body, joint):
         # Links and Joints have the corresponding UIDs
         _, joint_name, joint_type, _, _, _, damping, friction, \
                 lower, upper, max_force, max_vel, _ = \
-                p.getJointInfo(body, joint)
+                p.getJointInfo(body, joint, physicsClientId=self._client)
         dynamics = {
                 'damping': damping,
                 'friction': friction
                 }
         return dynamics
 
-    @staticmethod
-    def get_joint_limit(body, joint):
+    def get_joint_limit(self, body, joint):
         # Links and Joints have the corresponding UIDs
         _, joint_name, joint_type, _, _, _, damping, friction, \
                 lower, upper, max_force, max_vel, _ = \
-                p.getJointInfo(body, joint)
+                p.getJointInfo(body, joint, physicsClientId=self._client)
         limit = {
                 'lower': lower,
                 'upper': upper,
@@ -158,63 +257,105 @@ class BulletPhysicsEngine(PhysicsEngine):
                 }
         return limit
 
-    @staticmethod
-    def get_joint_pos(body, joint):
-        pos, _, react_force, torque = p.getJointState(body, joint)
+    def get_joint_table(self, body):
+        """Get the static metadata of all joints of a body.
+
+        Returns:
+            table: A dict of per-joint values indexed by the joint uid, with
+                the keys 'name', 'type', 'damping', 'friction', 'lower',
+                'upper', 'effort' and 'velocity'.
+        """
+        num_joints = p.getNumJoints(body, physicsClientId=self._client)
+        table = {
+                'name': [],
+                'type': np.zeros((num_joints,), dtype=np.int32),
+                'damping': np.zeros((num_joints,), dtype=np.float64),
+                'friction': np.zeros((num_joints,), dtype=np.float64),
+                'lower': np.zeros((num_joints,), dtype=np.float64),
+                'upper': np.zeros((num_joints,), dtype=np.float64),
+                'effort': np.zeros((num_joints,), dtype=np.float64),
+                'velocity': np.zeros((num_joints,), dtype=np.float64)
+                }
+        for joint in range(num_joints):
+            _, joint_name, joint_type, _, _, _, damping, friction, \
+                    lower, upper, max_force, max_vel, _ = \
+                    p.getJointInfo(body, joint, physicsClientId=self._client)
+            table['name'].append(joint_name)
+            table['type'][joint] = joint_type
+            table['damping'][joint] = damping
+            table['friction'][joint] = friction
+            table['lower'][joint] = lower
+            table['upper'][joint] = upper
+            table['effort'][joint] = max_force
+            table['velocity'][joint] = max_vel
+        return table
+
+    def get_joint_pos(self, body, joint):
+        pos, _, react_force, torque = p.getJointState(body, joint,
+                physicsClientId=self._client)
         return np.array(pos, dtype=np.float32)
 
-    @staticmethod
-    def get_joint_vel(body, joint):
-        _, vel, react_force, torque = p.getJointState(body, joint)
+    def get_joint_vel(self, body, joint):
+        _, vel, react_force, torque = p.getJointState(body, joint,
+                physicsClientId=self._client)
         return np.array(vel, dtype=np.float32)
 
-    @staticmethod
-    def get_joint_force(body, joint):
+    def get_joint_force(self, body, joint):
         # TODO: Definition of react_force?
-        _, _, react_force, _ = p.getJointState(body, joint)
+        _, _, react_force, _ = p.getJointState(body, joint,
+                physicsClientId=self._client)
         return np.array(react_force, dtype=np.float32)
 
-    @staticmethod
-    def get_joint_torque(body, joint):
-        _, _, _, torque = p.getJointState(body, joint)
+    def get_joint_torque(self, body, joint):
+        _, _, _, torque = p.getJointState(body, joint,
+                physicsClientId=self._client)
         return np.array(torque, dtype=np.float32)
 
-    @staticmethod
-    def set_body_pos(body, pos):
-        _, quat = p.getBasePositionAndOrientation(body)
-        p.resetBasePositionAndOrientation(body, list(pos), quat)
-
-    @staticmethod
-    def set_body_quat(body, quat):
-        pos, _ = p.getBasePositionAndOrientation(body)
-        p.resetBasePositionAndOrientation(body, pos, list(quat))
-
-    @staticmethod
-    def set_body_linvel(body, linvel):
-        p.resetBaseVelocity(body, linearVelocity=list(linvel))
-
-    @staticmethod
-    def set_body_angvel(body):
-        p.resetBaseVelocity(body, angularVelocity=list(angvel))
-
-    @staticmethod
-    def set_joint_pos(body, joint, pos, vel=None):
-        p.resetJointState(body, joint, list(pos))
-
-    @staticmethod
-    def set_joint_vel(body, joint, vel):
-        _, vel, _, _ = p.getJointState(body, joint)
-        p.resetJointState(body, joint, pos, list(vel))
-
-    @staticmethod
-    def control_joint_pos(body, joint, pos, max_vel=None, max_force=None):
+    def set_body_pos(self, body, pos):
+        _, quat = p.getBasePositionAndOrientation(body,
+                physicsClientId=self._client)
+        p.resetBasePositionAndOrientation(body, list(pos), quat,
+                physicsClientId=self._client)
+        self.bump_tick()
+
+    def set_body_quat(self, body, quat):
+        pos, _ = p.getBasePositionAndOrientation(body,
+                physicsClientId=self._client)
+        p.resetBasePositionAndOrientation(body, pos, list(quat),
+                physicsClientId=self._client)
+        self.bump_tick()
+
+    def set_body_linvel(self, body, linvel):
+        p.resetBaseVelocity(body, linearVelocity=list(linvel),
+                physicsClientId=self._client)
+        self.bump_tick()
+
+    def set_body_angvel(self, body, angvel):
+        p.resetBaseVelocity(body, angularVelocity=list(angvel),
+                physicsClientId=self._client)
+        self.bump_tick()
+
+    def set_joint_pos(self, body, joint, pos, vel=None):
+        p.resetJointState(body, joint, list(pos), physicsClientId=self._client)
+        self.bump_tick()
+
+    def set_joint_vel(self, body, joint, vel):
+        _, vel, _, _ = p.getJointState(body, joint,
+                physicsClientId=self._client)
+        p.resetJointState(body, joint, pos, list(vel),
+                physicsClientId=self._client)
+        self.bump_tick()
+
+    def control_joint_pos(self, body, joint, pos, max_vel=None,
+                          max_force=None):
         if max_vel is None:
             p.setJointMotorControl2(
                     bodyIndex=body,
                     jointIndex=joint,
                     controlMode=p.POSITION_CONTROL,
                     targetPosition=pos,
-                    force=max_force)
+                    force=max_force,
+                    physicsClientId=self._client)
         else:
             p.setJointMotorControl2(
                     bodyIndex=body,
@@ -222,27 +363,86 @@ class BulletPhysicsEngine(PhysicsEngine):
                     controlMode=p.POSITION_CONTROL,
                     targetPosition=pos,
                     targetVelocity=max_vel,
-                    force=max_force)
+                    force=max_force,
+                    physicsClientId=self._client)
+
+    def control_joints_pos(self, body, joints, pos, max_vel=None,
+                           max_force=None):
+        """Position control of several joints of a body in one call.
+
+        Args:
+            body: The body uid.
+            joints: A list of joint uids.
+            pos: The target positions, one per joint.
+            max_vel: The target velocities, one per joint.
+            max_force: The maximum forces, one per joint.
+        """
+        kwargs = {}
+        if max_vel is not None:
+            kwargs['targetVelocities'] = list(max_vel)
+        if max_force is not None:
+            kwargs['forces'] = list(max_force)
+        if HAS_JOINT_ARRAY_CONTROL:
+            p.setJointMotorControlArray(
+                    bodyUniqueId=body,
+                    jointIndices=list(joints),
+                    controlMode=p.POSITION_CONTROL,
+                    targetPositions=list(pos),
+                    physicsClientId=self._client,
+                    **kwargs)
+        else:
+            # Older pybullet releases only provide per joint control
+            for i, joint in enumerate(joints):
+                self.control_joint_pos(
+                        body, joint, pos[i],
+                        max_vel=None if max_vel is None else max_vel[i],
+                        max_force=None if max_force is None else max_force[i])
+
+    def control_joints_vel(self, body, joints, vel, max_force=None):
+        """Velocity control of several joints of a body in one call.
+
+        Args:
+            body: The body uid.
+            joints: A list of joint uids.
+            vel: The target velocities, one per joint.
+            max_force: The maximum forces, one per joint.
+        """
+        kwargs = {}
+        if max_force is not None:
+            kwargs['forces'] = list(max_force)
+        if HAS_JOINT_ARRAY_CONTROL:
+            p.setJointMotorControlArray(
+                    bodyUniqueId=body,
+                    jointIndices=list(joints),
+                    controlMode=p.VELOCITY_CONTROL,
+                    targetVelocities=list(vel),
+                    physicsClientId=self._client,
+                    **kwargs)
+        else:
+            # Older pybullet releases only provide per joint control
+            for i, joint in enumerate(joints):
+                self.control_joint_vel(
+                        body, joint, vel[i],
+                        max_force=None if max_force is None else max_force[i])
 
-    @staticmethod
-    def control_joint_vel(body, joint, vel, max_force=None):
+    def control_joint_vel(self, body, joint, vel, max_force=None):
         p.setJointMotorControl2(
                 bodyIndex=body,
                 jointIndex=joint,
                 controlMode=p.VELOCITY_CONTROL,
                 targetVelocity=vel,
-                force=max_force)
+                force=max_force,
+                physicsClientId=self._client)
 
-    @staticmethod
-    def control_joint_torque(body, joint, torque):
+    def control_joint_torque(self, body, joint, torque):
         p.setJointMotorControl2(
                 bodyIndex=body,
                 jointIndex=joint,
                 controlMode=p.TORQUE_CONTROL,
-                force=torque)
+                force=torque,
+                physicsClientId=self._client)
 
-    @staticmethod
-    def create_cstr(descr):
+    def create_cstr(self, descr):
         if descr['joint_type'] == 'revolute':
             joint_type = p.JOINT_REVOLUTE
         elif descr['joint_type'] == 'prismatic':
@@ -264,7 +464,8 @@ class BulletPhysicsEngine(PhysicsEngine):
                     jointType=joint_type,
                     jointAxis=descr['joint_axis'],
                     parentFramePosition=descr['parent_frame_pos'],
-                    childFramePosition=descr['child_frame_pos'])
+                    childFramePosition=descr['child_frame_pos'],
+                    physicsClientId=self._client)
         else:
             cstr = p.createConstraint(
                     parentBodyUniqueId=descr['parent_body'],
@@ -276,37 +477,37 @@ class BulletPhysicsEngine(PhysicsEngine):
                     parentFramePosition=descr['parent_frame_pos'],
                     childFramePosition=descr['child_frame_pos'],
                     parentFrameOrientation=descr['parent_frame_quat'],
-                    childFrameOrientation=descr['child_frame_quat'])
+                    childFrameOrientation=descr['child_frame_quat'],
+                    physicsClientId=self._client)
 
         return cstr
 
-    @staticmethod
-    def get_cstr_dof(cstr):
-        _, _, _, _, _, _, _, pos, _, quat, max_force = p.getConstraintInfo(cstr)
+    def get_cstr_dof(self, cstr):
+        _, _, _, _, _, _, _, pos, _, quat, max_force = p.getConstraintInfo(
+                cstr, physicsClientId=self._client)
         pos = np.array(pos, dtype=np.float32)
-        euler = p.getEulerFromQuaternion(quat)
+        euler = transforms.euler_from_quat(quat)
         euler = np.array(euler, dtype=np.float32)
         return pos, euler
 
-    @staticmethod
-    def get_cstr_max_force(cstr):
-        _, _, _, _, _, _, _, pos, _, quat, max_force = p.getConstraintInfo(cstr)
+    def get_cstr_max_force(self, cstr):
+        _, _, _, _, _, _, _, pos, _, quat, max_force = p.getConstraintInfo(
+                cstr, physicsClientId=self._client)
         return np.array(max_force, dtype=np.float32)
 
-    @staticmethod
-    def set_cstr_dof(cstr, pos, euler, max_force):
+    def set_cstr_dof(self, cstr, pos, euler, max_force):
         pos = list(pos)
-        euler = list(euler)
-        quat = p.getQuaternionFromEuler(euler)
+        quat = list(transforms.quat_from_euler(euler))
         p.changeConstraint(
                 userConstraintUniqueId=cstr,
                 jointChildPivot=pos,
                 jointChildFrameOrientation=quat,
-                maxForce=max_force)
+                maxForce=max_force,
+                physicsClientId=self._client)
+        self.bump_tick()
 
-    @staticmethod
-    def remove_cstr(cstr):
-        p.removeConstraint(cstr)
+    def remove_cstr(self, cstr):
+        p.removeConstraint(cstr, physicsClientId=self._client)
 
     # TODO
     @staticmethod
@@ -324,8 +525,8 @@ class BulletPhysicsEngine(PhysicsEngine):
                 nearVal=0.01,
                 farVal=1000.0)
 
-    @staticmethod
-    def set_camera(focal_point, focal_dist, euler, width=500, height=540):
+    def set_camera(self, focal_point, focal_dist, euler, width=500,
+                   height=540):
         """ """
         _euler = euler / np.pi * 180
         roll = _euler[0]
@@ -337,11 +538,13 @@ class BulletPhysicsEngine(PhysicsEngine):
                 cameraDistance=focal_dist,
                 cameraYaw=pitch,
                 cameraPitch=yaw,
-                cameraTargetPosition=focal_point)
+                cameraTargetPosition=focal_point,
+                physicsClientId=self._client)
 
     def set_gravity(self, gravity):
         self._gravity = gravity
-        p.setGravity(gravity[0], gravity[1], gravity[2])
+        p.setGravity(gravity[0], gravity[1], gravity[2],
+                physicsClientId=self._client)
 
     def load(self, path, pos=[0, 0, 0], euler=[0, 0, 0], fixed=False):
         """Load an body into the simulation."""
@@ -352,12 +555,27 @@ class BulletPhysicsEngine(PhysicsEngine):
         model_name, ext = osp.splitext(path)
         if ext == '.urdf':
             quat = self.quat_from_euler(euler)
-            uid = p.loadURDF(path, pos, quat, useFixedBase=fixed)
+            uid = p.loadURDF(path, pos, quat, useFixedBase=fixed,
+                    physicsClientId=self._client)
         elif ext == '.sdf':
-            uid = p.loadSDF(path)
+            uid = p.loadSDF(path, physicsClientId=self._client)
         else:
             raise ValueError('Unrecognized extension {}.'.format(ext))
         return uid
 
+    def reset_body(self, uid, pos, quat):
+        """Teleport a body to a pose and bring it to rest."""
+        p.resetBasePositionAndOrientation(uid, list(pos), list(quat),
+                physicsClientId=self._client)
+        p.resetBaseVelocity(uid, [0, 0, 0], [0, 0, 0],
+                physicsClientId=self._client)
+        self.bump_tick()
+
+    def remove_body(self, uid):
+        """Remove a body from the simulation."""
+        p.removeBody(uid, physicsClientId=self._client)
+        self.bump_tick()
+
     def apply_force(self, uid, lid, force, pos):
-        p.applyExternalForce(uid, lid, force, pos, p.WORLD_FRAME)
+        p.applyExternalForce(uid, lid, force, pos, p.WORLD_FRAME,
+                physicsClientId=self._client)
@@ -14,11 +14,15 @@ class BulletWorld(World):
                  data_dir='./data',
                  verbose=False,
                  key=None,
-                 camera_params={}):
-
-        self._pe = BulletPhysicsEngine()
+                 camera_params={},
+                 client=None,
+                 stats=False,
+                 headless=None):
 
         self._display = display
+        # Without a GUI there is no camera to update and no keyboard to
+        # listen to, so the per tick work can be skipped entirely
+        self._headless = not display if headless is None else headless
         self._data_dir = data_dir
         self._verbose = verbose
 
@@ -26,6 +30,7 @@ class BulletWorld(World):
         self._robots = None
         self._time_step = None
         self._ctrl_listeners = []
+        self._stats = None
 
         self._key_dict = None
         self._key_act_dict = None
@@ -48,16 +53,26 @@ class BulletWorld(World):
 
         self.video_log_key = 0
 
-        # Connect to the simulation
+        # Connect to the simulation, or attach to an existing client
         # TODO(Kuan): If VR
         #     p.connect(p.SHARED_MEMORY)
-        if self._display:
-            p.connect(p.GUI)
+        self._owns_client = client is None
+        if not self._owns_client:
+            pass
+        elif self._display:
+            client = p.connect(p.GUI)
+        elif key is None:
+            client = p.connect(p.DIRECT)
         else:
-            if key is None:
-                p.connect(p.DIRECT)
-            else:
-                p.connect(p.DIRECT, key=key)
+            client = p.connect(p.DIRECT, key=key)
+        if client < 0:
+            raise RuntimeError('Cannot connect to the physics server.')
+        self._client = client
+
+        self._pe = BulletPhysicsEngine(client)
+
+        if stats:
+            self.enable_stats()
 
     def start(self, time_step=None):
         """Start the simulation."""
@@ -66,10 +81,12 @@ class BulletWorld(World):
             self._time_step = time_step
         # Choose real time or step simulation
         if self._time_step is None:
-            p.setRealTimeSimulation(1)
+            p.setRealTimeSimulation(1, physicsClientId=self._client)
         else:
-            p.setRealTimeSimulation(0)
-            p.setTimeStep(self._time_step)
+            p.setRealTimeSimulation(0, physicsClientId=self._client)
+            p.setTimeStep(self._time_step, physicsClientId=self._client)
+        # Poses change between steps in real time simulation
+        self._pe.use_cache = self._time_step is not None
 
     def log_video(self, task_name):
         """
@@ -78,17 +95,20 @@ class BulletWorld(World):
         if not os.path.exists("video_logs/"):
             os.makedirs("video_logs")
         try:
-            p.stopStateLogging(self.curr_recording)
+            p.stopStateLogging(self.curr_recording,
+                    physicsClientId=self._client)
             self.video_log_key += 1
         except Exception:
             print("No Video Currently Being Logged")
         self.curr_recording = p.startStateLogging(p.STATE_LOGGING_VIDEO_MP4,
                                                   "video_logs/task_vid_" +
-                                                  str(task_name) + "_" + str(self.video_log_key) + ".mp4")
+                                                  str(task_name) + "_" + str(self.video_log_key) + ".mp4",
+                                                  physicsClientId=self._client)
 
     def capture_image(self):
         width, height, im, depth, seg = p.getCameraImage(64, 64, list(
-            self.view_matrix), list(self.projection_matrix), renderer=p.ER_TINY_RENDERER)
+            self.view_matrix), list(self.projection_matrix),
+            renderer=p.ER_TINY_RENDERER, physicsClientId=self._client)
         self.depth = depth
         im = np.array(im).reshape([height, width, -1])
         return im[:, :, :3]
@@ -96,28 +116,55 @@ class BulletWorld(World):
     def restart(self):
         """Restart the simulation"""
         # Reset
-        p.resetSimulation()
+        p.resetSimulation(physicsClientId=self._client)
+        self._pe.bump_tick()
         self.load()
         self.start()
 
-    def step(self):
-        """Take a simulation step."""
-        # Handle controller listener events
-        for cl in self._ctrl_listeners:
-            if cl is not None:
-                cl.listen()
-        # Simulate a step
-        if self._time_step is None:
-            pass
+    def step(self, n=1):
+        """Take n simulation steps.
+
+        Args:
+            n: Number of ticks to advance.
+        """
+        if self._headless:
+            if self._time_step is not None:
+                for _ in range(n):
+                    p.stepSimulation(physicsClientId=self._client)
+            self._pe.bump_tick()
         else:
-            p.stepSimulation()
-        # Update camera
-        self.set_camera(self._camera)
+            for _ in range(n):
+                # Handle controller listener events
+                for cl in self._ctrl_listeners:
+                    if cl is not None:
+                        cl.listen()
+                # Simulate a step
+                if self._time_step is not None:
+                    p.stepSimulation(physicsClientId=self._client)
+                # The camera follows the poses of this tick
+                self._pe.bump_tick()
+                # Update camera
+                self.set_camera(self._camera)
+        if self._stats is not None:
+            self._stats.tick(n)
         return
 
+    @property
+    def headless(self):
+        return self._headless
+
+    @headless.setter
+    def headless(self, value):
+        self._headless = value
+
     def close(self):
         """Terminate the simulation"""
-        p.disconnect()
+        if self._owns_client:
+            p.disconnect(physicsClientId=self._client)
+
+    @property
+    def client(self):
+        return self._client
 
     def _key_events_fetcher(self):
         """Fetch and decode keyboard events in Bullet GUI.
@@ -126,7 +173,7 @@ class BulletWorld(World):
             events: list of (key, key_act, modifiers) tuples.
         """
         # Fetch events
-        bullet_events = p.getKeyboardEvents()
+        bullet_events = p.getKeyboardEvents(physicsClientId=self._client)
         # Map event id to key name
         if self._key_dict is None:
             key_dict = {}
@@ -7,7 +7,9 @@ def get_world(
         data_dir='.',
         verbose=False,
         key=None,
-        camera_params={}):
+        camera_params={},
+        client=None,
+        stats=False):
 
     if physics == 'bullet':
         return BulletWorld(
@@ -15,6 +17,8 @@ def get_world(
                 data_dir,
                 verbose,
                 key=key,
-                camera_params=camera_params)
+                camera_params=camera_params,
+                client=client,
+                stats=stats)
     else:
         raise ValueError('Unrecognized simulato')
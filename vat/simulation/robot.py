@@ -81,6 +81,14 @@ class Robot(Entity):
         """Setup the VR handlers. """
         raise NotImplementedError
 
+    def snapshot(self):
+        """Capture the robot state that is not held by its bodies."""
+        return {}
+
+    def restore(self, snapshot):
+        """Restore the robot state captured by snapshot()."""
+        pass
+
     def _add_cstr(self, parent_body, parent_link, child_body, child_link,
             joint_type, joint_axis, parent_frame_pos, child_frame_pos,
             parent_frame_quat=None, child_frame_quat=None, name=None):
@@ -112,6 +120,9 @@ class Gripper(Robot):
     def __init__(self, pe, body_dict, name=None):
         super(Gripper, self).__init__(pe, body_dict, name)
         self._gripper = self.bodies['gripper']
+        self._finger_joints = ['left_gripper_joint', 'right_gripper_joint']
+        self._finger_ids = [self._gripper.joint_table.index(name)
+                            for name in self._finger_joints]
         # Constraints
         cstr_descr = self._add_cstr(self._gripper.uid,
                 -1, -1, -1, 'fixed', [0 ,0, 0], [0, 0, 0], self._gripper.pos)
@@ -127,6 +138,28 @@ class Gripper(Robot):
     def state(self):
         return self._state
 
+    @property
+    def target(self):
+        """Position and euler angle the base constraint drives to."""
+        return self.pe.get_cstr_dof(self._base_cstr.uid)
+
+    def snapshot(self):
+        """Capture the base constraint target and the gripper state."""
+        pos, euler = self.pe.get_cstr_dof(self._base_cstr.uid)
+        return {'pos': pos, 'euler': euler, 'state': self._state}
+
+    def restore(self, snapshot):
+        """Restore the state captured by snapshot().
+
+        A grip constraint on an object is released, not re-created.
+        """
+        self.cstr_release()
+        self.move_to(snapshot['pos'], snapshot['euler'])
+        if snapshot['state']:
+            self.grip()
+        else:
+            self.release()
+
     def _setup_key_handlers(self, ctrl_listener):
         """Set up the keyboard handlers."""
         # Controller hyperparameters
@@ -257,15 +290,11 @@ class Gripper(Robot):
     def grip(self):
         self._state = 1
         """Grip."""
-        left_joint = self.bodies['gripper'].joints['left_gripper_joint']
-        left_joint.control_pos(left_joint.limit['lower'])
-        right_joint = self.bodies['gripper'].joints['right_gripper_joint']
-        right_joint.control_pos(right_joint.limit['lower'])
+        lower = self._gripper.joint_table.lower[self._finger_ids]
+        self._gripper.control_joints_pos(self._finger_joints, lower)
 
     def release(self):
         self._state = 0
         """Release the gripper."""
-        left_joint = self.bodies['gripper'].joints['left_gripper_joint']
-        left_joint.control_pos(left_joint.limit['upper'])
-        right_joint = self.bodies['gripper'].joints['right_gripper_joint']
-        right_joint.control_pos(right_joint.limit['upper'])
+        upper = self._gripper.joint_table.upper[self._finger_ids]
+        self._gripper.control_joints_pos(self._finger_joints, upper)
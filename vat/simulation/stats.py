@@ -0,0 +1,103 @@
+"""Call counts and timing of the simulation wrappers."""
+
+import json
+import time
+from collections import defaultdict
+from functools import wraps
+
+
+# Method name prefixes of each timing category, checked in order
+CATEGORIES = [
+        ('step', ('step',)),
+        ('render', ('capture_image', 'set_camera', 'log_video')),
+        ('query', ('get_', 'snapshot')),
+        ('math', ('pos_in_frame', 'euler_in_frame', 'euler_from_',
+                  'quat_from_', 'mat33_from_')),
+        ('control', ('control_', 'set_', 'reset_', 'create_cstr',
+                     'remove_cstr', 'apply_force')),
+        ('load', ('load', 'add_body', 'park_body', 'remove_body',
+                  'restart', 'restore')),
+        ]
+
+
+def get_category(name):
+    """Get the timing category of a method name."""
+    for category, prefixes in CATEGORIES:
+        if name.startswith(prefixes):
+            return category
+    return 'other'
+
+
+class SimStats(object):
+    """Per-method call counts and wall time of instrumented objects.
+
+    The time of a method is recorded both inclusively, per method, and
+    exclusively, per category, so that nested calls (e.g. the camera update
+    inside a world step) are not counted twice in the category breakdown.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._calls = defaultdict(int)
+        self._time = defaultdict(float)
+        self._category_time = defaultdict(float)
+        self._ticks = 0
+        self._start_time = time.time()
+        # Time spent in nested instrumented calls, one entry per open call
+        self._child_time = []
+
+    def instrument(self, obj, names, prefix=''):
+        """Replace the named methods of obj by timed wrappers."""
+        for name in names:
+            method = getattr(obj, name)
+            setattr(obj, name, self._wrap(method, prefix + name,
+                                          get_category(name)))
+
+    def _wrap(self, method, key, category):
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            self._child_time.append(0.0)
+            t = time.time()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = time.time() - t
+                child_time = self._child_time.pop()
+                if self._child_time:
+                    self._child_time[-1] += elapsed
+                self._calls[key] += 1
+                self._time[key] += elapsed
+                self._category_time[category] += elapsed - child_time
+        return wrapper
+
+    def tick(self, n=1):
+        self._ticks += n
+
+    @property
+    def ticks(self):
+        return self._ticks
+
+    def summary(self):
+        """Summarize the statistics as a JSON serializable dict."""
+        wall_time = time.time() - self._start_time
+        ticks = max(self._ticks, 1)
+        methods = {}
+        for key, calls in self._calls.items():
+            methods[key] = {'calls': calls, 'time': self._time[key]}
+        categories = {}
+        for category, t in self._category_time.items():
+            categories[category] = {'time': t, 'per_tick': t / ticks}
+        # Time outside of the instrumented methods, e.g. the env wrappers
+        outside = wall_time - sum(self._category_time.values())
+        categories['outside'] = {'time': outside, 'per_tick': outside / ticks}
+        return {'ticks': self._ticks,
+                'wall_time': wall_time,
+                'methods': methods,
+                'categories': categories}
+
+    def dump(self, path):
+        """Write the summary to a JSON file."""
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2, sort_keys=True)
@@ -0,0 +1,17 @@
+import os.path as osp
+
+from vat.simulation import get_world
+
+
+ROOT = osp.abspath(osp.join(osp.dirname(__file__), '..', '..', '..'))
+DATA_DIR = osp.join(ROOT, 'assets', 'urdf')
+SCENE = osp.join(ROOT, 'tasks', 'scene', 'base.xml')
+
+
+def make_world(time_step=0.001, **kwargs):
+    """A headless world with the base scene, started."""
+    world = get_world('bullet', display=False, data_dir=DATA_DIR,
+                      verbose=False, **kwargs)
+    world.load(SCENE)
+    world.start(time_step)
+    return world
@@ -0,0 +1,151 @@
+import unittest
+
+import numpy as np
+import pybullet as p
+
+from vat.simulation.tests import make_world
+from vat.simulation.tests.test_snapshot import cube_descr
+
+
+class BodyPosesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.world = make_world()
+        self.world.add_body(cube_descr('cube_0_0', [0.1, 0.1, 0.7]))
+        self.world.robots['pr2_gripper'].move_to([0.2, 0.1, 0.9],
+                                                 [0, np.pi / 2, 0])
+        self.uids = [b.uid for b in self.world.bodies.values()]
+
+    def tearDown(self):
+        self.world.close()
+
+    def expected(self):
+        poses = []
+        for uid in self.uids:
+            pos, quat = p.getBasePositionAndOrientation(
+                uid, physicsClientId=self.world.pe.client)
+            poses.append(list(pos) + list(quat))
+        return np.array(poses, dtype=np.float32)
+
+    def test_matches_single_queries(self):
+        for _ in range(3):
+            self.world.step(50)
+            poses = self.world.pe.get_body_poses(self.uids)
+            self.assertEqual(poses.shape, (len(self.uids), 7))
+            self.assertEqual(poses.dtype, np.float32)
+            np.testing.assert_array_equal(poses, self.expected())
+
+    def test_out(self):
+        out = np.zeros((len(self.uids), 7), dtype=np.float32)
+        self.world.step(50)
+        self.assertIs(self.world.pe.get_body_poses(self.uids, out=out), out)
+        np.testing.assert_array_equal(out, self.expected())
+
+    def test_names(self):
+        names = sorted(self.world.bodies.keys())
+        self.world.step(50)
+        poses = self.world.get_body_poses(names)
+        for name, pose in zip(names, poses):
+            body = self.world.bodies[name]
+            np.testing.assert_array_equal(pose[:3], body.pos)
+            np.testing.assert_array_equal(pose[3:], body.quat)
+
+
+class PoseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.world = make_world()
+        self.world.add_body(cube_descr('cube_0_0', [0.1, 0.1, 0.7]))
+        self.pe = self.world.pe
+        self.table = self.world.bodies['table'].uid
+        self.cube = self.world.bodies['cube_0_0'].uid
+        self.pos = self.pe.get_body_pos(self.table)
+
+    def tearDown(self):
+        self.world.close()
+
+    def move_table(self):
+        """move the table without the engine knowing"""
+        moved = self.pos + np.array([0, 0, 0.5], dtype=np.float32)
+        p.resetBasePositionAndOrientation(self.table, moved, [0, 0, 0, 1],
+                                          physicsClientId=self.pe.client)
+        return moved
+
+    def test_cached_within_tick(self):
+        self.move_table()
+        np.testing.assert_array_equal(self.pe.get_body_pos(self.table),
+                                      self.pos)
+        np.testing.assert_array_equal(
+            self.pe.get_body_poses([self.table])[0, :3], self.pos)
+
+    def test_no_cache(self):
+        self.pe.use_cache = False
+        moved = self.move_table()
+        np.testing.assert_allclose(self.pe.get_body_pos(self.table), moved)
+
+    def check_invalidated(self, change):
+        moved = self.move_table()
+        tick = self.pe.tick
+        change()
+        self.assertGreater(self.pe.tick, tick)
+        np.testing.assert_allclose(self.pe.get_body_pos(self.table), moved)
+
+    def test_step(self):
+        self.check_invalidated(lambda: self.world.step())
+
+    def test_reset_body(self):
+        self.check_invalidated(lambda: self.pe.reset_body(
+            self.cube, [0.2, 0.2, 0.7], [0, 0, 0, 1]))
+        np.testing.assert_allclose(self.pe.get_body_pos(self.cube),
+                                   [0.2, 0.2, 0.7])
+
+    def test_set_body_state(self):
+        state = self.pe.get_body_state(self.cube)
+        state['pos'] = (0.3, 0.1, 0.7)
+        self.check_invalidated(lambda: self.pe.set_body_state(self.cube,
+                                                              state))
+        np.testing.assert_allclose(self.pe.get_body_pos(self.cube),
+                                   state['pos'])
+
+    def test_remove_body(self):
+        self.check_invalidated(lambda: self.world.remove_body('cube_0_0'))
+
+
+class ClientTest(unittest.TestCase):
+
+    def setUp(self):
+        self.worlds = [make_world(), make_world()]
+
+    def tearDown(self):
+        for world in self.worlds:
+            world.close()
+
+    def test_separate_clients(self):
+        a, b = self.worlds
+        self.assertNotEqual(a.pe.client, b.pe.client)
+        n_bodies = p.getNumBodies(physicsClientId=b.pe.client)
+        a.add_body(cube_descr('cube_0_0', [0.1, 0.1, 0.7]))
+        self.assertEqual(p.getNumBodies(physicsClientId=a.pe.client),
+                         n_bodies + 1)
+        self.assertEqual(p.getNumBodies(physicsClientId=b.pe.client),
+                         n_bodies)
+
+        a.robots['pr2_gripper'].move_to([0.2, 0.1, 0.9], [0, np.pi / 2, 0])
+        start = b.bodies['gripper'].pos
+        a.step(200)
+        b.step(200)
+        # only the gripper of a was sent anywhere
+        moved = a.bodies['gripper'].pos
+        self.assertGreater(np.linalg.norm(moved - start), 0.1)
+        np.testing.assert_allclose(b.bodies['gripper'].pos, start,
+                                   atol=1e-2)
+
+        # the cube is only known to the client of a
+        uid = a.bodies['cube_0_0'].uid
+        self.assertEqual(a.pe.get_body_poses([uid]).shape, (1, 7))
+        with self.assertRaises(p.error):
+            b.pe.get_body_poses([uid])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+import numpy as np
+import pybullet as p
+
+from vat.simulation.tests import make_world
+
+
+class StepTest(unittest.TestCase):
+
+    def setUp(self):
+        self.world = make_world()
+        self.gripper = self.world.robots['pr2_gripper']
+        self.body = self.world.bodies['gripper']
+        # Set the gripper in motion
+        self.gripper.move_to([0.2, 0.1, 0.9], [0, np.pi / 2, 0])
+
+    def tearDown(self):
+        self.world.close()
+
+    def true_pos(self):
+        pos, _ = p.getBasePositionAndOrientation(
+            self.body.uid, physicsClientId=self.world.pe.client)
+        return np.array(pos)
+
+    def test_camera_sees_fresh_poses(self):
+        self.world.headless = False
+        seen = []
+        set_camera = self.world.set_camera
+
+        def record(camera):
+            seen.append((self.body.pos, self.true_pos()))
+            set_camera(camera)
+
+        self.world.set_camera = record
+        self.world.step(20)
+        self.assertEqual(len(seen), 20)
+        for cached, true in seen:
+            np.testing.assert_allclose(cached, true, atol=1e-6)
+
+    def test_headless_step_matches_single_steps(self):
+        other = make_world()
+        try:
+            other.robots['pr2_gripper'].move_to([0.2, 0.1, 0.9],
+                                                [0, np.pi / 2, 0])
+            tick = self.world.pe.tick
+            self.world.step(20)
+            self.assertEqual(self.world.pe.tick, tick + 1)
+            for _ in range(20):
+                other.step()
+            np.testing.assert_allclose(self.body.pos,
+                                       other.bodies['gripper'].pos, atol=1e-9)
+            np.testing.assert_allclose(self.body.pos, self.true_pos(),
+                                       atol=1e-6)
+        finally:
+            other.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+
+from vat.simulation.bullet import bullet_physics_engine
+from vat.simulation.tests import make_world
+
+
+FINGERS = ['left_gripper_joint', 'right_gripper_joint']
+
+
+def finger_states(world, control):
+    gripper = world.bodies['gripper']
+    ids = [gripper.joint_table.index(name) for name in FINGERS]
+    control(gripper, ids)
+    world.step(200)
+    return np.array([world.pe.get_joint_pos(gripper.uid, i) for i in ids])
+
+
+class JointControlTest(unittest.TestCase):
+    """The array call and the per joint fallback give the same motion."""
+
+    def setUp(self):
+        self.worlds = [make_world(), make_world()]
+        self.has_array = bullet_physics_engine.HAS_JOINT_ARRAY_CONTROL
+
+    def tearDown(self):
+        bullet_physics_engine.HAS_JOINT_ARRAY_CONTROL = self.has_array
+        for world in self.worlds:
+            world.close()
+
+    def compare(self, control):
+        bullet_physics_engine.HAS_JOINT_ARRAY_CONTROL = True
+        batched = finger_states(self.worlds[0], control)
+        bullet_physics_engine.HAS_JOINT_ARRAY_CONTROL = False
+        per_joint = finger_states(self.worlds[1], control)
+        np.testing.assert_allclose(batched, per_joint, atol=1e-6)
+        return batched
+
+    def test_position_control(self):
+        def control(gripper, ids):
+            gripper.control_joints_pos(FINGERS,
+                                       gripper.joint_table.upper[ids])
+        self.assertTrue(np.all(self.compare(control) > 0.01))
+
+    def test_velocity_control(self):
+        def control(gripper, ids):
+            gripper.control_joints_vel(FINGERS, [0.1, 0.1])
+        self.assertTrue(np.all(self.compare(control) > 0.01))
+
+
+if __name__ == '__main__':
+    unittest.main()
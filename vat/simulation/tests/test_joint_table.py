@@ -0,0 +1,43 @@
+import unittest
+
+import numpy as np
+
+from vat.simulation.tests import make_world
+
+
+class JointTableTest(unittest.TestCase):
+
+    def setUp(self):
+        self.world = make_world()
+        self.pe = self.world.pe
+        self.gripper = self.world.bodies['gripper']
+
+    def tearDown(self):
+        self.world.close()
+
+    def test_matches_joint_queries(self):
+        table = self.gripper.joint_table
+        uids = self.pe.get_joint_uids(self.gripper.uid)
+        self.assertGreater(len(table), 0)
+        self.assertEqual(len(table), len(uids))
+        for i in uids:
+            name = self.pe.get_joint_name(self.gripper.uid, i)
+            self.assertEqual(table.names[i], name)
+            self.assertEqual(table.index(name), i)
+            limit = self.pe.get_joint_limit(self.gripper.uid, i)
+            for k, v in table.limit(i).items():
+                self.assertAlmostEqual(v, limit[k])
+            dynamics = self.pe.get_joint_dynamics(self.gripper.uid, i)
+            for k, v in table.dynamics(i).items():
+                self.assertAlmostEqual(v, dynamics[k])
+
+    def test_columns_are_arrays(self):
+        table = self.gripper.joint_table
+        for column in (table.lower, table.upper, table.effort,
+                       table.velocity, table.damping, table.friction):
+            self.assertIsInstance(column, np.ndarray)
+            self.assertEqual(column.shape, (len(table),))
+
+
+if __name__ == '__main__':
+    unittest.main()
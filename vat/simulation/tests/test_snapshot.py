@@ -0,0 +1,70 @@
+import unittest
+
+import numpy as np
+
+from vat.simulation.tests import make_world
+
+
+def cube_descr(name, xyz):
+    return {'name': name,
+            'model': {'filename': 'cubes/cube_0.urdf'},
+            'fixed': False,
+            'boundary': [0.08, 0.08, 0.08],
+            'scale': [0.05, 0.05, 0.05],
+            'pose': {'xyz': xyz, 'rpy': [0, 0, 0]}}
+
+
+class SnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        self.world = make_world()
+        self.gripper = self.world.robots['pr2_gripper']
+
+    def tearDown(self):
+        self.world.close()
+
+    def states(self, names):
+        return dict((name, self.world.pe.get_body_state(
+            self.world.bodies[name].uid)) for name in names)
+
+    def assert_states_equal(self, a, b):
+        self.assertEqual(sorted(a.keys()), sorted(b.keys()))
+        for name in a:
+            for k in a[name]:
+                np.testing.assert_allclose(a[name][k], b[name][k], atol=1e-9,
+                                           err_msg='%s %s' % (name, k))
+
+    def test_restore(self):
+        self.world.step(100)
+        names = list(self.world.bodies.keys())
+        snapshot = self.world.snapshot()
+        expected = self.states(names)
+        target = self.gripper.target
+
+        self.world.add_body(cube_descr('cube_0_0', [0.1, 0.1, 0.7]))
+        self.gripper.move_to([0.2, 0.1, 0.9], [0, np.pi / 2, 0])
+        self.gripper.grip()
+        self.world.step(300)
+
+        self.world.restore(snapshot)
+        self.assertNotIn('cube_0_0', self.world.bodies)
+        self.assert_states_equal(self.states(names), expected)
+        np.testing.assert_allclose(self.gripper.target[0], target[0],
+                                   atol=1e-6)
+        np.testing.assert_allclose(self.gripper.target[1], target[1],
+                                   atol=1e-6)
+
+    def test_parked_bodies_are_reused(self):
+        snapshot = self.world.snapshot()
+        self.world.add_body(cube_descr('cube_0_0', [0.1, 0.1, 0.7]))
+        uid = self.world.bodies['cube_0_0'].uid
+        self.world.restore(snapshot)
+
+        self.world.add_body(cube_descr('cube_0_1', [-0.1, 0.1, 0.7]))
+        cube = self.world.bodies['cube_0_1']
+        self.assertEqual(cube.uid, uid)
+        np.testing.assert_allclose(cube.pos, [-0.1, 0.1, 0.7], atol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from vat.simulation.stats import SimStats, get_category
+from vat.simulation.tests import make_world
+
+
+class Sleeper(object):
+
+    def step(self, inner=None):
+        time.sleep(0.01)
+        if inner is not None:
+            inner()
+
+    def get_pose(self):
+        time.sleep(0.01)
+
+
+class SimStatsTest(unittest.TestCase):
+
+    def test_categories(self):
+        self.assertEqual(get_category('step'), 'step')
+        self.assertEqual(get_category('get_body_poses'), 'query')
+        self.assertEqual(get_category('quat_from_euler'), 'math')
+        self.assertEqual(get_category('set_camera'), 'render')
+        self.assertEqual(get_category('add_body'), 'load')
+        self.assertEqual(get_category('close'), 'other')
+
+    def test_nested_calls_are_exclusive_per_category(self):
+        stats = SimStats()
+        obj = Sleeper()
+        stats.instrument(obj, ['step', 'get_pose'])
+        obj.step(inner=obj.get_pose)
+        obj.get_pose()
+        stats.tick(3)
+
+        summary = stats.summary()
+        self.assertEqual(summary['ticks'], 3)
+        self.assertEqual(summary['methods']['step']['calls'], 1)
+        self.assertEqual(summary['methods']['get_pose']['calls'], 2)
+        # step includes the nested get_pose, its category does not
+        step_time = summary['methods']['step']['time']
+        self.assertGreaterEqual(step_time, 0.02)
+        categories = summary['categories']
+        self.assertGreaterEqual(step_time - categories['step']['time'],
+                                0.0099)
+        self.assertGreaterEqual(categories['query']['time'], 0.02)
+        self.assertAlmostEqual(categories['query']['per_tick'],
+                               categories['query']['time'] / 3)
+
+    def test_world_stats(self):
+        world = make_world(stats=True)
+        try:
+            world.step(5)
+            world.get_body_poses(['table'])
+            summary = world.stats.summary()
+            self.assertEqual(summary['ticks'], 5)
+            self.assertEqual(summary['methods']['world.step']['calls'], 1)
+            self.assertEqual(
+                summary['methods']['world.get_body_poses']['calls'], 1)
+            self.assertIn('pe.get_body_poses', summary['methods'])
+
+            fd, path = tempfile.mkstemp(suffix='.json')
+            os.close(fd)
+            try:
+                world.stats.dump(path)
+                with open(path) as f:
+                    self.assertEqual(json.load(f)['ticks'], 5)
+            finally:
+                os.remove(path)
+        finally:
+            world.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
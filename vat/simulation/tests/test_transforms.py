@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+import pybullet as p
+
+from vat.simulation import transforms as tf
+
+
+def random_eulers(n, rng):
+    # keep pitch away from the gimbal lock, where Euler angles are not unique
+    euler = rng.uniform(-np.pi, np.pi, size=(n, 3))
+    euler[:, 1] = rng.uniform(-1.5, 1.5, size=n)
+    return euler
+
+
+class TransformsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.RandomState(0)
+        self.euler = random_eulers(50, self.rng)
+        self.quat = np.array([p.getQuaternionFromEuler(e)
+                              for e in self.euler])
+
+    def test_quat_from_euler(self):
+        np.testing.assert_allclose(tf.quat_from_euler(self.euler), self.quat,
+                                   atol=1e-12)
+        for e, q in zip(self.euler, self.quat):
+            np.testing.assert_allclose(tf.quat_from_euler(e), q, atol=1e-12)
+
+    def test_euler_from_quat(self):
+        expected = np.array([p.getEulerFromQuaternion(q) for q in self.quat])
+        np.testing.assert_allclose(tf.euler_from_quat(self.quat), expected,
+                                   atol=1e-9)
+        for q, e in zip(self.quat, expected):
+            np.testing.assert_allclose(tf.euler_from_quat(q), e, atol=1e-9)
+
+    def test_mat33_from_quat(self):
+        expected = np.array([np.reshape(p.getMatrixFromQuaternion(q), (3, 3))
+                             for q in self.quat])
+        np.testing.assert_allclose(tf.mat33_from_quat(self.quat), expected,
+                                   atol=1e-12)
+        np.testing.assert_allclose(tf.mat33_from_quat(self.quat[0]),
+                                   expected[0], atol=1e-12)
+        np.testing.assert_allclose(tf.mat33_from_euler(self.euler), expected,
+                                   atol=1e-12)
+
+    def test_mat33_round_trips(self):
+        mat33 = tf.mat33_from_quat(self.quat)
+        # quat_from_mat33 returns the representative with w >= 0
+        sign = np.where(self.quat[:, 3:] < 0, -1.0, 1.0)
+        np.testing.assert_allclose(tf.quat_from_mat33(mat33),
+                                   self.quat * sign, atol=1e-12)
+        np.testing.assert_allclose(tf.euler_from_mat33(mat33), self.euler,
+                                   atol=1e-9)
+
+    def test_pos_in_frame(self):
+        pos = self.rng.uniform(-1, 1, size=(50, 3))
+        frame_pos = self.rng.uniform(-1, 1, size=(50, 3))
+        expected = np.array([p.multiplyTransforms(fp, q, x, [0, 0, 0, 1])[0]
+                             for x, fp, q in zip(pos, frame_pos, self.quat)])
+        np.testing.assert_allclose(
+            tf.pos_in_frame(pos, frame_pos, self.euler), expected, atol=1e-6)
+        np.testing.assert_allclose(
+            tf.pos_in_frame(pos[0], frame_pos[0], self.euler[0]),
+            expected[0], atol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
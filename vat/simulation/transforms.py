@@ -0,0 +1,198 @@
+"""Batched rotation conversions in NumPy.
+
+Conventions follow Bullet: quaternions are [x, y, z, w] and Euler angles are
+[roll, pitch, yaw], composed as R = Rz(yaw) * Ry(pitch) * Rx(roll). Every
+function accepts a single rotation or a stack of them along the first axis,
+i.e. (3,) or (N, 3) Euler angles, (4,) or (N, 4) quaternions and (3, 3) or
+(N, 3, 3) rotation matrices. Single rotations take a scalar code path, which
+avoids the overhead of NumPy ufuncs on tiny arrays.
+"""
+
+import math
+
+import numpy as np
+
+
+def quat_from_euler(euler):
+    """Convert Euler angles to quaternions.
+
+    Args:
+        euler: (..., 3) array of [roll, pitch, yaw].
+
+    Returns:
+        quat: (..., 4) array of [x, y, z, w].
+    """
+    euler = np.asarray(euler, dtype=np.float64)
+    if euler.ndim == 1:
+        r, p, y = euler * 0.5
+        cr, cp, cy = math.cos(r), math.cos(p), math.cos(y)
+        sr, sp, sy = math.sin(r), math.sin(p), math.sin(y)
+        return np.array([sr * cp * cy - cr * sp * sy,
+                         cr * sp * cy + sr * cp * sy,
+                         cr * cp * sy - sr * sp * cy,
+                         cr * cp * cy + sr * sp * sy])
+    half = euler * 0.5
+    cr, cp, cy = np.cos(half[..., 0]), np.cos(half[..., 1]), np.cos(half[..., 2])
+    sr, sp, sy = np.sin(half[..., 0]), np.sin(half[..., 1]), np.sin(half[..., 2])
+    quat = np.empty(euler.shape[:-1] + (4,), dtype=np.float64)
+    quat[..., 0] = sr * cp * cy - cr * sp * sy
+    quat[..., 1] = cr * sp * cy + sr * cp * sy
+    quat[..., 2] = cr * cp * sy - sr * sp * cy
+    quat[..., 3] = cr * cp * cy + sr * sp * sy
+    return quat
+
+
+def euler_from_quat(quat):
+    """Convert quaternions to Euler angles.
+
+    Args:
+        quat: (..., 4) array of [x, y, z, w].
+
+    Returns:
+        euler: (..., 3) array of [roll, pitch, yaw].
+    """
+    if np.ndim(quat) == 1:
+        x, y, z, w = [float(v) for v in quat]
+        sarg = min(max(-2 * (x * z - w * y), -1.0), 1.0)
+        return np.array([math.atan2(2 * (y * z + w * x),
+                                    w * w - x * x - y * y + z * z),
+                         math.asin(sarg),
+                         math.atan2(2 * (x * y + w * z),
+                                    w * w + x * x - y * y - z * z)])
+    quat = np.asarray(quat, dtype=np.float64)
+    x, y, z, w = quat[..., 0], quat[..., 1], quat[..., 2], quat[..., 3]
+    euler = np.empty(quat.shape[:-1] + (3,), dtype=np.float64)
+    euler[..., 0] = np.arctan2(2 * (y * z + w * x),
+                               w * w - x * x - y * y + z * z)
+    euler[..., 1] = np.arcsin(np.clip(-2 * (x * z - w * y), -1.0, 1.0))
+    euler[..., 2] = np.arctan2(2 * (x * y + w * z),
+                               w * w + x * x - y * y - z * z)
+    return euler
+
+
+def mat33_from_quat(quat):
+    """Convert quaternions to rotation matrices.
+
+    Args:
+        quat: (..., 4) array of [x, y, z, w].
+
+    Returns:
+        mat33: (..., 3, 3) array of rotation matrices.
+    """
+    quat = np.asarray(quat, dtype=np.float64)
+    if quat.ndim == 1:
+        x, y, z, w = [float(v) for v in quat]
+        s = 2.0 / (x * x + y * y + z * z + w * w)
+    else:
+        x, y, z, w = quat[..., 0], quat[..., 1], quat[..., 2], quat[..., 3]
+        s = 2.0 / np.sum(quat * quat, axis=-1)
+    xs, ys, zs = x * s, y * s, z * s
+    wx, wy, wz = w * xs, w * ys, w * zs
+    xx, xy, xz = x * xs, x * ys, x * zs
+    yy, yz, zz = y * ys, y * zs, z * zs
+    if quat.ndim == 1:
+        return np.array([[1.0 - (yy + zz), xy - wz, xz + wy],
+                         [xy + wz, 1.0 - (xx + zz), yz - wx],
+                         [xz - wy, yz + wx, 1.0 - (xx + yy)]])
+    mat33 = np.empty(quat.shape[:-1] + (3, 3), dtype=np.float64)
+    mat33[..., 0, 0] = 1.0 - (yy + zz)
+    mat33[..., 0, 1] = xy - wz
+    mat33[..., 0, 2] = xz + wy
+    mat33[..., 1, 0] = xy + wz
+    mat33[..., 1, 1] = 1.0 - (xx + zz)
+    mat33[..., 1, 2] = yz - wx
+    mat33[..., 2, 0] = xz - wy
+    mat33[..., 2, 1] = yz + wx
+    mat33[..., 2, 2] = 1.0 - (xx + yy)
+    return mat33
+
+
+def mat33_from_euler(euler):
+    """Convert Euler angles to rotation matrices.
+
+    Args:
+        euler: (..., 3) array of [roll, pitch, yaw].
+
+    Returns:
+        mat33: (..., 3, 3) array of rotation matrices.
+    """
+    return mat33_from_quat(quat_from_euler(euler))
+
+
+def quat_from_mat33(mat33):
+    """Convert rotation matrices to quaternions.
+
+    The returned quaternions have a non-negative w component.
+
+    Args:
+        mat33: (..., 3, 3) array of rotation matrices.
+
+    Returns:
+        quat: (..., 4) array of [x, y, z, w].
+    """
+    mat33 = np.asarray(mat33, dtype=np.float64)
+    m00, m11, m22 = mat33[..., 0, 0], mat33[..., 1, 1], mat33[..., 2, 2]
+    # Squared magnitudes of each component, the largest one is used as the
+    # pivot to avoid dividing by a small number.
+    sq = np.stack([1.0 + m00 - m11 - m22,
+                   1.0 - m00 + m11 - m22,
+                   1.0 - m00 - m11 + m22,
+                   1.0 + m00 + m11 + m22], axis=-1)
+    pivot = np.argmax(sq, axis=-1)
+    root = np.sqrt(np.maximum(np.max(sq, axis=-1), 1e-12))
+    inv = 0.5 / root
+
+    d21 = mat33[..., 2, 1] - mat33[..., 1, 2]
+    d02 = mat33[..., 0, 2] - mat33[..., 2, 0]
+    d10 = mat33[..., 1, 0] - mat33[..., 0, 1]
+    s21 = mat33[..., 2, 1] + mat33[..., 1, 2]
+    s02 = mat33[..., 0, 2] + mat33[..., 2, 0]
+    s10 = mat33[..., 1, 0] + mat33[..., 0, 1]
+
+    candidates = np.stack([
+        np.stack([0.5 * root, s10 * inv, s02 * inv, d21 * inv], axis=-1),
+        np.stack([s10 * inv, 0.5 * root, s21 * inv, d02 * inv], axis=-1),
+        np.stack([s02 * inv, s21 * inv, 0.5 * root, d10 * inv], axis=-1),
+        np.stack([d21 * inv, d02 * inv, d10 * inv, 0.5 * root], axis=-1)],
+        axis=-2)
+    flat = candidates.reshape((-1, 4, 4))
+    quat = flat[np.arange(flat.shape[0]), pivot.reshape(-1)]
+    quat = quat.reshape(mat33.shape[:-2] + (4,))
+    quat *= np.where(quat[..., 3:] < 0, -1.0, 1.0)
+    return quat
+
+
+def euler_from_mat33(mat33):
+    """Convert rotation matrices to Euler angles.
+
+    Args:
+        mat33: (..., 3, 3) array of rotation matrices.
+
+    Returns:
+        euler: (..., 3) array of [roll, pitch, yaw].
+    """
+    mat33 = np.asarray(mat33, dtype=np.float64)
+    euler = np.empty(mat33.shape[:-2] + (3,), dtype=np.float64)
+    euler[..., 0] = np.arctan2(mat33[..., 2, 1], mat33[..., 2, 2])
+    euler[..., 1] = np.arcsin(np.clip(-mat33[..., 2, 0], -1.0, 1.0))
+    euler[..., 2] = np.arctan2(mat33[..., 1, 0], mat33[..., 0, 0])
+    return euler
+
+
+def pos_in_frame(pos, frame_pos, frame_euler):
+    """Transform positions from a local frame to the world frame.
+
+    Args:
+        pos: (..., 3) array of positions in the local frame.
+        frame_pos: (..., 3) array of frame origins.
+        frame_euler: (..., 3) array of frame Euler angles.
+
+    Returns:
+        pos: (..., 3) array of positions in the world frame.
+    """
+    mat33 = mat33_from_euler(frame_euler)
+    pos = np.asarray(pos, dtype=np.float64)
+    if mat33.ndim == 2:
+        return np.asarray(frame_pos) + np.dot(pos, mat33.T)
+    return np.asarray(frame_pos) + np.einsum('...ij,...j->...i', mat33, pos)
+
@@ -1,4 +1,5 @@
 import os.path as osp
+import numpy as np
 
 import pybullet as p
 
@@ -8,6 +9,13 @@ from .physics_engine import PhysicsEngine
 from .body import Body
 from .robot import get_robot
 from .camera import Camera
+from .stats import SimStats
+
+
+# Parking area of pooled bodies, outside of the workspace and camera views
+PARK_ORIGIN = np.array([5.0, -5.0, 0.1])
+PARK_SPACING = 0.25
+PARK_ROW_SIZE = 40
 
 
 class World(object):
@@ -31,6 +39,7 @@ class World(object):
         self._robots = None
         self._time_step = None
         self._ctrl_listeners = []
+        self._stats = None
 
     def load(self, path=None):
         """Build the world"""
@@ -38,6 +47,9 @@ class World(object):
             self.w = parse_world_from_file(path)['world']
         self._bodies = {}
         self._robots = {}
+        # Parked bodies by (model filename, fixed) and their parking slots
+        self._pool = {}
+        self._park_slots = {}
         # Build
         for body_descr in self.w['body']:
             # Build uncontrollable bodies
@@ -55,9 +67,68 @@ class World(object):
         self._camera = self.create_camera(self.w['gui']['camera'])
 
     def add_body(self, body_descr):
-        body = Body.create_from_descr(self.pe, body_descr, self._data_dir)
+        """Add a body, reusing a parked body of the same model if any."""
+        key = (body_descr['model']['filename'], body_descr.get('fixed', False))
+        pool = self._pool.get(key)
+        if pool:
+            body = pool.pop()
+            body.reuse_from_descr(body_descr)
+        else:
+            body = Body.create_from_descr(self.pe, body_descr, self._data_dir)
         self._bodies[body.name] = body
 
+    def park_body(self, name):
+        """Move a body off the workspace and keep it for later reuse."""
+        body = self._bodies.pop(name)
+        slot = self._park_slots.setdefault(body.uid, len(self._park_slots))
+        offset = np.array([slot // PARK_ROW_SIZE, slot % PARK_ROW_SIZE, 0])
+        pos = PARK_ORIGIN + offset * PARK_SPACING
+        self.pe.reset_body(body.uid, pos, [0, 0, 0, 1])
+        key = (body.filename, body.fixed)
+        self._pool.setdefault(key, []).append(body)
+
+    def remove_body(self, name):
+        body = self._bodies.pop(name)
+        self.pe.remove_body(body.uid)
+
+    def snapshot(self):
+        """Capture the state of the world in memory.
+
+        Returns:
+            snapshot: The captured state, to be passed to restore().
+        """
+        bodies = {}
+        for name, body in self._bodies.items():
+            bodies[name] = (body, self.pe.get_body_state(body.uid))
+        robots = {}
+        for name, robot in self._robots.items():
+            robots[name] = robot.snapshot()
+        return {'bodies': bodies, 'robots': robots}
+
+    def restore(self, snapshot):
+        """Return the world to a captured state without reloading models.
+
+        Bodies added after the snapshot was taken are parked for reuse.
+        """
+        for name, robot_snapshot in snapshot['robots'].items():
+            self._robots[name].restore(robot_snapshot)
+        for name in list(self._bodies.keys()):
+            if name not in snapshot['bodies']:
+                self.park_body(name)
+        for name, (body, state) in snapshot['bodies'].items():
+            self._bodies[name] = body
+            self.pe.set_body_state(body.uid, state)
+
+    def get_body_poses(self, names):
+        """Get the base poses of the named bodies as an (N, 7) array."""
+        uids = [self._bodies[name].uid for name in names]
+        return self.pe.get_body_poses(uids)
+
+    def get_body_velocities(self, names):
+        """Get the base velocities of the named bodies as an (N, 6) array."""
+        uids = [self._bodies[name].uid for name in names]
+        return self.pe.get_body_velocities(uids)
+
     def start(self):
         """Start the simulation."""
         raise NotImplementedError
@@ -66,14 +137,32 @@ class World(object):
         """Restart the simulation"""
         raise NotImplementedError
 
-    def step(self):
-        """Take a simulation step."""
+    def step(self, n=1):
+        """Take n simulation steps."""
         raise NotImplementedError
 
     def close(self):
         """Terminate the simulation"""
         raise NotImplementedError
 
+    def enable_stats(self):
+        """Record call counts and timing of the world and physics engine."""
+        if self._stats is not None:
+            return self._stats
+        self._stats = SimStats()
+        pe_names = [name for name in dir(type(self.pe))
+                    if not name.startswith('_') and
+                    not isinstance(getattr(type(self.pe), name), property) and
+                    callable(getattr(self.pe, name))]
+        self._stats.instrument(self.pe, pe_names, prefix='pe.')
+        world_names = ['step', 'restart', 'capture_image', 'set_camera',
+                       'snapshot', 'restore', 'add_body', 'park_body',
+                       'remove_body', 'get_body_poses',
+                       'get_body_velocities']
+        world_names = [name for name in world_names if hasattr(self, name)]
+        self._stats.instrument(self, world_names, prefix='world.')
+        return self._stats
+
     def create_camera(self, descr):
         """Create the camera."""
         pos = descr['pose']['xyz']
@@ -128,6 +217,16 @@ class World(object):
     def pe(self):
         return self._pe
 
+    @property
+    def stats(self):
+        """Call statistics, None unless enable_stats() has been called."""
+        return self._stats
+
+    @property
+    def time_step(self):
+        """Simulation time step, None in real time simulation."""
+        return self._time_step
+
     @property
     def bodies(self):
         return self._bodies